@@ -0,0 +1,91 @@
+# action_masking.py
+
+"""
+Legal-action masking helpers shared by the agents and exploration strategies.
+A mask is a boolean array over the action indices (True = legal), as returned by
+PokerEnvironment.legal_action_mask() and, for the agent's seat, in the 'legal_actions' entry of
+its observations.
+All functions work on single vectors or on batches (actions along the last axis).
+"""
+
+import numpy as np
+
+def as_mask(available_actions, action_size):
+    """
+    Converts a list of legal action indices, or an existing mask, into a boolean mask.
+
+    Args:
+        available_actions (array-like or None): Legal action indices or a boolean mask. None means all legal.
+        action_size (int): Number of actions.
+
+    Returns:
+        np.ndarray: Boolean mask of shape (..., action_size).
+    """
+    if available_actions is None:
+        return np.ones(action_size, dtype=bool)
+    available_actions = np.asarray(available_actions)
+    if available_actions.dtype == bool:
+        return available_actions
+    mask = np.zeros(action_size, dtype=bool)
+    mask[available_actions.astype(np.int64)] = True
+    return mask
+
+def masked_argmax(values, mask):
+    """
+    Index of the highest value among the legal actions.
+
+    Args:
+        values (np.ndarray): Action values of shape (..., actions).
+        mask (np.ndarray): Legal actions, broadcastable to values.
+
+    Returns:
+        int or np.ndarray: The best legal action of each row.
+    """
+    best = np.where(mask, values, -np.inf).argmax(axis=-1)
+    return int(best) if np.ndim(best) == 0 else best
+
+def masked_softmax(logits, mask, temperature=1.0):
+    """
+    Softmax restricted to the legal actions (illegal actions get probability 0).
+
+    Args:
+        logits (np.ndarray): Action scores of shape (..., actions).
+        mask (np.ndarray): Legal actions, broadcastable to logits.
+        temperature (float): Softmax temperature.
+
+    Returns:
+        np.ndarray: Probabilities of the same shape as logits.
+    """
+    scaled = np.where(mask, np.asarray(logits, dtype=np.float64) / temperature, -np.inf)
+    scaled = scaled - scaled.max(axis=-1, keepdims=True)
+    weights = np.exp(scaled)
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+def mask_probabilities(probabilities, mask):
+    """
+    Zeroes the probabilities of illegal actions and renormalizes (uniform over legal actions if
+    the policy put no mass on any of them).
+    """
+    probabilities = np.where(mask, probabilities, 0.0)
+    total = probabilities.sum(axis=-1, keepdims=True)
+    uniform = np.broadcast_to(mask, probabilities.shape) / np.sum(mask, axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, probabilities / total, uniform)
+
+def sample_actions(probabilities, rng=None):
+    """
+    Samples one action per row of a probability array. Pass a generator owned by the caller (an
+    agent or environment) to make the draws reproducible; without one a fresh unseeded one is used.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    probabilities = np.asarray(probabilities)
+    cumulative = probabilities.cumsum(axis=-1)
+    draws = rng.random(probabilities.shape[:-1])[..., None] * cumulative[..., -1:]
+    actions = np.minimum((draws >= cumulative).sum(axis=-1), probabilities.shape[-1] - 1)
+    return int(actions) if np.ndim(actions) == 0 else actions
+
+def random_legal_action(mask, rng=None):
+    """
+    Picks a uniformly random legal action.
+    """
+    return sample_actions(mask_probabilities(np.ones(np.shape(mask)), mask), rng)
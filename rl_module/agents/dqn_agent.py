@@ -6,9 +6,11 @@ import torch.nn as nn
 import torch.optim as optim
 import random
 from collections import deque
+from itertools import repeat
+from rl_module.agents.action_masking import masked_argmax, random_legal_action
 
 class DQNAgent:
-    def __init__(self, state_size, action_size, gamma=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995, learning_rate=0.001, batch_size=64, memory_size=10000):
+    def __init__(self, state_size, action_size, gamma=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995, learning_rate=0.001, batch_size=64, memory_size=10000, seed=None):
         self.state_size = state_size
         self.action_size = action_size
         self.gamma = gamma  # Discount factor
@@ -18,6 +20,7 @@ class DQNAgent:
         self.learning_rate = learning_rate
         self.batch_size = batch_size
         self.memory = deque(maxlen=memory_size)
+        self.rng = np.random.default_rng(seed)  # Exploration draws, so masked exploration can be replayed
         
         # Build the model
         self.model = self._build_model()
@@ -35,21 +38,49 @@ class DQNAgent:
         )
         return model
 
-    def remember(self, state, action, reward, next_state, done):
+    def remember(self, state, action, reward, next_state, done, next_legal_mask=None):
         """
         Store a transition in memory for experience replay.
+        The legal-action mask of the next state, when given, restricts the bootstrapped target to legal actions.
         """
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.append((state, action, reward, next_state, done, next_legal_mask))
 
-    def act(self, state):
+    def remember_batch(self, states, actions, rewards, next_states, dones, next_legal_masks=None):
+        """
+        Store a batch of transitions (e.g. one offline dataset shard) in memory for experience replay.
+        """
+        masks = repeat(None) if next_legal_masks is None else next_legal_masks
+        self.memory.extend(zip(states, actions, rewards, next_states, dones, masks))
+
+    def load_offline_shards(self, shard_dir):
+        """
+        Fill replay memory with transitions built from logged hands by rl_module/training/offline_dataset.py.
+        Only the most recent memory_size transitions are kept.
+        """
+        from rl_module.training.offline_dataset import load_offline_shards
+
+        for shard in load_offline_shards(shard_dir):
+            self.remember_batch(
+                np.asarray(shard['states']), np.asarray(shard['actions']), np.asarray(shard['rewards']),
+                np.asarray(shard['next_states']), np.asarray(shard['dones'])
+            )
+
+    def act(self, state, legal_mask=None):
         """
         Choose an action using epsilon-greedy strategy.
+        With a legal-action mask (see PokerEnvironment.legal_action_mask), both the random and the
+        greedy choice are restricted to legal actions.
         """
-        if np.random.rand() <= self.epsilon:
-            return random.randrange(self.action_size)
+        if self.rng.random() <= self.epsilon:
+            if legal_mask is None:
+                return int(self.rng.integers(self.action_size))
+            return random_legal_action(legal_mask, self.rng)
         state = torch.FloatTensor(state).unsqueeze(0)
-        q_values = self.model(state)
-        return torch.argmax(q_values).item()
+        with torch.no_grad():
+            q_values = self.model(state)
+        if legal_mask is None:
+            return torch.argmax(q_values).item()
+        return masked_argmax(q_values[0].numpy(), legal_mask)
 
     def replay(self):
         """
@@ -59,11 +90,14 @@ class DQNAgent:
             return
 
         minibatch = random.sample(self.memory, self.batch_size)
-        for state, action, reward, next_state, done in minibatch:
+        for state, action, reward, next_state, done, next_legal_mask in minibatch:
             target = reward
             if not done:
                 next_state = torch.FloatTensor(next_state).unsqueeze(0)
-                target += self.gamma * torch.max(self.model(next_state)).item()
+                next_q_values = self.model(next_state)[0]
+                if next_legal_mask is not None:
+                    next_q_values = next_q_values.masked_fill(~torch.as_tensor(next_legal_mask, dtype=torch.bool), float('-inf'))
+                target += self.gamma * torch.max(next_q_values).item()
 
             state = torch.FloatTensor(state).unsqueeze(0)
             q_values = self.model(state)
@@ -3,8 +3,10 @@
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers
-import gym
+import gymnasium as gym
 import random
+from rl_module.agents.action_masking import mask_probabilities
+from rl_module.environment.gym_wrapper import ENV_ID
 
 class PolicyGradientAgent:
     def __init__(self, state_size, action_size, learning_rate=0.001, gamma=0.99):
@@ -58,19 +60,23 @@ class PolicyGradientAgent:
         self.actions.append(action)
         self.rewards.append(reward)
 
-    def act(self, state):
+    def act(self, state, legal_mask=None):
         """
         Select an action based on the current policy (probabilistic).
 
         Args:
             state (array): The current state.
+            legal_mask (array, optional): Boolean mask of legal actions. Illegal actions get no
+                probability and the policy is renormalized over the legal ones (a masked softmax).
 
         Returns:
             int: The action chosen based on policy.
         """
         state = np.reshape(state, [1, self.state_size])
-        action_probs = self.model.predict(state, verbose=0)
-        return np.random.choice(self.action_size, p=action_probs[0])
+        action_probs = self.model.predict(state, verbose=0)[0]
+        if legal_mask is not None:
+            action_probs = mask_probabilities(action_probs, legal_mask)
+        return np.random.choice(self.action_size, p=action_probs)
 
     def discount_rewards(self, rewards):
         """
@@ -111,34 +117,34 @@ class PolicyGradientAgent:
         # Clear the memory after training
         self.states, self.actions, self.rewards = [], [], []
 
-def train_policy_gradient_agent(env_name="CartPole-v1", episodes=1000, render=False):
+def train_policy_gradient_agent(env_name=ENV_ID, episodes=1000, render=False):
     """
     Trains a policy gradient agent on a given environment.
 
     Args:
-        env_name (str): The OpenAI gym environment.
+        env_name (str): The Gymnasium environment (the poker environment by default).
         episodes (int): Number of training episodes.
         render (bool): If True, renders the environment during training.
     """
-    env = gym.make(env_name)
+    env = gym.make(env_name, render_mode="ansi" if render else None)
     agent = PolicyGradientAgent(state_size=env.observation_space.shape[0], action_size=env.action_space.n)
 
     for episode in range(episodes):
-        state = env.reset()
+        state, info = env.reset()
         episode_reward = 0
 
         while True:
             if render:
-                env.render()
+                print(env.render())
 
-            action = agent.act(state)
-            next_state, reward, done, _ = env.step(action)
+            action = agent.act(state, info.get("action_mask"))
+            next_state, reward, terminated, truncated, info = env.step(action)
 
             agent.remember(state, action, reward)
             state = next_state
             episode_reward += reward
 
-            if done:
+            if terminated or truncated:
                 agent.train()
                 print(f"Episode {episode + 1}/{episodes} - Reward: {episode_reward}")
                 break
@@ -0,0 +1,166 @@
+# gym_wrapper.py
+
+"""
+Gymnasium interface to PokerEnvironment.
+The agent plays one seat. The other seats are played by an opponent policy between the agent's
+decisions, so every step() is one agent decision and returns the standard
+(observation, reward, terminated, truncated, info) 5-tuple. Observations are the StateRepresentation
+vectors of the agent's seat, actions are the discrete bet-size abstraction (see
+strategy_engine/solver/action_abstraction.py) and info['action_mask'] holds the legal actions.
+
+The environment is registered as ENV_ID on import, so standard tooling can create it with
+gymnasium.make(ENV_ID) or drive many copies across subprocesses with make_vector_env().
+"""
+
+from functools import partial
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+from rl_module.agents.action_masking import random_legal_action
+from rl_module.environment.poker_environment import ACTIONS, PokerEnvironment
+from rl_module.environment.state_representation import StateRepresentation
+
+ENV_ID = "PokerAI/NoLimitHoldem-v0"
+# Largest encoded card value (ace of spades, see StateRepresentation.encode_card)
+MAX_CARD_VALUE = 144
+
+def random_opponent(state, legal_mask, rng):
+    """
+    Default opponent policy: a uniformly random legal action.
+
+    Args:
+        state (dict): The game state (see PokerEnvironment.get_game_state) with 'current_player' to act.
+        legal_mask (np.ndarray): Legal actions of that player.
+        rng (np.random.Generator): The environment's generator.
+
+    Returns:
+        int: An index into ACTIONS.
+    """
+    return random_legal_action(legal_mask, rng)
+
+class PokerGymEnv(gym.Env):
+    """
+    Single-agent Gymnasium environment over no-limit hold'em hands. Each episode is one hand; the
+    reward is the agent's net chip result, paid on the terminating step. Hands that end before the
+    agent has a decision (everyone folding to its big blind) are not returned as episodes.
+    """
+
+    metadata = {"render_modes": ["ansi"], "render_fps": 1}
+
+    def __init__(self, num_players=6, starting_stack=200, small_blind=1, big_blind=2, opponent_policy=None,
+                 render_mode=None):
+        """
+        Args:
+            num_players, starting_stack, small_blind, big_blind: See PokerEnvironment.
+            opponent_policy (callable, optional): Called as policy(state, legal_mask, rng) for every
+                non-agent decision and returns an action index. Defaults to random_opponent.
+            render_mode (str, optional): 'ansi' to render the game state as text.
+        """
+        self.poker = PokerEnvironment(num_players, starting_stack, small_blind, big_blind)
+        self.states = StateRepresentation(num_players)
+        self.opponent_policy = opponent_policy or random_opponent
+        self.render_mode = render_mode
+
+        max_chips = num_players * starting_stack
+        self.observation_space = spaces.Box(0.0, float(max(max_chips, MAX_CARD_VALUE)),
+                                            shape=(self.states.state_size,), dtype=np.float32)
+        self.action_space = spaces.Discrete(len(ACTIONS))
+
+    def _observation(self):
+        poker, seat = self.poker, self.poker.agent_position
+        players = np.stack([poker.stacks, poker.bets, ~poker.folded], axis=-1)
+        return self.states.get_state_batch(poker.hole_cards[seat][None], poker.board[None], [poker.pot],
+                                           [poker.current_bet], players[None])[0]
+
+    def _info(self, info=None):
+        info = dict(info or {})
+        info["action_mask"] = self.poker.legal_action_mask(self.poker.agent_position)
+        return info
+
+    def _play_opponents(self, result):
+        # Lets the opponents act until the agent has a decision or the hand is over
+        state, reward, done, info = result
+        while not done and state["current_player"] != self.poker.agent_position:
+            action = self.opponent_policy(state, self.poker.legal_action_mask(), self.np_random)
+            state, reward, done, info = self.poker.step(action)
+        return state, reward, done, info
+
+    def reset(self, *, seed=None, options=None):
+        """
+        Deals a new hand and plays the opponents up to the agent's first decision.
+
+        Args:
+            seed (int, optional): Reseeds the environment's generator (deals and opponent actions).
+            options (dict, optional): Unused.
+
+        Returns:
+            tuple: (observation, info).
+        """
+        super().reset(seed=seed)
+        # The poker engine shares the Gymnasium generator, so one seed reproduces the whole run
+        self.poker.rng = self.np_random
+        if seed is not None:
+            self.poker.agent_position = int(self.np_random.integers(self.poker.num_players))
+            self.poker.button = self.poker.num_players - 1
+        done = True
+        while done:
+            _, _, done, info = self._play_opponents((self.poker.reset(), 0, False, {}))
+        return self._observation(), self._info({"seed": self.poker.episode_seed})
+
+    def step(self, action):
+        """
+        Plays the agent's action and the opponents' replies.
+
+        Args:
+            action (int): An index into ACTIONS; it should be legal under info['action_mask'].
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info).
+        """
+        _, reward, done, info = self._play_opponents(self.poker.step(int(action)))
+        return self._observation(), float(reward), done, False, self._info(info)
+
+    def render(self):
+        if self.render_mode != "ansi":
+            return None
+        poker = self.poker
+        return (f"Board: {' '.join(poker.community_cards) or '-'} | Pot: {poker.pot} | "
+                f"Hand: {' '.join(poker.player_hands[poker.agent_position])} | Stacks: {poker.stacks.tolist()}")
+
+def register_environment():
+    """
+    Registers PokerGymEnv under ENV_ID (safe to call more than once).
+    """
+    if ENV_ID not in gym.registry:
+        gym.register(id=ENV_ID, entry_point=f"{__name__}:PokerGymEnv")
+
+def make_vector_env(num_envs, asynchronous=True, **env_kwargs):
+    """
+    Creates a vector of independent poker environments.
+
+    Args:
+        num_envs (int): Number of environments.
+        asynchronous (bool): Run each environment in its own subprocess (AsyncVectorEnv) or all in
+            this process (SyncVectorEnv).
+        **env_kwargs: Arguments of PokerGymEnv (opponent_policy must be picklable when asynchronous).
+
+    Returns:
+        gymnasium.vector.VectorEnv: The vector environment. reset(seed=seed) seeds its environments
+            with seed, seed + 1, ...
+    """
+    factories = [partial(PokerGymEnv, **env_kwargs) for _ in range(num_envs)]
+    return gym.vector.AsyncVectorEnv(factories) if asynchronous else gym.vector.SyncVectorEnv(factories)
+
+register_environment()
+
+if __name__ == "__main__":
+    # Example usage: random legal actions in four synchronous environments
+    envs = make_vector_env(4, asynchronous=False)
+    observations, infos = envs.reset(seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        # Environments that just finished a hand ignore their action and deal the next one
+        actions = np.array([random_legal_action(mask, rng) if mask.any() else 0 for mask in infos["action_mask"]])
+        observations, rewards, terminated, truncated, infos = envs.step(actions)
+        print(f"Rewards: {rewards.tolist()} terminated: {terminated.tolist()}")
+    envs.close()
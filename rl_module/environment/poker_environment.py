@@ -1,75 +1,151 @@
 import numpy as np
-import random
+from strategy_engine.card_encoding import NUM_CARDS, card_to_string
+from strategy_engine.solver.action_abstraction import ACTION_NAMES, ALL_IN, CHECK_CALL, FIRST_SIZE, FOLD, POT_FRACTIONS
+from strategy_engine.solver.card_abstraction import showdown_strength
+
+# Community cards dealt at the start of each betting round (pre-flop, flop, turn, river)
+STREET_CARDS = (0, 3, 1, 1)
+SHOWDOWN = len(STREET_CARDS)
+# Discrete actions accepted by step(): fold, check/call, the pot-fraction raises and all-in
+ACTIONS = ACTION_NAMES
 
 class PokerEnvironment:
     """
     A simulation environment for poker gameplay, designed to interface with reinforcement learning agents.
     This environment handles poker mechanics such as dealing cards, handling betting rounds, and determining winners.
+
+    Each episode is one no-limit hold'em hand. Blinds are posted, raises must be at least the size of
+    the previous full raise (all-ins for less are allowed but do not reopen the betting), folded and
+    all-in players are skipped, a betting round closes once every player still able to act has acted
+    and matched the bet, and the pot is split into side pots at showdown. All chip amounts are
+    integers kept in preallocated NumPy arrays.
+
+    Randomness comes from the environment's own np.random.Generator. Every hand is dealt from a
+    generator seeded with its own episode seed, recorded together with the button and the actions
+    taken, so any hand can be regenerated exactly with replay().
     """
 
-    def __init__(self, num_players=6):
+    def __init__(self, num_players=6, starting_stack=200, small_blind=1, big_blind=2, seed=None):
         """
         Initialize the poker environment.
 
         Args:
             num_players (int): The number of players at the poker table (including the RL agent).
+            starting_stack (int): Chips each player starts every hand with.
+            small_blind (int): The small blind.
+            big_blind (int): The big blind (also the minimum bet and raise size).
+            seed (int or np.random.SeedSequence, optional): Seeds the seat of the agent and the episode
+                seeds. Parallel workers should pass independent streams, e.g. SeedSequence(seed).spawn(n).
         """
+        if num_players < 2:
+            raise ValueError("A hand needs at least two players")
+        if not 0 < small_blind <= big_blind < starting_stack:
+            raise ValueError("Blinds must be positive, small <= big, and smaller than the starting stack")
         self.num_players = num_players
-        self.deck = self.create_deck()
+        self.starting_stack = int(starting_stack)
+        self.small_blind = int(small_blind)
+        self.big_blind = int(big_blind)
+        self.rng = np.random.default_rng(seed)
+
+        self.stacks = np.full(num_players, self.starting_stack, dtype=np.int64)
+        self.bets = np.zeros(num_players, dtype=np.int64)           # Chips put in on the current betting round
+        self.contributions = np.zeros(num_players, dtype=np.int64)  # Chips put in during the whole hand
+        self.folded = np.zeros(num_players, dtype=bool)
+        self.all_in = np.zeros(num_players, dtype=bool)
+        self.acted = np.zeros(num_players, dtype=bool)              # Acted since the last full raise
+        self.hole_cards = np.zeros((num_players, 2), dtype=np.int64)
+        self.board = np.full(5, -1, dtype=np.int64)
+        self.num_board_cards = 0
+
+        self.episode_seed = None
+        self.history = []  # (player, action, raise-to amount) of every action in the hand
+        self.deck = np.arange(NUM_CARDS, dtype=np.int64)
+        self.deck_position = 0
         self.community_cards = []
         self.player_hands = [[] for _ in range(self.num_players)]
         self.pot = 0
         self.betting_round = 0
-        self.agent_position = random.randint(0, self.num_players - 1)
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self.button = num_players - 1
+        self.agent_position = int(self.rng.integers(self.num_players))
         self.current_player = 0
-        self.bets = [0] * self.num_players
+        self.done = True
 
-    def create_deck(self):
+    def create_deck(self, seed):
         """
         Creates and shuffles a standard deck of 52 cards.
-        
+
+        Args:
+            seed (int): The episode seed; the same seed always gives the same deck.
+
         Returns:
-            list: A shuffled deck of cards.
+            np.ndarray: A shuffled deck of card codes (see strategy_engine.card_encoding).
         """
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        deck = [f'{rank} of {suit}' for rank in ranks for suit in suits]
-        random.shuffle(deck)
-        return deck
+        return np.random.default_rng(seed).permutation(NUM_CARDS)
 
-    def reset(self):
+    def reset(self, seed=None, button=None):
         """
-        Resets the environment for a new game of poker.
+        Resets the environment for a new hand: moves the button, deals and posts the blinds.
+
+        Args:
+            seed (int, optional): Episode seed of the deck; drawn from the environment's generator by default.
+            button (int, optional): Seat of the button; by default it moves one seat on.
 
         Returns:
             dict: The initial game state.
         """
-        self.deck = self.create_deck()
+        self.episode_seed = int(self.rng.integers(2 ** 63)) if seed is None else int(seed)
+        self.history = []
+        self.deck = self.create_deck(self.episode_seed)
+        self.deck_position = 0
+        self.stacks[:] = self.starting_stack
+        self.bets[:] = 0
+        self.contributions[:] = 0
+        self.folded[:] = False
+        self.all_in[:] = False
+        self.acted[:] = False
+        self.board[:] = -1
+        self.num_board_cards = 0
         self.community_cards = []
-        self.player_hands = [[] for _ in range(self.num_players)]
         self.pot = 0
         self.betting_round = 0
-        self.bets = [0] * self.num_players
+        self.done = False
         self.deal_hands()
 
+        # Heads-up, the button posts the small blind and acts first pre-flop
+        self.button = (self.button + 1) % self.num_players if button is None else int(button)
+        small_blind_seat = self.button if self.num_players == 2 else (self.button + 1) % self.num_players
+        big_blind_seat = (small_blind_seat + 1) % self.num_players
+        self._commit(small_blind_seat, min(self.small_blind, self.stacks[small_blind_seat]))
+        self._commit(big_blind_seat, min(self.big_blind, self.stacks[big_blind_seat]))
+        self.current_bet = self.big_blind
+        self.min_raise = self.big_blind
+        self.current_player = self._next_to_act(big_blind_seat)
+
         return self.get_game_state()
 
     def deal_hands(self):
         """
         Deals two hole cards to each player.
         """
-        for i in range(self.num_players):
-            self.player_hands[i] = [self.deck.pop(), self.deck.pop()]
+        count = 2 * self.num_players
+        self.hole_cards[:] = self.deck[:count].reshape(self.num_players, 2)
+        self.deck_position = count
+        self.player_hands = [[card_to_string(code) for code in hand] for hand in self.hole_cards.tolist()]
 
     def deal_community_cards(self, num_cards):
         """
         Deals community cards (flop, turn, or river).
-        
+
         Args:
             num_cards (int): The number of community cards to deal.
         """
-        for _ in range(num_cards):
-            self.community_cards.append(self.deck.pop())
+        cards = self.deck[self.deck_position:self.deck_position + num_cards]
+        self.board[self.num_board_cards:self.num_board_cards + num_cards] = cards
+        self.deck_position += num_cards
+        self.num_board_cards += num_cards
+        self.community_cards.extend(card_to_string(code) for code in cards.tolist())
 
     def get_game_state(self):
         """
@@ -77,77 +153,258 @@ class PokerEnvironment:
 
         Returns:
             dict: A dictionary containing the agent's hand, community cards, pot, and betting info.
+                'legal_actions' is the agent's legal-action mask, all False when another player is
+                to act (other seats get theirs from legal_action_mask()), so opponent steps do not
+                pay for computing it.
         """
+        agent_to_act = not self.done and self.current_player == self.agent_position
         return {
             "agent_hand": self.player_hands[self.agent_position],
             "community_cards": self.community_cards,
-            "pot": self.pot,
-            "bets": self.bets,
+            "pot": int(self.pot),
+            "bets": self.bets.copy(),
+            "stacks": self.stacks.copy(),
+            "folded": self.folded.copy(),
             "betting_round": self.betting_round,
-            "current_player": self.current_player
+            "current_player": self.current_player,
+            "to_call": self.to_call(),
+            "min_raise_to": self.min_raise_to(),
+            "max_raise_to": self.max_raise_to(),
+            "legal_actions": self.legal_action_mask() if agent_to_act else np.zeros(len(ACTIONS), dtype=bool)
         }
 
-    def step(self, action):
+    def legal_action_mask(self, player=None):
         """
-        Executes the given action and advances the game.
+        Returns the legal actions of the player as a boolean mask over ACTIONS.
+        Folding is only legal when facing a bet. A raise size is offered when it is smaller than
+        all-in and differs from the smaller sizes (see action_abstraction.legal_raise_targets).
 
         Args:
-            action (int): The action taken by the current player (fold, call, raise, etc.).
+            player (int, optional): The player (defaults to the player to act).
 
         Returns:
-            tuple: A tuple of (next_state, reward, done, info)
+            np.ndarray: Boolean mask of length len(ACTIONS); all False once the hand is over.
+        """
+        player = self.current_player if player is None else player
+        mask = np.zeros(len(ACTIONS), dtype=bool)
+        if self.done or player < 0:
+            return mask
+        mask[FOLD] = self.current_bet > self.bets[player]
+        mask[CHECK_CALL] = True
+        if self.can_raise(player):
+            mask[FIRST_SIZE:ALL_IN] = self.raise_targets(player)[1]
+            mask[ALL_IN] = True
+        return mask
+
+    def raise_targets(self, player=None):
+        """
+        Returns the raise-to amounts of the abstract raise sizes and whether each is legal, as lists.
+        This is the scalar form of action_abstraction.legal_raise_targets, which is much slower
+        than plain arithmetic for a single seat.
+        """
+        player = self.current_player if player is None else player
+        lowest, highest = self.min_raise_to(player), self.max_raise_to(player)
+        pot_after_call = self.pot + self.current_bet - int(self.bets[player])
+        targets, legal, previous = [], [], None
+        for fraction in POT_FRACTIONS:
+            target = max(round(self.current_bet + fraction * pot_after_call), lowest)
+            legal.append(target < highest and target != previous)
+            targets.append(target)
+            previous = target
+        return targets, legal
+
+    def to_call(self, player=None):
         """
-        reward = 0
-        done = False
-        info = {}
+        Returns the chips the player needs to put in to call (capped by the player's stack).
+        """
+        player = self.current_player if player is None else player
+        return int(min(self.current_bet - self.bets[player], self.stacks[player]))
+
+    def max_raise_to(self, player=None):
+        """
+        Returns the largest total bet the player can make this round (all-in).
+        """
+        player = self.current_player if player is None else player
+        return int(self.bets[player] + self.stacks[player])
+
+    def min_raise_to(self, player=None):
+        """
+        Returns the smallest total bet a raise can make: the current bet plus the last full raise,
+        or all-in if the player cannot cover that.
+        """
+        player = self.current_player if player is None else player
+        return int(min(self.current_bet + self.min_raise, self.max_raise_to(player)))
+
+    def can_raise(self, player=None):
+        """
+        Checks whether the player may bet or raise. Betting is closed for players who already acted
+        and only faced an all-in for less than a full raise, and when nobody else could call.
+        """
+        player = self.current_player if player is None else player
+        if self.done or self.folded[player] or self.all_in[player] or self.acted[player]:
+            return False
+        if self.stacks[player] <= self.current_bet - self.bets[player]:
+            return False
+        others = ~self.folded & ~self.all_in
+        others[player] = False
+        return bool(others.any())
+
+    def step(self, action, amount=None):
+        """
+        Executes the given action for the current player and advances the game.
+
+        Args:
+            action (int or str): An index into ACTIONS, or 'fold', 'check', 'call', 'raise' (or 'bet') or 'all-in'.
+                Indices of the raise sizes raise to that fraction of the pot. 'check' is only legal
+                when there is nothing to call.
+            amount (int, optional): For 'raise' and 'bet', the total bet to raise to. It is clamped
+                between the minimum raise and all-in; defaults to the minimum raise.
+
+        Returns:
+            tuple: A tuple of (next_state, reward, done, info). The reward is the agent's net chip
+                result once the hand is over and 0 before that.
+        """
+        if self.done:
+            raise ValueError("The hand is over; call reset() to deal a new one")
+        player = self.current_player
+        if not isinstance(action, str):
+            index = int(action)
+            action = 'raise' if FIRST_SIZE <= index < ALL_IN else ACTIONS[index]
+            if action == 'raise' and self.can_raise(player):
+                amount = self.raise_targets(player)[0][index - FIRST_SIZE]
 
         if action == "fold":
-            reward = -1
-            done = True
-        elif action == "call":
-            call_amount = max(self.bets) - self.bets[self.current_player]
-            self.pot += call_amount
-            self.bets[self.current_player] += call_amount
-        elif action == "raise":
-            raise_amount = random.randint(10, 50)  # Example raise logic
-            self.pot += raise_amount
-            self.bets[self.current_player] += raise_amount
+            self.folded[player] = True
+        elif action in ("check", "call"):
+            if action == "check" and self.to_call(player) > 0:
+                raise ValueError(f"Player {player} cannot check facing a bet of {self.current_bet}")
+            self._commit(player, self.to_call(player))
+        elif action in ("raise", "bet", "all-in"):
+            if not self.can_raise(player):
+                raise ValueError(f"Player {player} cannot raise now")
+            lowest, highest = self.min_raise_to(player), self.max_raise_to(player)
+            target = highest if action == "all-in" else lowest if amount is None else int(amount)
+            target = min(max(target, lowest), highest)
+            amount = target
+            if target - self.current_bet >= self.min_raise:
+                # A full raise reopens the betting for everyone else
+                self.min_raise = target - self.current_bet
+                self.acted[:] = False
+            self.current_bet = target
+            self._commit(player, target - self.bets[player])
         else:
             raise ValueError(f"Unknown action: {action}")
 
-        # Move to the next player
-        self.current_player = (self.current_player + 1) % self.num_players
+        self.acted[player] = True
+        self.history.append((player, action, int(amount) if action in ("raise", "bet", "all-in") else None))
+        return self._advance()
 
-        # Check if round is complete (i.e., all players have acted)
-        if self.current_player == 0:
-            self.betting_round += 1
+    def replay(self, seed, button, history):
+        """
+        Regenerates a recorded hand: deals it from its episode seed and repeats its actions.
 
-        # Deal community cards based on betting round
-        if self.betting_round == 1:  # Flop
-            self.deal_community_cards(3)
-        elif self.betting_round == 2:  # Turn
-            self.deal_community_cards(1)
-        elif self.betting_round == 3:  # River
-            self.deal_community_cards(1)
+        Args:
+            seed (int): The episode seed (info['seed'] of the hand's last step).
+            button (int): The button seat (info['button']).
+            history (list): The (player, action, amount) entries of info['history'].
+
+        Returns:
+            tuple: The (next_state, reward, done, info) of the last action.
+        """
+        result = (self.reset(seed=seed, button=button), 0, False, {})
+        for player, action, amount in history:
+            if player != self.current_player:
+                raise ValueError(f"Recorded action of player {player} but player {self.current_player} is to act")
+            result = self.step(action, amount)
+        return result
+
+    def _commit(self, player, amount):
+        self.stacks[player] -= amount
+        self.bets[player] += amount
+        self.contributions[player] += amount
+        self.pot += int(amount)
+        if self.stacks[player] == 0:
+            self.all_in[player] = True
+
+    def _next_to_act(self, seat):
+        # First player after the seat who has neither folded nor gone all-in, or -1
+        for offset in range(1, self.num_players + 1):
+            player = (seat + offset) % self.num_players
+            if not self.folded[player] and not self.all_in[player]:
+                return player
+        return -1
 
-        # Check if the game is finished
-        if self.betting_round > 3:
-            done = True
-            reward = self.calculate_winner()
+    def _advance(self):
+        active = ~self.folded
+        if active.sum() == 1:
+            return self._finish()
 
-        next_state = self.get_game_state()
-        return next_state, reward, done, info
+        able = active & ~self.all_in
+        matched = (self.bets[able] == self.current_bet).all()
+        if not matched or (able.sum() > 1 and not self.acted[able].all()):
+            self.current_player = self._next_to_act(self.current_player)
+            return self.get_game_state(), 0, False, {}
+
+        # The betting round is closed: start the next street, or run the board out if nobody can bet
+        self.bets[:] = 0
+        self.acted[:] = False
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self.betting_round += 1
+        if self.betting_round >= SHOWDOWN or able.sum() <= 1:
+            self.deal_community_cards(5 - self.num_board_cards)
+            self.betting_round = SHOWDOWN
+            return self._finish()
+        self.deal_community_cards(STREET_CARDS[self.betting_round])
+        self.current_player = self._next_to_act(self.button)
+        return self.get_game_state(), 0, False, {}
+
+    def _finish(self):
+        reward = self.calculate_winner()
+        self.done = True
+        payouts = self.stacks - self.starting_stack
+        info = {
+            "payouts": payouts,
+            "win": bool(payouts[self.agent_position] > 0),
+            "seed": self.episode_seed,
+            "button": self.button,
+            "history": list(self.history)
+        }
+        return self.get_game_state(), reward, True, info
 
     def calculate_winner(self):
         """
-        Determines the winner of the hand and distributes the pot.
+        Determines the winners of the hand and distributes the pot, splitting it into side pots
+        when players are all-in for different amounts. Odd chips go to the first winners after the button.
 
         Returns:
-            int: The reward for the agent (based on whether they win or lose).
+            int: The reward for the agent (its net chip result for the hand).
         """
-        # Example random winner determination for simplicity
-        winning_player = random.randint(0, self.num_players - 1)
-        if winning_player == self.agent_position:
-            return self.pot  # Agent wins the pot
+        active = np.flatnonzero(~self.folded)
+        winnings = np.zeros(self.num_players, dtype=np.int64)
+        if len(active) == 1:
+            winnings[active[0]] = self.contributions.sum()
         else:
-            return -self.pot  # Agent loses the pot
+            board = self.board[:self.num_board_cards].tolist()
+            strengths = {seat: showdown_strength(self.hole_cards[seat].tolist(), board) for seat in active.tolist()}
+            # Seats in odd-chip order: first seat after the button first
+            order = sorted(strengths, key=lambda seat: (seat - self.button - 1) % self.num_players)
+            levels = np.unique(self.contributions[active])
+            previous = 0
+            for level in levels.tolist():
+                layer = np.minimum(self.contributions, level) - np.minimum(self.contributions, previous)
+                amount = int(layer.sum())
+                if level == levels[-1]:
+                    # Chips folded players put in above every active player's total go to the last pot
+                    amount += int((self.contributions - np.minimum(self.contributions, level)).sum())
+                eligible = [seat for seat in order if self.contributions[seat] >= level]
+                best = max(strengths[seat] for seat in eligible)
+                winners = [seat for seat in eligible if strengths[seat] == best]
+                share, remainder = divmod(amount, len(winners))
+                winnings[winners] += share
+                winnings[winners[:remainder]] += 1
+                previous = level
+
+        self.stacks += winnings
+        self.pot = 0
+        return int(self.stacks[self.agent_position] - self.starting_stack)
@@ -123,3 +123,43 @@ class StateRepresentation:
         
         # Return the final state vector as a NumPy array
         return np.array(state_vector)
+
+    def encode_card_codes(self, codes):
+        """
+        Vectorized version of encode_card for integer card codes (see strategy_engine.card_encoding).
+
+        Args:
+            codes (np.array): Card codes (0-51); negative values mark missing cards.
+
+        Returns:
+            np.array: Encoded cards (rank * 10 + suit, same scheme as encode_card), 0 for missing cards.
+        """
+        codes = np.asarray(codes)
+        encoded = (codes // 4 + 2) * 10 + (codes % 4 + 1)
+        return np.where(codes >= 0, encoded, 0)
+
+    def get_state_batch(self, hands, community_cards, pot_sizes, current_bets, player_data=None):
+        """
+        Builds state vectors for a whole batch of decision points at once.
+
+        Args:
+            hands (np.array): Hole card codes with shape (batch, 2).
+            community_cards (np.array): Community card codes with shape (batch, 5), -1 for undealt cards.
+            pot_sizes (np.array): Pot size for each decision point.
+            current_bets (np.array): Current bet for each decision point.
+            player_data (np.array, optional): Player info with shape (batch, num_players, 3)
+                holding [stack, current bet, is_active]. Zeros if not provided.
+
+        Returns:
+            np.array: A float32 array of shape (batch, state_size).
+        """
+        hands = np.asarray(hands)
+        batch_size = hands.shape[0]
+        states = np.zeros((batch_size, self.state_size), dtype=np.float32)
+        states[:, 0:2] = self.encode_card_codes(hands)
+        states[:, 2:7] = self.encode_card_codes(community_cards)
+        states[:, 7] = pot_sizes
+        states[:, 8] = current_bets
+        if player_data is not None:
+            states[:, 9:] = np.asarray(player_data).reshape(batch_size, -1)
+        return states
@@ -2,12 +2,15 @@
 
 import random
 import numpy as np
+from rl_module.agents.action_masking import as_mask, masked_argmax, masked_softmax
 
 class ExplorationStrategy:
     """
     Base class for defining exploration strategies in RL.
     Each strategy must implement the get_action method, which chooses
     an action based on the current state of the agent and environment.
+    available_actions is either a list of legal action indices or a boolean legal-action mask
+    over all the Q-values (see PokerEnvironment.legal_action_mask); illegal actions are never chosen.
     """
     def __init__(self):
         pass
@@ -29,12 +32,13 @@ class EpsilonGreedyStrategy(ExplorationStrategy):
         self.decay_rate = decay_rate
 
     def get_action(self, state, q_values, available_actions):
-        # Exploration: With probability epsilon, take a random action
+        mask = as_mask(available_actions, len(q_values))
+        # Exploration: With probability epsilon, take a random legal action
         if random.random() < self.epsilon:
-            return random.choice(available_actions)
-        # Exploitation: With probability 1 - epsilon, take the best action
+            return int(random.choice(np.flatnonzero(mask)))
+        # Exploitation: With probability 1 - epsilon, take the best legal action
         else:
-            return np.argmax(q_values)
+            return masked_argmax(q_values, mask)
     
     def decay_epsilon(self):
         """
@@ -53,11 +57,10 @@ class SoftmaxExplorationStrategy(ExplorationStrategy):
         self.temperature = temperature
 
     def get_action(self, state, q_values, available_actions):
-        # Apply softmax to the Q-values
-        exp_q = np.exp(q_values / self.temperature)
-        probabilities = exp_q / np.sum(exp_q)
+        # Apply softmax to the Q-values of the legal actions
+        probabilities = masked_softmax(q_values, as_mask(available_actions, len(q_values)), self.temperature)
         # Choose an action based on the softmax probabilities
-        return np.random.choice(available_actions, p=probabilities)
+        return int(np.random.choice(len(q_values), p=probabilities))
 
 
 class UCBExplorationStrategy(ExplorationStrategy):
@@ -73,10 +76,10 @@ class UCBExplorationStrategy(ExplorationStrategy):
 
     def get_action(self, state, q_values, available_actions, total_steps):
         if self.action_counts is None:
-            self.action_counts = np.zeros(len(available_actions))
+            self.action_counts = np.zeros(len(q_values))
 
         ucb_values = q_values + self.c * np.sqrt(np.log(total_steps + 1) / (self.action_counts + 1))
-        action = np.argmax(ucb_values)
+        action = masked_argmax(ucb_values, as_mask(available_actions, len(q_values)))
         self.action_counts[action] += 1
         return action
 
@@ -115,3 +118,7 @@ if __name__ == "__main__":
     ucb_strategy = UCBExplorationStrategy(c=2)
     action = ucb_strategy.get_action(None, q_values, available_actions, total_steps=10)
     print(f"UCB selected action: {action}")
+
+    # Legal-action mask: the best action (3) is illegal, so the best legal one is picked
+    legal_mask = np.array([True, True, True, False])
+    print(f"Masked greedy action: {EpsilonGreedyStrategy(epsilon_start=0.0).get_action(None, q_values, legal_mask)}")
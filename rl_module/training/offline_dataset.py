@@ -0,0 +1,234 @@
+# offline_dataset.py
+
+"""
+Builds offline training data from processed hand histories.
+Each logged action becomes a (state, action, reward, next_state, done) transition, with the action
+translated onto the bet-size abstraction used by PokerEnvironment. Hands are
+replayed through StateRepresentation in vectorized batches and written to memory-mapped .npy
+shards, which DQNAgent (or a supervised pre-training loop) can read without loading them into RAM.
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from rl_module.environment.state_representation import StateRepresentation
+from scripts.process_hand_histories import load_processed_data
+from strategy_engine.solver.action_abstraction import CHECK_CALL, FIRST_SIZE, FOLD, bet_fractions, translate_bet_sizes
+
+# Mapping of logged actions onto agent action indices; bets and raises are then given their abstract size
+ACTION_INDEX = {'fold': FOLD, 'check': CHECK_CALL, 'call': CHECK_CALL, 'bet': FIRST_SIZE, 'raise': FIRST_SIZE}
+
+SHARD_FIELDS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+INDEX_FILE = "index.json"
+
+def hand_transitions(df):
+    """
+    Derives per-action transition fields from a processed hand history frame in one vectorized pass.
+
+    Args:
+        df (pd.DataFrame): Processed hand history data (see scripts/process_hand_histories.py).
+
+    Returns:
+        dict: Arrays 'hands', 'pot_sizes', 'current_bets', 'actions', 'rewards', 'next_index' and
+            'dones'. actions are indices of the bet-size abstraction (see
+            strategy_engine/solver/action_abstraction.py). next_index holds the row of the same
+            player's next decision in the hand (or the row itself).
+
+    The logs have no street column, so current_bets is the largest earlier amount of the whole hand
+    rather than of the street. A bet below it can only open a later street and is sized against the
+    pot alone; a bet above it on a later street is sized as a raise of the earlier bet.
+    """
+    df = df.assign(action_index=df['action'].str.lower().map(ACTION_INDEX)).dropna(subset=['action_index'])
+    df = df.sort_values(['hand_id', 'timestamp'], kind='stable')
+
+    amounts = df['amount'].to_numpy(dtype=np.float32)
+    by_hand = df.groupby('hand_id', sort=False)['amount']
+    # Pot and bet faced are measured before the action is taken
+    pot_sizes = by_hand.cumsum().to_numpy(dtype=np.float32) - amounts
+    current_bets = by_hand.shift(1).fillna(0).groupby(df['hand_id'], sort=False).cummax().to_numpy(dtype=np.float32)
+
+    # Bets and raises are mapped onto the nearest abstract sizes
+    actions = df['action_index'].to_numpy(dtype=np.int64)
+    reference_bets = np.where(amounts >= current_bets, current_bets, 0)
+    sizes = translate_bet_sizes(bet_fractions(amounts, pot_sizes, reference_bets, 0))
+    actions = np.where(actions == FIRST_SIZE, sizes, actions)
+
+    # The next decision of the same player in the same hand provides next_state
+    positions = np.arange(len(df))
+    next_index = pd.Series(positions, index=df.index).groupby([df['hand_id'], df['player_id']], sort=False).shift(-1)
+    dones = next_index.isna().to_numpy()
+    next_index = np.where(dones, positions, next_index.fillna(0).to_numpy(dtype=np.int64))
+
+    # The hand result is credited on the player's final decision
+    results = pd.to_numeric(df['result'], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+    rewards = np.where(dones, results, 0).astype(np.float32)
+
+    return {
+        'hands': df[['card_1', 'card_2']].to_numpy(dtype=np.int64),
+        'pot_sizes': pot_sizes,
+        'current_bets': current_bets,
+        'actions': actions,
+        'rewards': rewards,
+        'next_index': next_index,
+        'dones': dones
+    }
+
+class ShardWriter:
+    """
+    Writes transitions into fixed-size, memory-mapped .npy shards and records them in an index file.
+    """
+
+    def __init__(self, output_dir, state_size, shard_size=100000):
+        """
+        Args:
+            output_dir (str): Directory where shards are written.
+            state_size (int): Length of each state vector.
+            shard_size (int): Maximum number of transitions per shard.
+        """
+        self.output_dir = output_dir
+        self.state_size = state_size
+        self.shard_size = shard_size
+        self.shards = []
+        self._arrays = None
+        self._filled = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _open_shard(self):
+        shard_id = len(self.shards)
+        shapes = {
+            'states': ((self.shard_size, self.state_size), np.float32),
+            'actions': ((self.shard_size,), np.int64),
+            'rewards': ((self.shard_size,), np.float32),
+            'next_states': ((self.shard_size, self.state_size), np.float32),
+            'dones': ((self.shard_size,), np.bool_)
+        }
+        self._arrays = {
+            field: np.lib.format.open_memmap(self._shard_path(shard_id, field), mode='w+', dtype=dtype, shape=shape)
+            for field, (shape, dtype) in shapes.items()
+        }
+        self._filled = 0
+        self.shards.append({'id': shard_id, 'size': 0})
+
+    def _shard_path(self, shard_id, field):
+        return os.path.join(self.output_dir, f"shard_{shard_id:05d}_{field}.npy")
+
+    def write(self, batch):
+        """
+        Appends a batch of transitions, spilling into new shards as they fill up.
+
+        Args:
+            batch (dict): Arrays for each of SHARD_FIELDS with equal leading dimension.
+        """
+        total = len(batch['actions'])
+        offset = 0
+        while offset < total:
+            if self._arrays is None or self._filled == self.shard_size:
+                self._open_shard()
+            count = min(total - offset, self.shard_size - self._filled)
+            for field in SHARD_FIELDS:
+                self._arrays[field][self._filled:self._filled + count] = batch[field][offset:offset + count]
+            self._filled += count
+            self.shards[-1]['size'] = self._filled
+            offset += count
+
+    def close(self):
+        """
+        Flushes the open shard, trims it to its filled size and writes the shard index.
+
+        Returns:
+            dict: The shard index.
+        """
+        if self._arrays is not None:
+            for array in self._arrays.values():
+                array.flush()
+            self._arrays = None
+            last = self.shards[-1]
+            if last['size'] < self.shard_size:
+                for field in SHARD_FIELDS:
+                    path = self._shard_path(last['id'], field)
+                    trimmed = np.load(path, mmap_mode='r')[:last['size']].copy()
+                    np.save(path, trimmed)
+
+        index = {'state_size': self.state_size, 'fields': list(SHARD_FIELDS), 'shards': self.shards}
+        with open(os.path.join(self.output_dir, INDEX_FILE), 'w') as file:
+            json.dump(index, file, indent=4)
+        return index
+
+def build_offline_dataset(processed_files, output_dir, num_players=6, batch_size=8192, shard_size=100000):
+    """
+    Replays processed hand histories through StateRepresentation and writes transition shards.
+
+    Args:
+        processed_files (list): Paths of processed hand history partitions.
+        output_dir (str): Directory where shards and the index are written.
+        num_players (int): Table size used for the state representation.
+        batch_size (int): Number of decision points encoded per vectorized call.
+        shard_size (int): Maximum number of transitions per shard.
+
+    Returns:
+        dict: The shard index.
+    """
+    representation = StateRepresentation(num_players=num_players)
+    writer = ShardWriter(output_dir, representation.state_size, shard_size=shard_size)
+    no_board = np.full((batch_size, 5), -1, dtype=np.int64)
+
+    for file_path in processed_files:
+        fields = hand_transitions(load_processed_data(file_path))
+        total = len(fields['actions'])
+        print(f"Encoding {total} transitions from {file_path}...")
+
+        for start in range(0, total, batch_size):
+            stop = min(start + batch_size, total)
+            rows = np.arange(start, stop)
+            states = representation.get_state_batch(
+                fields['hands'][rows], no_board[:stop - start],
+                fields['pot_sizes'][rows], fields['current_bets'][rows]
+            )
+            next_rows = fields['next_index'][rows]
+            next_states = representation.get_state_batch(
+                fields['hands'][next_rows], no_board[:stop - start],
+                fields['pot_sizes'][next_rows], fields['current_bets'][next_rows]
+            )
+            writer.write({
+                'states': states,
+                'actions': fields['actions'][rows],
+                'rewards': fields['rewards'][rows],
+                'next_states': next_states,
+                'dones': fields['dones'][rows]
+            })
+
+    return writer.close()
+
+def load_offline_shards(shard_dir):
+    """
+    Opens every shard listed in the index as read-only memory maps.
+
+    Args:
+        shard_dir (str): Directory containing the shards and index.json.
+
+    Yields:
+        dict: Memory-mapped arrays for each of SHARD_FIELDS.
+    """
+    with open(os.path.join(shard_dir, INDEX_FILE), 'r') as file:
+        index = json.load(file)
+    for shard in index['shards']:
+        yield {
+            field: np.load(os.path.join(shard_dir, f"shard_{shard['id']:05d}_{field}.npy"), mmap_mode='r')
+            for field in index['fields']
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build offline training shards from processed hand histories.")
+    parser.add_argument('--input_dir', type=str, default="./data/processed/", help="Directory of processed partitions")
+    parser.add_argument('--output_dir', type=str, default="./data/offline_shards/", help="Directory for the shards")
+    parser.add_argument('--num_players', type=int, default=6, help="Table size for the state representation")
+    args = parser.parse_args()
+
+    files = sorted(
+        os.path.join(args.input_dir, name) for name in os.listdir(args.input_dir)
+        if name.startswith('processed_') and name.endswith('.csv')
+    )
+    index = build_offline_dataset(files, args.output_dir, num_players=args.num_players)
+    print(f"Wrote {sum(shard['size'] for shard in index['shards'])} transitions to {args.output_dir}")
@@ -0,0 +1,329 @@
+# self_play_league.py
+
+"""
+Self-play league: the learner plays a batch of tables against frozen snapshots of past policies.
+Snapshots are small MLP policies (ReLU hidden layers, logits over the bet-size abstraction) stored
+in a SnapshotPool, a shared-memory block that rollout workers attach to by name, so snapshots
+reach every worker without pickling. Each slot has a generation counter that is odd while the slot
+is being written, so readers can tell a complete snapshot from a torn one. A league copies a
+snapshot into its own cache only when its generation changes, and keeps the old copy for as long
+as a seat still plays it, so a snapshot added mid-hand never changes an opponent's policy before
+the hand is over. On every table each non-learner seat is given a snapshot when the hand is dealt.
+All pending opponent decisions across the tables are answered by one batched NumPy forward pass
+(einsum over the gathered snapshot weights) instead of one inference call per seat.
+
+Observations use the StateRepresentation encoding of the acting seat, as in PokerGymEnv, so a
+learner trained here can be snapshotted straight into the pool.
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+from rl_module.agents.action_masking import masked_softmax, sample_actions
+from rl_module.environment.poker_environment import ACTIONS, PokerEnvironment
+from rl_module.environment.state_representation import StateRepresentation
+
+def parameter_shapes(layer_sizes):
+    """
+    Shapes of the (weights, bias) pairs of an MLP with the given layer sizes.
+
+    Args:
+        layer_sizes (list): Input size, hidden sizes and number of actions, e.g. [27, 64, 8].
+
+    Returns:
+        list: (in, out) and (out,) shapes, layer by layer.
+    """
+    shapes = []
+    for size_in, size_out in zip(layer_sizes[:-1], layer_sizes[1:]):
+        shapes += [(size_in, size_out), (size_out,)]
+    return shapes
+
+def mlp_logits(layers, snapshot_ids, observations):
+    """
+    Batched forward pass of many snapshots at once: row i is evaluated with snapshot snapshot_ids[i].
+
+    Args:
+        layers (list): Per-layer (weights, bias) arrays of shape (snapshots, in, out) and (snapshots, out).
+        snapshot_ids (np.ndarray): Snapshot of each row.
+        observations (np.ndarray): Observations of shape (rows, in).
+
+    Returns:
+        np.ndarray: Action logits of shape (rows, actions).
+    """
+    x = np.asarray(observations, dtype=np.float32)
+    for index, (weights, bias) in enumerate(layers):
+        x = np.einsum('ni,nio->no', x, weights[snapshot_ids]) + bias[snapshot_ids]
+        if index < len(layers) - 1:
+            x = np.maximum(x, 0)
+    return x
+
+class SnapshotPool:
+    """
+    Fixed-capacity ring of frozen MLP policies in shared memory. Once full, each new snapshot
+    replaces the oldest one. Only one process may add snapshots; any number may read them with read().
+    """
+
+    def __init__(self, layer_sizes, capacity=16, name=None, create=True):
+        """
+        Args:
+            layer_sizes (list): MLP layer sizes, from the observation size to the number of actions.
+            capacity (int): Number of snapshots kept.
+            name (str, optional): Name of the shared memory block (generated when creating).
+            create (bool): Create the block, or attach to an existing one (see attach()).
+        """
+        self.layer_sizes = [int(size) for size in layer_sizes]
+        self.capacity = int(capacity)
+        shapes = parameter_shapes(self.layer_sizes)
+        # The header holds the number of snapshots added, then the generation of every slot
+        header = np.dtype(np.int64).itemsize * (1 + self.capacity)
+        size = header + 4 * self.capacity * sum(int(np.prod(shape)) for shape in shapes)
+        self.memory = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self.memory.name
+        counters = np.ndarray((1 + self.capacity,), dtype=np.int64, buffer=self.memory.buf)
+        self._count, self.generations = counters[:1], counters[1:]
+        if create:
+            counters[:] = 0
+
+        # Each parameter is one contiguous (capacity, ...) block, so gathering snapshots needs no reshaping
+        self.parameters, offset = [], header
+        for shape in shapes:
+            block = np.ndarray((self.capacity,) + shape, dtype=np.float32, buffer=self.memory.buf, offset=offset)
+            self.parameters.append(block)
+            offset += block.nbytes
+        self.layers = list(zip(self.parameters[0::2], self.parameters[1::2]))
+
+    @classmethod
+    def attach(cls, name, layer_sizes, capacity=16):
+        """
+        Attaches to a pool created by another process (pass the creator's name, layer sizes and capacity).
+        """
+        return cls(layer_sizes, capacity, name=name, create=False)
+
+    def __len__(self):
+        return int(min(self._count[0], self.capacity))
+
+    def add(self, weights):
+        """
+        Stores a snapshot.
+
+        Args:
+            weights (list): Arrays in parameter_shapes order (W1, b1, W2, b2, ...), e.g. a Keras
+                model.get_weights() of Dense layers.
+
+        Returns:
+            int: The slot the snapshot was written to.
+        """
+        if len(weights) != len(self.parameters):
+            raise ValueError(f"Expected {len(self.parameters)} weight arrays, got {len(weights)}")
+        for block, values in zip(self.parameters, weights):
+            if np.shape(values) != block.shape[1:]:
+                raise ValueError(f"Weight shape {np.shape(values)} does not match {block.shape[1:]}")
+        slot = int(self._count[0] % self.capacity)
+        # An odd generation marks the slot as being written until every array is in place
+        self.generations[slot] += 1
+        for block, values in zip(self.parameters, weights):
+            block[slot] = values
+        self.generations[slot] += 1
+        self._count[0] += 1
+        return slot
+
+    def read(self, slot):
+        """
+        Copies a snapshot out of the pool.
+
+        Args:
+            slot (int): The slot to read.
+
+        Returns:
+            tuple: (generation, weights in parameter_shapes order), or None when the slot is empty,
+                being written, or was rewritten while it was copied.
+        """
+        generation = int(self.generations[slot])
+        if generation == 0 or generation % 2:
+            return None
+        weights = [block[slot].copy() for block in self.parameters]
+        if int(self.generations[slot]) != generation:
+            return None
+        return generation, weights
+
+    def close(self):
+        """
+        Detaches this process from the shared memory.
+        """
+        self._count = self.generations = self.parameters = self.layers = None
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory block (call once, from the creating process, after every worker closed it).
+        """
+        self.memory.unlink()
+
+class SelfPlayLeague:
+    """
+    Runs num_tables hands in lockstep. The learner sits in each table's agent_position; every other
+    seat is played by a snapshot from the pool. step() takes one learner action per table, plays the
+    opponents until the learner is to act again on every table and deals a new hand where one ended.
+
+    The league plays from its own cache of the pool, twice the pool's capacity, so an older copy of
+    a rewritten slot can stay cached while seats still play it. seat_snapshots holds cache slots
+    (-1 for the learner's seat).
+    """
+
+    def __init__(self, pool, num_tables=64, num_players=6, starting_stack=200, small_blind=1, big_blind=2,
+                 seed=None):
+        """
+        Args:
+            pool (SnapshotPool): The opponents (must hold at least one snapshot before reset()).
+            num_tables (int): Number of tables played in parallel.
+            num_players, starting_stack, small_blind, big_blind: See PokerEnvironment.
+            seed (int, optional): Seeds the tables' and the league's independent generators.
+        """
+        if pool.layer_sizes[-1] != len(ACTIONS):
+            raise ValueError(f"Snapshots must output {len(ACTIONS)} action logits")
+        seeds = np.random.SeedSequence(seed).spawn(num_tables + 1)
+        self.pool = pool
+        self.rng = np.random.default_rng(seeds[0])
+        self.tables = [PokerEnvironment(num_players, starting_stack, small_blind, big_blind, seed=child)
+                       for child in seeds[1:]]
+        self.states = StateRepresentation(num_players)
+        self.seat_snapshots = np.full((num_tables, num_players), -1, dtype=np.int64)
+
+        self.layers = [(np.zeros((2 * pool.capacity,) + weights.shape[1:], dtype=np.float32),
+                        np.zeros((2 * pool.capacity,) + bias.shape[1:], dtype=np.float32))
+                       for weights, bias in pool.layers]
+        # Cache slot and generation of the latest copy of each pool slot (-1 and 0 until copied)
+        self.cached = np.full(pool.capacity, -1, dtype=np.int64)
+        self.cached_generations = np.zeros(pool.capacity, dtype=np.int64)
+
+    def refresh(self, playing=()):
+        """
+        Copies snapshots that were added to the pool since the last refresh into the cache. A new
+        copy never overwrites a cache slot that the seats of the given tables are playing.
+
+        Args:
+            playing (list): Tables whose hands are in progress.
+
+        Returns:
+            int: Number of snapshots available to deal.
+        """
+        stale = np.flatnonzero(self.pool.generations != self.cached_generations).tolist()
+        if stale:
+            seated = set(self.seat_snapshots[list(playing)].ravel().tolist())
+            in_use = seated | set(self.cached.tolist())
+            free = [slot for slot in range(len(self.layers[0][0])) if slot not in in_use]
+            for pool_slot in stale:
+                snapshot = self.pool.read(pool_slot)
+                # Slots being written, or without a free cache slot, are copied on a later deal
+                if snapshot is None or not free:
+                    continue
+                generation, weights = snapshot
+                slot = free.pop()
+                for (weights_block, bias_block), values in zip(self.layers, zip(weights[0::2], weights[1::2])):
+                    weights_block[slot], bias_block[slot] = values
+                if self.cached[pool_slot] >= 0 and self.cached[pool_slot] not in seated:
+                    free.insert(0, int(self.cached[pool_slot]))
+                self.cached[pool_slot], self.cached_generations[pool_slot] = slot, generation
+        return int((self.cached >= 0).sum())
+
+    def observations(self, tables):
+        """
+        Encodes the state of the player to act at each of the given tables.
+
+        Returns:
+            tuple: (observations, legal masks) of shape (len(tables), state_size) and (len(tables), actions).
+        """
+        envs = [self.tables[index] for index in tables]
+        seats = [env.current_player for env in envs]
+        players = np.stack([np.stack([env.stacks, env.bets, ~env.folded], axis=-1) for env in envs])
+        observations = self.states.get_state_batch(
+            np.stack([env.hole_cards[seat] for env, seat in zip(envs, seats)]), np.stack([env.board for env in envs]),
+            [env.pot for env in envs], [env.current_bet for env in envs], players
+        )
+        return observations, np.stack([env.legal_action_mask() for env in envs])
+
+    def _play_opponents(self, tables):
+        """
+        Plays the snapshot seats of the given tables until the learner is to act or the hand is over,
+        with one batched forward pass per round of pending decisions.
+
+        Returns:
+            dict: Table index -> learner reward of the hands that ended.
+        """
+        finished = {}
+        pending = list(tables)
+        while True:
+            pending = [index for index in pending
+                       if not self.tables[index].done and self.tables[index].current_player != self.tables[index].agent_position]
+            if not pending:
+                return finished
+            observations, masks = self.observations(pending)
+            seats = [self.tables[index].current_player for index in pending]
+            logits = mlp_logits(self.layers, self.seat_snapshots[pending, seats], observations)
+            actions = sample_actions(masked_softmax(logits, masks), self.rng)
+            for index, action in zip(pending, np.atleast_1d(actions).tolist()):
+                _, reward, done, _ = self.tables[index].step(action)
+                if done:
+                    finished[index] = reward
+
+    def _deal(self, tables):
+        # Deals new hands and assigns snapshots; hands that end before the learner acts are dealt again
+        tables = list(tables)
+        while tables:
+            self.refresh(sorted(set(range(len(self.tables))) - set(tables)))
+            available = self.cached[self.cached >= 0]
+            for index in tables:
+                env = self.tables[index]
+                env.reset()
+                self.seat_snapshots[index] = available[self.rng.integers(len(available), size=env.num_players)]
+                self.seat_snapshots[index, env.agent_position] = -1
+            tables = list(self._play_opponents(tables))
+
+    def reset(self):
+        """
+        Deals a hand on every table and plays the opponents up to the learner's first decisions.
+
+        Returns:
+            tuple: (observations, legal masks) of the learner on every table.
+        """
+        if not self.refresh():
+            raise ValueError("The snapshot pool is empty; add a snapshot before playing")
+        self._deal(range(len(self.tables)))
+        return self.observations(range(len(self.tables)))
+
+    def step(self, actions):
+        """
+        Plays one learner action on every table.
+
+        Args:
+            actions (array-like): An index into ACTIONS per table.
+
+        Returns:
+            tuple: (observations, rewards, dones, legal masks). Where dones is True the hand ended
+                (rewards holds the learner's net chips) and the observation is from the next hand.
+        """
+        rewards = np.zeros(len(self.tables))
+        dones = np.zeros(len(self.tables), dtype=bool)
+        for index, action in enumerate(np.asarray(actions).tolist()):
+            _, rewards[index], dones[index], _ = self.tables[index].step(action)
+        for index, reward in self._play_opponents(np.flatnonzero(~dones).tolist()).items():
+            rewards[index], dones[index] = reward, True
+        self._deal(np.flatnonzero(dones).tolist())
+        observations, masks = self.observations(range(len(self.tables)))
+        return observations, rewards, dones, masks
+
+if __name__ == "__main__":
+    # Example usage: a random-weight learner against a pool of random-weight snapshots
+    layer_sizes = [StateRepresentation(6).state_size, 32, len(ACTIONS)]
+    rng = np.random.default_rng(0)
+    pool = SnapshotPool(layer_sizes, capacity=4)
+    for _ in range(4):
+        pool.add([rng.normal(0, 0.05, shape).astype(np.float32) for shape in parameter_shapes(layer_sizes)])
+    league = SelfPlayLeague(pool, num_tables=32, seed=0)
+    observations, masks = league.reset()
+    total, hands = 0.0, 0
+    for _ in range(200):
+        observations, rewards, dones, masks = league.step(sample_actions(masked_softmax(np.zeros(masks.shape), masks), rng))
+        total, hands = total + rewards.sum(), hands + dones.sum()
+    print(f"Learner: {total / max(hands, 1):+.2f} chips per hand over {hands} hands")
+    pool.close()
+    pool.unlink()
@@ -8,6 +8,8 @@ from rl_module.utils.metrics_logger import MetricsLogger
 
 # Load configuration settings
 CONFIG_PATH = './config/rl_config.yaml'
+# Keys of the 'environment' config section passed on to PokerEnvironment
+ENVIRONMENT_KEYS = ('num_players', 'starting_stack', 'small_blind', 'big_blind', 'seed')
 
 def load_config():
     """
@@ -27,7 +29,8 @@ def setup_environment(config):
     Returns:
         PokerEnvironment: The poker environment object initialized with configuration.
     """
-    return PokerEnvironment(config['environment'])
+    settings = config.get('environment') or {}
+    return PokerEnvironment(**{key: settings[key] for key in ENVIRONMENT_KEYS if key in settings})
 
 def initialize_agent(config, environment):
     """
@@ -68,7 +71,7 @@ def train_agent(agent, environment, config):
 
         for step in range(max_steps):
             action = agent.select_action(state)
-            next_state, reward, done = environment.step(action)
+            next_state, reward, done, _ = environment.step(action)
 
             # Update agent with new experience
             agent.update(state, action, reward, next_state, done)
@@ -1,11 +1,24 @@
 import os
+import hashlib
 import pandas as pd
 import json
+from strategy_engine.card_encoding import INVALID_CARD, parse_card_series, hand_class_ids
 
 # Path to the directory containing hand history files
 HAND_HISTORY_DIR = "./data/hand_history/"
 PROCESSED_DATA_DIR = "./data/processed/"
 
+# Manifest recording which raw files have already been ingested
+MANIFEST_FILE = os.path.join(PROCESSED_DATA_DIR, "manifest.json")
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+# Raw columns carried into the processed data
+COLUMNS_TO_KEEP = ['hand_id', 'player_id', 'action', 'amount', 'result', 'timestamp', 'card_1', 'card_2']
+
+# Column types of processed partitions (cards are int codes 0-51, hand_class is 0-168)
+PROCESSED_DTYPES = {'player_id': str, 'action': str, 'card_1': 'int8', 'card_2': 'int8', 'hand_class': 'int16'}
+
 def load_hand_history(file_path):
     """
     Loads a single hand history file (in JSON or CSV format) and returns it as a DataFrame.
@@ -28,6 +41,9 @@ def load_hand_history(file_path):
 def process_hand_history(df):
     """
     Cleans and processes the hand history DataFrame to ensure it is ready for training or analysis.
+    Hole cards are parsed into integer card codes (0-51, suits preserved) and each row gets the
+    canonical 169-class id of the hand. Every kept column is filtered exactly once and the result
+    is assembled as a new frame, so no slice of the input is ever written to.
     
     Args:
         df (pd.DataFrame): DataFrame containing raw hand history data.
@@ -35,25 +51,34 @@ def process_hand_history(df):
     Returns:
         pd.DataFrame: Cleaned and processed DataFrame.
     """
-    # Drop unnecessary columns
-    columns_to_keep = ['hand_id', 'player_id', 'action', 'amount', 'result', 'timestamp', 'card_1', 'card_2']
-    df = df[columns_to_keep]
+    # Parse each distinct card spelling once through a categorical lookup
+    card_1 = parse_card_series(df['card_1'])
+    card_2 = parse_card_series(df['card_2'])
 
-    # Convert timestamps to datetime objects
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    # Drop rows with missing values or cards that could not be parsed
+    keep = df[COLUMNS_TO_KEEP].notna().all(axis=1).to_numpy() & (card_1 != INVALID_CARD) & (card_2 != INVALID_CARD)
+    card_1, card_2 = card_1[keep], card_2[keep]
 
-    # Handle missing values
-    df = df.dropna()
+    processed = {column: df[column].to_numpy()[keep] for column in COLUMNS_TO_KEEP}
+    processed['timestamp'] = pd.to_datetime(processed['timestamp'])
+    processed['card_1'] = card_1
+    processed['card_2'] = card_2
+    processed['hand_class'] = hand_class_ids(card_1, card_2)
 
-    # Convert card values to numeric (e.g., 'Ace' -> 14, 'King' -> 13)
-    card_mapping = {
-        'Ace': 14, 'King': 13, 'Queen': 12, 'Jack': 11,
-        '10': 10, '9': 9, '8': 8, '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2
-    }
-    df['card_1'] = df['card_1'].map(card_mapping)
-    df['card_2'] = df['card_2'].map(card_mapping)
+    return pd.DataFrame(processed, copy=False)
 
-    return df
+def load_processed_data(file_path):
+    """
+    Loads a processed partition with its column types restored, so downstream consumers
+    (offline training, opponent profiling) can use the card codes without re-parsing.
+
+    Args:
+        file_path (str): Path to a processed CSV partition.
+
+    Returns:
+        pd.DataFrame: The processed hand history data.
+    """
+    return pd.read_csv(file_path, dtype=PROCESSED_DTYPES, parse_dates=['timestamp'])
 
 def save_processed_data(df, output_file):
     """
@@ -63,26 +88,146 @@ def save_processed_data(df, output_file):
         df (pd.DataFrame): Cleaned and processed hand history data.
         output_file (str): Path to the output CSV file.
     """
-    if not os.path.exists(PROCESSED_DATA_DIR):
-        os.makedirs(PROCESSED_DATA_DIR)
+    output_dir = os.path.dirname(output_file) or PROCESSED_DATA_DIR
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
     
-    df.to_csv(output_file, index=False)
+    # Write to a temporary file first so a crash never leaves a partial partition behind
+    tmp_file = f"{output_file}.tmp"
+    df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, output_file)
     print(f"Processed data saved to {output_file}")
 
-def process_all_hand_histories():
+def file_digest(file_path):
+    """
+    Computes the SHA-256 digest of a file, reading it in fixed-size chunks.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path=MANIFEST_FILE):
+    """
+    Loads the ingestion manifest. A missing or outdated manifest is treated as empty,
+    which makes the next run reprocess every file.
+
+    Args:
+        manifest_path (str): Path to the manifest JSON file.
+
+    Returns:
+        dict: Mapping of source filename to its recorded size, mtime, hash and output file.
+    """
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r') as file:
+        manifest = json.load(file)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+def save_manifest(entries, manifest_path=MANIFEST_FILE):
+    """
+    Writes the ingestion manifest atomically so an interrupted run never leaves a truncated file.
+
+    Args:
+        entries (dict): Mapping of source filename to its manifest entry.
+        manifest_path (str): Path to the manifest JSON file.
+    """
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump({'version': MANIFEST_VERSION, 'files': entries}, file, indent=4, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def is_file_unchanged(file_path, entry):
+    """
+    Checks a source file against its manifest entry. Size and mtime are compared first;
+    the content hash is only computed when they differ, so touched-but-identical files
+    are not reprocessed.
+
+    Args:
+        file_path (str): Path to the source file.
+        entry (dict or None): The manifest entry recorded for the file.
+
+    Returns:
+        tuple: (unchanged, stat_result, digest). digest is None if it was not computed.
+    """
+    stat = os.stat(file_path)
+    if entry is None or not os.path.exists(entry['output_file']):
+        return False, stat, None
+    if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return True, stat, entry['sha256']
+    if entry['size'] != stat.st_size:
+        return False, stat, None
+    digest = file_digest(file_path)
+    return digest == entry['sha256'], stat, digest
+
+def process_all_hand_histories(input_dir=HAND_HISTORY_DIR, output_dir=PROCESSED_DATA_DIR, manifest_path=None, force=False):
     """
-    Processes all hand history files in the hand history directory and saves the cleaned data.
+    Processes new or changed hand history files in the hand history directory and saves the
+    cleaned data. Files recorded in the manifest with the same size, mtime and content hash are
+    skipped, and the processed partitions of deleted source files are removed.
+
+    Args:
+        input_dir (str): Directory containing raw hand history files.
+        output_dir (str): Directory where processed partitions are written.
+        manifest_path (str, optional): Path to the manifest file. Defaults to manifest.json in output_dir.
+        force (bool): If True, reprocesses every file. The manifest is still read so partitions of
+            deleted source files are removed.
+
+    Returns:
+        dict: Lists of filenames that were 'processed', 'skipped' and 'removed'.
     """
-    for filename in os.listdir(HAND_HISTORY_DIR):
-        file_path = os.path.join(HAND_HISTORY_DIR, filename)
-        if filename.endswith('.json') or filename.endswith('.csv'):
-            print(f"Processing {filename}...")
-            df = load_hand_history(file_path)
-            processed_df = process_hand_history(df)
-            output_file = os.path.join(PROCESSED_DATA_DIR, f"processed_{filename}.csv")
-            save_processed_data(processed_df, output_file)
-        else:
+    if manifest_path is None:
+        manifest_path = os.path.join(output_dir, "manifest.json")
+    old_entries = load_manifest(manifest_path)
+    entries = {}
+    summary = {'processed': [], 'skipped': [], 'removed': []}
+
+    for filename in sorted(os.listdir(input_dir)):
+        file_path = os.path.join(input_dir, filename)
+        if not (filename.endswith('.json') or filename.endswith('.csv')):
             print(f"Skipping unsupported file: {filename}")
+            continue
+
+        unchanged, stat, digest = is_file_unchanged(file_path, None if force else old_entries.get(filename))
+        output_file = os.path.join(output_dir, f"processed_{filename}.csv")
+        if unchanged:
+            entries[filename] = dict(old_entries[filename], mtime_ns=stat.st_mtime_ns)
+            summary['skipped'].append(filename)
+            continue
+
+        print(f"Processing {filename}...")
+        df = load_hand_history(file_path)
+        processed_df = process_hand_history(df)
+        save_processed_data(processed_df, output_file)
+        entries[filename] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest or file_digest(file_path),
+            'output_file': output_file,
+            'rows': len(processed_df)
+        }
+        summary['processed'].append(filename)
+
+    # Drop partitions whose source file no longer exists
+    for filename, entry in old_entries.items():
+        if filename not in entries:
+            if os.path.exists(entry['output_file']):
+                os.remove(entry['output_file'])
+            print(f"Removed partition for deleted file: {filename}")
+            summary['removed'].append(filename)
+
+    save_manifest(entries, manifest_path)
+    return summary
 
 if __name__ == "__main__":
     process_all_hand_histories()
@@ -0,0 +1,226 @@
+# verify_hand_evaluator.py
+
+"""
+Correctness and speed harness for hand evaluators.
+Every one of the 2,598,960 five-card hands is evaluated, the category counts are checked against
+the known distribution and the number of distinct hand strengths against the 7,462 equivalence
+classes. A sample of seven-card hands is checked against the known seven-card frequencies. Each
+evaluator is also compared with the reference (rank_key): it must order every hand exactly as
+the reference does. The work is split across a process pool and every evaluator is timed.
+
+An evaluator is a callable taking a list of card codes (rank * 4 + suit, see card_encoding.py)
+and returning a rank key: a comparable value whose first element is the HAND_RANKINGS category.
+Candidates are given as module:function, e.g.
+    python -m scripts.verify_hand_evaluator --evaluator my_package.fast_eval:rank_codes
+"""
+
+import argparse
+import importlib
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import numpy as np
+from strategy_engine.card_encoding import NUM_CARDS, card_to_string
+from strategy_engine.post_flop_strategy.hand_evaluation import HAND_RANKINGS, HAND_TYPES, evaluate_hand, rank_key
+
+TOTAL_FIVE_CARD_HANDS = 2598960
+TOTAL_SEVEN_CARD_HANDS = 133784560
+DISTINCT_FIVE_CARD_STRENGTHS = 7462
+
+KNOWN_FIVE_CARD_COUNTS = {
+    "Royal Flush": 4,
+    "Straight Flush": 36,
+    "Four of a Kind": 624,
+    "Full House": 3744,
+    "Flush": 5108,
+    "Straight": 10200,
+    "Three of a Kind": 54912,
+    "Two Pair": 123552,
+    "One Pair": 1098240,
+    "High Card": 1302540
+}
+KNOWN_SEVEN_CARD_COUNTS = {
+    "Royal Flush": 4324,
+    "Straight Flush": 37260,
+    "Four of a Kind": 224848,
+    "Full House": 3473184,
+    "Flush": 4047644,
+    "Straight": 6180020,
+    "Three of a Kind": 6461620,
+    "Two Pair": 31433400,
+    "One Pair": 58627800,
+    "High Card": 23294460
+}
+# Sampled frequencies may deviate from the known ones by at most this many standard errors
+MAX_SAMPLING_ERROR = 5.0
+
+CARD_STRINGS = [card_to_string(code) for code in range(NUM_CARDS)]
+
+def codes_rank_key(codes):
+    """
+    Reference evaluator: the histogram-based rank key of hand_evaluation.
+    """
+    return rank_key([code // 4 + 2 for code in codes], [code % 4 for code in codes])
+
+def evaluate_hand_key(codes):
+    """
+    The public evaluate_hand() entry point (string parsing and card selection included).
+    """
+    cards = [CARD_STRINGS[code] for code in codes]
+    return evaluate_hand(cards[:2], cards[2:])["rank"]
+
+BUILTIN_EVALUATORS = {
+    'rank_key': codes_rank_key,
+    'evaluate_hand': evaluate_hand_key
+}
+
+def load_evaluator(name):
+    """
+    Resolves a built-in evaluator name or a 'module:function' path.
+    """
+    if name in BUILTIN_EVALUATORS:
+        return BUILTIN_EVALUATORS[name]
+    module_name, _, function_name = name.partition(':')
+    if not function_name:
+        raise ValueError(f"Unknown evaluator {name}; use one of {sorted(BUILTIN_EVALUATORS)} or module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def _evaluate_chunk(names, hands):
+    """
+    Evaluates a chunk of hands with every evaluator.
+
+    Returns:
+        dict: name -> (category counts, {reference key: set of the evaluator's keys}, seconds).
+    """
+    reference = [codes_rank_key(hand) for hand in hands]
+    results = {}
+    for name in names:
+        evaluator = load_evaluator(name)
+        start = time.perf_counter()
+        keys = [evaluator(hand) for hand in hands]
+        elapsed = time.perf_counter() - start
+        mapping = {}
+        for reference_key, key in zip(reference, keys):
+            mapping.setdefault(reference_key, set()).add(key)
+        results[name] = (Counter(key[0] for key in keys), mapping, elapsed)
+    return results
+
+def _five_card_chunk(names, first_card):
+    # All five-card hands whose lowest card is first_card
+    hands = [(first_card,) + rest for rest in combinations(range(first_card + 1, NUM_CARDS), 4)]
+    return _evaluate_chunk(names, hands)
+
+def _seven_card_chunk(names, num_hands, seed):
+    rng = np.random.default_rng(seed)
+    hands = np.argsort(rng.random((num_hands, NUM_CARDS)), axis=1)[:, :7]
+    return _evaluate_chunk(names, [tuple(hand) for hand in hands.tolist()])
+
+def _merge(totals, chunk):
+    for name, (counts, mapping, elapsed) in chunk.items():
+        total = totals.setdefault(name, [Counter(), {}, 0.0, 0])
+        total[0].update(counts)
+        for reference_key, keys in mapping.items():
+            total[1].setdefault(reference_key, set()).update(keys)
+        total[2] += elapsed
+        total[3] += sum(counts.values())
+
+def ordering_errors(mapping):
+    """
+    Checks that an evaluator orders hands like the reference.
+
+    Args:
+        mapping (dict): Reference key -> set of the evaluator's keys for the same hands.
+
+    Returns:
+        list: Descriptions of the violations (empty if the orders agree).
+    """
+    errors = [f"hands of strength {key} got {len(keys)} different values" for key, keys in mapping.items() if len(keys) > 1]
+    ordered = [next(iter(mapping[key])) for key in sorted(mapping)]
+    errors += [
+        f"{sorted(mapping)[index]} is not ranked above {sorted(mapping)[index - 1]}"
+        for index in range(1, len(ordered)) if not ordered[index] > ordered[index - 1]
+    ]
+    return errors
+
+def _report(title, totals, known, total_known, exhaustive):
+    print(f"\n{title}")
+    failures = 0
+    for name, (counts, mapping, elapsed, hands) in totals.items():
+        print(f"  {name}: {hands:,} hands in {elapsed:.1f}s of CPU time ({elapsed / hands * 1e6:.2f} us/hand)")
+        for hand_type, expected in known.items():
+            observed = counts.get(HAND_RANKINGS[hand_type], 0)
+            if exhaustive:
+                ok = observed == expected
+                detail = f"{observed:>9,} (expected {expected:,})"
+            else:
+                probability = expected / total_known
+                error = np.sqrt(probability * (1 - probability) / hands)
+                deviation = abs(observed / hands - probability) / error
+                ok = deviation <= MAX_SAMPLING_ERROR
+                detail = f"{observed / hands:.6f} (expected {probability:.6f}, {deviation:.1f} SE)"
+            failures += not ok
+            print(f"    {'ok  ' if ok else 'FAIL'} {hand_type:<16} {detail}")
+        unknown = set(counts) - set(HAND_TYPES)
+        if unknown:
+            failures += 1
+            print(f"    FAIL unknown categories {sorted(unknown)}")
+        if exhaustive:
+            ok = len(mapping) == DISTINCT_FIVE_CARD_STRENGTHS
+            failures += not ok
+            print(f"    {'ok  ' if ok else 'FAIL'} {len(mapping):,} distinct strengths (expected {DISTINCT_FIVE_CARD_STRENGTHS:,})")
+        errors = ordering_errors(mapping)
+        failures += bool(errors)
+        print(f"    {'ok  ' if not errors else 'FAIL'} ordering matches the reference"
+              + (f" ({len(errors)} violations, first: {errors[0]})" if errors else ""))
+    return failures
+
+def verify(names, samples=200000, workers=None, seed=0, exhaustive=True):
+    """
+    Runs the checks for the given evaluators and prints a report.
+
+    Args:
+        names (list): Evaluator names (built-in or module:function).
+        samples (int): Number of sampled seven-card hands (0 to skip).
+        workers (int, optional): Worker processes (defaults to the number of CPUs).
+        seed (int): Seed of the seven-card sample.
+        exhaustive (bool): Whether to enumerate every five-card hand.
+
+    Returns:
+        int: The number of failed checks.
+    """
+    for name in names:
+        load_evaluator(name)  # Fail fast on bad names
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if exhaustive:
+            totals = {}
+            for chunk in pool.map(_five_card_chunk, [names] * (NUM_CARDS - 4), range(NUM_CARDS - 4)):
+                _merge(totals, chunk)
+            failures += _report("Five-card hands (exhaustive)", totals, KNOWN_FIVE_CARD_COUNTS, TOTAL_FIVE_CARD_HANDS, True)
+        if samples:
+            num_chunks = max(1, min(64, samples // 5000))
+            sizes = [samples // num_chunks + (index < samples % num_chunks) for index in range(num_chunks)]
+            seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+            totals = {}
+            for chunk in pool.map(_seven_card_chunk, [names] * num_chunks, sizes, seeds):
+                _merge(totals, chunk)
+            failures += _report(f"Seven-card hands ({samples:,} sampled)", totals, KNOWN_SEVEN_CARD_COUNTS,
+                                TOTAL_SEVEN_CARD_HANDS, False)
+    print(f"\n{'All checks passed' if not failures else f'{failures} checks failed'} in {time.perf_counter() - start:.1f}s")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify and benchmark hand evaluators against exhaustive enumeration.")
+    parser.add_argument('--evaluator', action='append', dest='evaluators',
+                        help="Evaluator to check: a built-in name or module:function (repeatable)")
+    parser.add_argument('--samples', type=int, default=200000, help="Number of sampled seven-card hands")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the seven-card sample")
+    parser.add_argument('--skip-exhaustive', action='store_true', help="Only run the seven-card sample")
+    args = parser.parse_args()
+
+    failed = verify(args.evaluators or list(BUILTIN_EVALUATORS), args.samples, args.workers, args.seed,
+                    not args.skip_exhaustive)
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,155 @@
+# bluff_frequency_solver.py
+
+"""
+Vectorized bluff-frequency calculations.
+The game-theoretic functions derive bluffing frequencies from the bet-size-to-pot ratio and the
+equities of the betting range, and the heuristic functions apply the BluffProbabilityCalculator
+modifiers to whole arrays of decision spots at once. Every function accepts scalars or arrays
+(broadcast together) and is deterministic.
+"""
+
+import numpy as np
+
+# Heuristic modifiers used by BluffProbabilityCalculator
+OPPONENT_MODIFIERS = {
+    'aggressive': 0.8,  # Bluff less often against aggressive players
+    'passive': 1.2,     # Bluff more often against passive players
+    'tight': 1.1,       # Tight players fold often, so bluff more
+    'loose': 0.9        # Loose players call frequently, reduce bluffing
+}
+GAME_STAGE_MODIFIERS = {
+    'pre-flop': 0.9,    # Less bluffing early in the game
+    'flop': 1.1,
+    'turn': 1.2,
+    'river': 1.4        # High bluff frequency on the river
+}
+
+def _lookup(labels, table, default=1.0):
+    # Maps string labels to table values with one lookup per distinct label
+    labels = np.asarray(labels)
+    distinct, inverse = np.unique(labels.astype(str), return_inverse=True)
+    values = np.array([table.get(label, default) for label in distinct])
+    return values[inverse].reshape(labels.shape)
+
+def _result(values):
+    return float(values) if np.ndim(values) == 0 else values
+
+def alpha(bet_size, pot_size):
+    """
+    Share of the time a bluff must work to break even: B / (P + B).
+    """
+    bet_size, pot_size = np.asarray(bet_size, dtype=np.float64), np.asarray(pot_size, dtype=np.float64)
+    return _result(bet_size / (pot_size + bet_size))
+
+def minimum_defense_frequency(bet_size, pot_size):
+    """
+    Share of the range the defender must continue with so bluffs do not profit: P / (P + B).
+    """
+    bet_size, pot_size = np.asarray(bet_size, dtype=np.float64), np.asarray(pot_size, dtype=np.float64)
+    return _result(pot_size / (pot_size + bet_size))
+
+def bluff_fractions(bet_size, pot_size, value_equity=1.0, bluff_equity=0.0):
+    """
+    Share of bluffs in a betting range that leaves the caller indifferent between calling and folding.
+    The caller risks B to win P + B and is indifferent when the bettor's equity against a call is
+    (P + B) / (P + 2B), so with value hands at equity e_v and bluffs at e_b the bluff share is
+    f = (e_v - (P + B) / (P + 2B)) / (e_v - e_b), clipped to [0, 1]. Against a polarized range
+    (e_v = 1, e_b = 0) this is the classic B / (P + 2B).
+
+    Args:
+        bet_size (float or np.ndarray): Size of the bet.
+        pot_size (float or np.ndarray): Size of the pot before the bet.
+        value_equity (float or np.ndarray): Equity of the value hands when called.
+        bluff_equity (float or np.ndarray): Equity of the bluffs when called.
+
+    Returns:
+        float or np.ndarray: The bluff share of the betting range.
+    """
+    bet_size, pot_size = np.asarray(bet_size, dtype=np.float64), np.asarray(pot_size, dtype=np.float64)
+    value_equity, bluff_equity = np.asarray(value_equity, dtype=np.float64), np.asarray(bluff_equity, dtype=np.float64)
+    required = (pot_size + bet_size) / (pot_size + 2 * bet_size)
+    spread = value_equity - bluff_equity
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fractions = np.where(spread > 0, (value_equity - required) / spread, 0.0)
+    return _result(np.clip(fractions, 0.0, 1.0))
+
+def bluff_frequencies(bet_size, pot_size, value_equity=1.0, bluff_equity=0.0):
+    """
+    Computes the game-theoretic quantities of many betting spots at once.
+
+    Args:
+        bet_size (float or np.ndarray): Size of the bet.
+        pot_size (float or np.ndarray): Size of the pot before the bet.
+        value_equity (float or np.ndarray): Equity of the value hands when called.
+        bluff_equity (float or np.ndarray): Equity of the bluffs when called.
+
+    Returns:
+        dict: 'alpha', 'mdf', 'bluff_fraction' and 'bluff_to_value' (bluffs per value hand).
+    """
+    fractions = np.asarray(bluff_fractions(bet_size, pot_size, value_equity, bluff_equity))
+    with np.errstate(divide='ignore'):
+        ratio = np.where(fractions < 1.0, fractions / np.maximum(1.0 - fractions, 1e-12), np.inf)
+    return {
+        'alpha': alpha(bet_size, pot_size),
+        'mdf': minimum_defense_frequency(bet_size, pot_size),
+        'bluff_fraction': _result(fractions),
+        'bluff_to_value': _result(ratio)
+    }
+
+def base_bluff_chances(aggression_level):
+    """
+    Base bluff chance from the aggression level, between 10% and 80%.
+    """
+    return _result(np.clip(0.4 + np.asarray(aggression_level, dtype=np.float64), 0.1, 0.8))
+
+def opponent_modifiers(opponent_profile):
+    """
+    Bluff multiplier for each opponent type (1.0 for unknown types).
+    """
+    return _result(_lookup(opponent_profile, OPPONENT_MODIFIERS))
+
+def hand_strength_modifiers(hand_strength):
+    """
+    Bluff modifier for each hand strength: 0.5 above 0.8, 1.5 below 0.3, otherwise 1.0.
+    """
+    hand_strength = np.asarray(hand_strength, dtype=np.float64)
+    return _result(np.where(hand_strength > 0.8, 0.5, np.where(hand_strength < 0.3, 1.5, 1.0)))
+
+def pot_odds_modifiers(pot_odds):
+    """
+    Bluff modifier for each pot odds value: 1.3 below 0.2, 0.8 above 0.5, otherwise 1.0.
+    """
+    pot_odds = np.asarray(pot_odds, dtype=np.float64)
+    return _result(np.where(pot_odds < 0.2, 1.3, np.where(pot_odds > 0.5, 0.8, 1.0)))
+
+def game_stage_modifiers(game_stage):
+    """
+    Bluff multiplier for each game stage (1.0 for unknown stages).
+    """
+    return _result(_lookup(game_stage, GAME_STAGE_MODIFIERS))
+
+def bluff_probabilities(opponent_profile, hand_strength, pot_odds, aggression_level, game_stage):
+    """
+    Vectorized BluffProbabilityCalculator: applies the same modifiers to arrays of decision spots.
+
+    Args:
+        opponent_profile (str or array-like): Opponent types (e.g., 'aggressive', 'passive').
+        hand_strength (float or array-like): Relative strength of the AI's hand.
+        pot_odds (float or array-like): Current pot odds.
+        aggression_level (float or array-like): The AI's aggression level.
+        game_stage (str or array-like): Stage of the game (e.g., 'pre-flop', 'flop', 'river').
+
+    Returns:
+        float or np.ndarray: Bluff probabilities between 0.05 and 0.95.
+    """
+    modifiers = (
+        np.asarray(opponent_modifiers(opponent_profile)) + np.asarray(hand_strength_modifiers(hand_strength))
+        + np.asarray(pot_odds_modifiers(pot_odds)) + np.asarray(game_stage_modifiers(game_stage))
+    )
+    return _result(np.clip(np.asarray(base_bluff_chances(aggression_level)) * modifiers, 0.05, 0.95))
+
+if __name__ == "__main__":
+    # Example usage: pot-sized, half-pot and overbet river spots
+    bets = np.array([100.0, 50.0, 200.0])
+    print(bluff_frequencies(bets, 100.0))
+    print(bluff_probabilities(['aggressive', 'tight', 'loose'], [0.2, 0.5, 0.9], 0.3, 0.7, 'river'))
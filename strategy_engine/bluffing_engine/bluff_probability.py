@@ -1,8 +1,16 @@
 # bluff_probability.py
 
-import random
+from strategy_engine.bluffing_engine.bluff_frequency_solver import (
+    base_bluff_chances, bluff_probabilities, game_stage_modifiers, hand_strength_modifiers,
+    opponent_modifiers, pot_odds_modifiers
+)
 
 class BluffProbabilityCalculator:
+    """
+    Single-spot bluff probability. The modifiers are implemented in bluff_frequency_solver.py, whose
+    vectorized functions should be used directly when scoring many spots.
+    """
+
     def __init__(self, opponent_profile, hand_strength, pot_odds, aggression_level, game_stage):
         """
         Initializes the bluff probability calculator with relevant factors.
@@ -28,19 +36,10 @@ class BluffProbabilityCalculator:
         Returns:
             float: A probability value between 0 and 1 indicating the likelihood of bluffing.
         """
-        base_bluff_chance = self._base_bluff_chance()
-        opponent_modifier = self._opponent_modifier()
-        hand_strength_modifier = self._hand_strength_modifier()
-        pot_odds_modifier = self._pot_odds_modifier()
-        game_stage_modifier = self._game_stage_modifier()
-        
-        # Final bluff probability with all modifiers applied
-        bluff_probability = base_bluff_chance * (opponent_modifier + hand_strength_modifier + pot_odds_modifier + game_stage_modifier)
-        
-        # Clip the bluff probability between 0 and 1
-        bluff_probability = min(max(bluff_probability, 0.05), 0.95)  # Always leave a 5-95% chance
-        
-        return bluff_probability
+        # The vectorized implementation clips the result to 5-95%, always leaving some chance either way
+        return bluff_probabilities(
+            self.opponent_profile, self.hand_strength, self.pot_odds, self.aggression_level, self.game_stage
+        )
     
     def _base_bluff_chance(self):
         """
@@ -49,7 +48,7 @@ class BluffProbabilityCalculator:
         Returns:
             float: Base bluff chance.
         """
-        return max(0.1, min(0.4 + self.aggression_level, 0.8))  # Base range from 10% to 80% based on aggression
+        return base_bluff_chances(self.aggression_level)  # Base range from 10% to 80% based on aggression
     
     def _opponent_modifier(self):
         """
@@ -58,16 +57,7 @@ class BluffProbabilityCalculator:
         Returns:
             float: A multiplier based on opponent type.
         """
-        if self.opponent_profile == 'aggressive':
-            return 0.8  # Bluff less often against aggressive players
-        elif self.opponent_profile == 'passive':
-            return 1.2  # Bluff more often against passive players
-        elif self.opponent_profile == 'tight':
-            return 1.1  # Tight players fold often, so bluff more
-        elif self.opponent_profile == 'loose':
-            return 0.9  # Loose players call frequently, reduce bluffing
-        else:
-            return 1.0  # Neutral multiplier for unknown opponents
+        return opponent_modifiers(self.opponent_profile)
     
     def _hand_strength_modifier(self):
         """
@@ -76,12 +66,7 @@ class BluffProbabilityCalculator:
         Returns:
             float: A modifier value based on hand strength.
         """
-        if self.hand_strength > 0.8:  # Strong hand, less need to bluff
-            return 0.5
-        elif self.hand_strength < 0.3:  # Weak hand, more likely to bluff
-            return 1.5
-        else:
-            return 1.0  # Neutral modifier for medium strength hands
+        return hand_strength_modifiers(self.hand_strength)
     
     def _pot_odds_modifier(self):
         """
@@ -90,12 +75,7 @@ class BluffProbabilityCalculator:
         Returns:
             float: A modifier based on pot odds.
         """
-        if self.pot_odds < 0.2:  # Small pot, more incentive to bluff
-            return 1.3
-        elif self.pot_odds > 0.5:  # Large pot, less bluffing
-            return 0.8
-        else:
-            return 1.0  # Neutral modifier for average pot odds
+        return pot_odds_modifiers(self.pot_odds)
     
     def _game_stage_modifier(self):
         """
@@ -104,16 +84,7 @@ class BluffProbabilityCalculator:
         Returns:
             float: A multiplier based on the game stage.
         """
-        if self.game_stage == 'pre-flop':
-            return 0.9  # Less bluffing early in the game
-        elif self.game_stage == 'flop':
-            return 1.1  # Moderate bluffing during the flop
-        elif self.game_stage == 'turn':
-            return 1.2  # More bluffing on the turn
-        elif self.game_stage == 'river':
-            return 1.4  # High bluff frequency on the river
-        else:
-            return 1.0  # Neutral modifier for undefined stages
+        return game_stage_modifiers(self.game_stage)
 
 # Example Usage
 if __name__ == "__main__":
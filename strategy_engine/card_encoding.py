@@ -0,0 +1,210 @@
+# card_encoding.py
+
+"""
+Shared integer card encoding for PokerAI.
+Cards are encoded as ints 0-51 (rank_index * 4 + suit_index) so that hand histories, the
+strategy engine and the RL environment can exchange cards as NumPy arrays instead of strings.
+Starting hands are reduced to the 169 canonical classes ('AA', 'AKs', 'AKo', ...) laid out as the
+usual 13x13 grid: pairs on the diagonal, suited hands above it and offsuit hands below it.
+The 1326 concrete two-card combos are enumerated once so ranges can be stored as dense arrays.
+"""
+
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+RANKS = '23456789TJQKA'
+SUITS = 'hdcs'  # Hearts, Diamonds, Clubs, Spades
+NUM_CARDS = 52
+NUM_HAND_CLASSES = 169
+INVALID_CARD = -1
+
+# Accepted spellings for ranks and suits in raw hand histories
+RANK_ALIASES = {
+    'a': 12, 'ace': 12, 'k': 11, 'king': 11, 'q': 10, 'queen': 10, 'j': 9, 'jack': 9,
+    't': 8, '10': 8, 'ten': 8, '9': 7, 'nine': 7, '8': 6, 'eight': 6, '7': 5, 'seven': 5,
+    '6': 4, 'six': 4, '5': 3, 'five': 3, '4': 2, 'four': 2, '3': 1, 'three': 1, '2': 0, 'two': 0
+}
+SUIT_ALIASES = {
+    'h': 0, 'hearts': 0, 'heart': 0, 'd': 1, 'diamonds': 1, 'diamond': 1,
+    'c': 2, 'clubs': 2, 'club': 2, 's': 3, 'spades': 3, 'spade': 3
+}
+
+def parse_card(card):
+    """
+    Converts a single card string into its integer code.
+
+    Args:
+        card (str): The card, e.g. 'Ah', 'TD', '10h', 'Ace of Spades' or 'A_of_hearts'.
+
+    Returns:
+        int: The card code (0-51), or INVALID_CARD if the string cannot be parsed or has no suit.
+    """
+    if not isinstance(card, str):
+        return INVALID_CARD
+    text = card.strip().lower().replace('_', ' ')
+    if ' of ' in text:
+        rank, suit = text.split(' of ', 1)
+    else:
+        rank, suit = text[:-1], text[-1:]
+    rank_index = RANK_ALIASES.get(rank.strip())
+    suit_index = SUIT_ALIASES.get(suit.strip())
+    if rank_index is None or suit_index is None:
+        return INVALID_CARD
+    return rank_index * 4 + suit_index
+
+def card_to_string(code):
+    """
+    Converts a card code back to its short string form (e.g. 51 -> 'AS').
+
+    Args:
+        code (int): The card code (0-51).
+
+    Returns:
+        str: The rank character followed by the upper-case suit character.
+    """
+    return RANKS[code // 4] + SUITS[code % 4].upper()
+
+def parse_card_series(cards):
+    """
+    Vectorized card parsing. The column is converted to a categorical so that each distinct
+    spelling is parsed once, and the per-row codes are gathered with a single NumPy take.
+
+    Args:
+        cards (pd.Series or array-like): Raw card strings.
+
+    Returns:
+        np.ndarray: int8 card codes, INVALID_CARD where a value is missing or unparseable.
+    """
+    categorical = pd.Series(cards).astype('category')
+    lookup = np.array([parse_card(card) for card in categorical.cat.categories] + [INVALID_CARD], dtype=np.int8)
+    # Missing values have category code -1, which picks the trailing INVALID_CARD entry
+    return lookup[categorical.cat.codes.to_numpy()]
+
+def card_ranks(codes):
+    """Returns the rank index (0 = deuce, 12 = ace) of each card code."""
+    return np.asarray(codes) // 4
+
+def card_suits(codes):
+    """Returns the suit index (see SUITS) of each card code."""
+    return np.asarray(codes) % 4
+
+def hand_class_ids(card_1, card_2):
+    """
+    Maps pairs of hole cards onto the 169 canonical starting-hand classes.
+
+    Args:
+        card_1 (array-like): Codes of the first hole card.
+        card_2 (array-like): Codes of the second hole card.
+
+    Returns:
+        np.ndarray: int16 class ids (row * 13 + col of the hand grid, 'AA' = 0).
+    """
+    card_1 = np.asarray(card_1, dtype=np.int16)
+    card_2 = np.asarray(card_2, dtype=np.int16)
+    high = 12 - np.maximum(card_1 // 4, card_2 // 4)
+    low = 12 - np.minimum(card_1 // 4, card_2 // 4)
+    suited = (card_1 % 4) == (card_2 % 4)
+    # Suited hands sit above the diagonal, offsuit hands (and pairs) on or below it
+    row = np.where(suited, high, low)
+    col = np.where(suited, low, high)
+    return (row * 13 + col).astype(np.int16)
+
+def hand_class_id(hand):
+    """
+    Returns the class id for a starting hand given either as two card strings or as a class name.
+
+    Args:
+        hand (str or list): A class name ('AKs', 'QJo', '77'; a bare 'AK' is treated as offsuit)
+            or a pair of cards (['Ah', 'Kh']).
+
+    Returns:
+        int: The hand class id, or -1 if the hand cannot be parsed.
+    """
+    if isinstance(hand, str):
+        return HAND_CLASS_INDEX.get(hand if len(hand) == 3 or hand[0] == hand[1:2] else hand + 'o', -1)
+    codes = [parse_card(card) if isinstance(card, str) else card for card in hand]
+    if len(codes) != 2 or INVALID_CARD in codes:
+        return -1
+    return int(hand_class_ids(codes[0], codes[1]))
+
+def _build_hand_class_names():
+    names = []
+    for row in range(13):
+        for col in range(13):
+            high, low = RANKS[12 - min(row, col)], RANKS[12 - max(row, col)]
+            if row == col:
+                names.append(high + low)
+            elif row < col:
+                names.append(high + low + 's')
+            else:
+                names.append(high + low + 'o')
+    return names
+
+HAND_CLASS_NAMES = _build_hand_class_names()
+HAND_CLASS_INDEX = {name: index for index, name in enumerate(HAND_CLASS_NAMES)}
+
+# All 1326 two-card combos (lower card code first) and their lookup tables
+NUM_COMBOS = 1326
+COMBOS = np.array(list(combinations(range(NUM_CARDS), 2)), dtype=np.int8)
+COMBO_HAND_CLASS = hand_class_ids(COMBOS[:, 0], COMBOS[:, 1])
+COMBO_INDEX = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.int16)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+
+def combo_index(card_1, card_2):
+    """
+    Returns the index (0-1325) of the combo made of two card codes, in either order.
+    """
+    return int(COMBO_INDEX[card_1, card_2])
+
+def blocked_combos(cards):
+    """
+    Returns a boolean mask of the combos that contain any of the given (dead) cards.
+
+    Args:
+        cards (iterable): Card codes, e.g. the board and our own hole cards.
+
+    Returns:
+        np.ndarray: Boolean array of length NUM_COMBOS.
+    """
+    dead = np.zeros(NUM_CARDS, dtype=bool)
+    dead[list(cards)] = True
+    return dead[COMBOS[:, 0]] | dead[COMBOS[:, 1]]
+
+def _chen_scores():
+    # Chen formula score of each hand class (pairs doubled, suited bonus, gap penalties)
+    points = np.array([1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5, 6, 7, 8, 10])
+    scores = np.zeros(NUM_HAND_CLASSES)
+    for index, name in enumerate(HAND_CLASS_NAMES):
+        high, low = RANKS.index(name[0]), RANKS.index(name[1])
+        if high == low:
+            scores[index] = max(points[high] * 2, 5)
+            continue
+        gap = high - low - 1
+        score = points[high] + (2 if name.endswith('s') else 0) - (0, 1, 2, 4, 5)[min(gap, 4)]
+        if gap <= 1 and high < RANKS.index('Q'):
+            score += 1
+        scores[index] = score
+    return scores
+
+HAND_CLASS_COMBOS = np.bincount(COMBO_HAND_CLASS, minlength=NUM_HAND_CLASSES)
+HAND_CLASS_CHEN_SCORES = _chen_scores()
+
+def _class_percentiles():
+    # Share of all combos that are at least as strong as each class (AA ~ 0.005, 72o ~ 1.0)
+    order = np.argsort(-HAND_CLASS_CHEN_SCORES, kind='stable')
+    percentiles = np.empty(NUM_HAND_CLASSES)
+    percentiles[order] = np.cumsum(HAND_CLASS_COMBOS[order]) / NUM_COMBOS
+    return percentiles
+
+HAND_CLASS_PERCENTILE = _class_percentiles()
+# Preflop strength in [0, 1] of each class and of each combo (1 = strongest)
+HAND_CLASS_STRENGTH = 1.0 - HAND_CLASS_PERCENTILE + HAND_CLASS_COMBOS / NUM_COMBOS
+COMBO_PREFLOP_STRENGTH = HAND_CLASS_STRENGTH[COMBO_HAND_CLASS]
+
+if __name__ == "__main__":
+    # Example usage: parse a few cards and classify the hand
+    codes = parse_card_series(['Ah', 'Kh', '10 of Spades', 'bogus'])
+    print(f"Card codes: {codes.tolist()}")
+    print(f"Hand class: {HAND_CLASS_NAMES[hand_class_ids(codes[0], codes[1])]}")
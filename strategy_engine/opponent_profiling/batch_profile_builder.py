@@ -0,0 +1,223 @@
+# batch_profile_builder.py
+
+"""
+Rebuilds opponent profiles for a whole hand-history archive in one vectorized pass.
+Instead of replaying every action through OpponentProfiler.update_opponent, the processed
+hand histories are reduced with group-bys into per-player counters and features (VPIP, PFR,
+aggression factor, fold to bet, bet-size statistics, decayed and windowed counts), and the
+resulting profiles are bulk-written into the profile store.
+"""
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from scripts.process_hand_histories import load_processed_data
+from strategy_engine.opponent_profiling.bet_size_statistics import BetSizeStats, DEFAULT_BUCKET_EDGES
+from strategy_engine.opponent_profiling.decayed_statistics import DecayedCounters, WindowedCounters
+from strategy_engine.opponent_profiling.opponent_profiling import (
+    ACTION_CATEGORIES, OpponentProfile, ProfileStore
+)
+
+AGGRESSIVE_ACTIONS = ('bet', 'raise')
+VOLUNTARY_ACTIONS = ('call', 'bet', 'raise')
+
+def action_indicators(df):
+    """
+    Adds one indicator column per tracked behavior to a processed hand history frame.
+
+    Args:
+        df (pd.DataFrame): Processed hand history data.
+
+    Returns:
+        pd.DataFrame: The actions sorted by hand and time, with indicator and timestamp columns added.
+    """
+    df = df.sort_values(['hand_id', 'timestamp'], kind='stable')
+    action = df['action'].str.lower().to_numpy()
+    aggressive = np.isin(action, AGGRESSIVE_ACTIONS)
+
+    # A player faces a bet when any earlier action in the hand was a bet or raise
+    aggressive_so_far = pd.Series(aggressive.astype(np.int64), index=df.index).groupby(df['hand_id'].to_numpy(), sort=False).cumsum()
+    faced_bet = (aggressive_so_far.to_numpy() - aggressive) > 0
+    first_action = ~df.duplicated(['hand_id', 'player_id']).to_numpy()
+
+    indicators = {
+        'seconds': (df['timestamp'] - pd.Timestamp(0)).dt.total_seconds().to_numpy(),
+        'category': np.select([action == name for name in ACTION_CATEGORIES], range(len(ACTION_CATEGORIES)), -1),
+        'voluntary': np.isin(action, VOLUNTARY_ACTIONS),
+        'first_raise': first_action & (action == 'raise'),
+        'aggressive': aggressive,
+        'call': action == 'call',
+        'faced_bet': faced_bet,
+        'fold_to_bet': faced_bet & (action == 'fold'),
+        'sized_bet': (action == 'bet') & (df['amount'].to_numpy() > 0)
+    }
+    for position, name in enumerate(ACTION_CATEGORIES):
+        indicators[name] = indicators['category'] == position
+    return df.assign(**indicators)
+
+def compute_player_features(df, half_life=OpponentProfile.HALF_LIFE_SECONDS,
+                            window_buckets=OpponentProfile.WINDOW_BUCKETS,
+                            bucket_seconds=OpponentProfile.WINDOW_BUCKET_SECONDS):
+    """
+    Computes per-player profile features from processed hand histories.
+
+    Args:
+        df (pd.DataFrame): Processed hand history data.
+        half_life (float): Half-life in seconds for the decayed counters.
+        window_buckets (int): Number of buckets in the sliding window.
+        bucket_seconds (float): Width of each sliding-window bucket in seconds.
+
+    Returns:
+        tuple: (features DataFrame indexed by player code, player ids array, dict of per-player arrays
+            'decayed', 'window', 'current_bucket', 'last_update', 'histogram' and the 'bets' frame).
+    """
+    df = action_indicators(df)
+    player_codes, player_ids = pd.factorize(df['player_id'])
+    num_players = len(player_ids)
+    df = df.assign(player=player_codes)
+
+    # Hand-level flags first (did the player voluntarily enter / raise first in this hand?)
+    per_hand = df.groupby(['player', 'hand_id'], sort=False)[['voluntary', 'first_raise']].any()
+    hand_flags = per_hand.groupby(level='player').agg(['sum', 'size'])
+
+    counts = df.groupby('player')[
+        list(ACTION_CATEGORIES) + ['aggressive', 'call', 'faced_bet', 'fold_to_bet']
+    ].sum()
+    counts['actions'] = df.groupby('player').size()
+    bets = df.loc[df['sized_bet'].to_numpy(), ['player', 'amount']]
+    bet_groups = bets.groupby('player')['amount']
+
+    features = pd.DataFrame(index=pd.RangeIndex(num_players, name='player'))
+    features['hands_played'] = counts['actions']
+    features['aggressiveness'] = counts['raise']
+    features['fold_frequency'] = counts['fold']
+    features['passiveness'] = counts['check']
+    features['bluffing_frequency'] = counts['bluff']
+    features['vpip'] = hand_flags[('voluntary', 'sum')] / hand_flags[('voluntary', 'size')]
+    features['pfr'] = hand_flags[('first_raise', 'sum')] / hand_flags[('first_raise', 'size')]
+    features['aggression_factor'] = counts['aggressive'] / counts['call'].clip(lower=1)
+    features['fold_to_bet'] = (counts['fold_to_bet'] / counts['faced_bet'].where(counts['faced_bet'] > 0)).fillna(0.0)
+    features['bet_count'] = bet_groups.size()
+    features['bet_mean'] = bet_groups.mean()
+    features['bet_m2'] = bet_groups.var(ddof=0) * features['bet_count']
+    features = features.fillna(0.0)
+
+    player = df['player'].to_numpy()
+    seconds = df['seconds'].to_numpy()
+    category = df['category'].to_numpy()
+    tracked = category >= 0
+    width = len(ACTION_CATEGORIES) + 1
+
+    # Decayed counts as of each player's last action: weight = 0.5 ** (age / half_life)
+    last_update = np.full(num_players, -np.inf)
+    np.maximum.at(last_update, player, seconds)
+    weights = 0.5 ** ((last_update[player] - seconds) / half_life)
+    decayed = np.zeros((num_players, width))
+    np.add.at(decayed[:, 0], player, weights)
+    np.add.at(decayed, (player[tracked], category[tracked] + 1), weights[tracked])
+
+    # Sliding-window buckets relative to each player's newest bucket
+    bucket = (seconds // bucket_seconds).astype(np.int64)
+    current_bucket = np.full(num_players, np.iinfo(np.int64).min)
+    np.maximum.at(current_bucket, player, bucket)
+    in_window = bucket > current_bucket[player] - window_buckets
+    slot = (bucket % window_buckets) * width
+    window = np.zeros((num_players, window_buckets * width), dtype=np.int64)
+    np.add.at(window, (player[in_window], slot[in_window]), 1)
+    tracked_in_window = in_window & tracked
+    np.add.at(window, (player[tracked_in_window], slot[tracked_in_window] + category[tracked_in_window] + 1), 1)
+
+    histogram = np.zeros((num_players, len(DEFAULT_BUCKET_EDGES) + 1), dtype=np.int64)
+    bet_amounts = bets['amount'].to_numpy(dtype=np.float64)
+    np.add.at(histogram, (bets['player'].to_numpy(), np.searchsorted(DEFAULT_BUCKET_EDGES, bet_amounts, side='right')), 1)
+
+    arrays = {
+        'decayed': decayed,
+        'window': window,
+        'current_bucket': current_bucket,
+        'last_update': last_update,
+        'histogram': histogram,
+        'bets': bets
+    }
+    return features, np.asarray(player_ids), arrays
+
+def build_profiles(df, clusterer=None):
+    """
+    Builds OpponentProfile objects for every player in a processed hand history frame.
+
+    Args:
+        df (pd.DataFrame): Processed hand history data.
+        clusterer (OpponentClusterer, optional): The clusterer used to classify the profiles.
+
+    Returns:
+        list: The rebuilt OpponentProfile objects.
+    """
+    features, player_ids, arrays = compute_player_features(df)
+    bet_values = {
+        player: group.to_numpy(dtype=np.float64)
+        for player, group in arrays['bets'].groupby('player')['amount']
+    }
+    num_categories = len(ACTION_CATEGORIES)
+    records = features.to_dict('records')
+    profiles = []
+
+    for player, (player_id, record) in enumerate(zip(player_ids, records)):
+        profile = OpponentProfile(player_id)
+        profile.hands_played = int(record['hands_played'])
+        profile.aggressiveness = float(record['aggressiveness'])
+        profile.fold_frequency = float(record['fold_frequency'])
+        profile.passiveness = float(record['passiveness'])
+        profile.bluffing_frequency = float(record['bluffing_frequency'])
+        profile.vpip = float(record['vpip'])
+        profile.pfr = float(record['pfr'])
+        profile.aggression_factor = float(record['aggression_factor'])
+        profile.fold_to_bet = float(record['fold_to_bet'])
+        if record['bet_count']:
+            profile.bet_size_stats = BetSizeStats.from_aggregates(
+                record['bet_count'], record['bet_mean'], record['bet_m2'],
+                arrays['histogram'][player], bet_values[player]
+            )
+        profile.recent_actions = DecayedCounters(
+            num_categories, arrays['decayed'][player].tolist(), float(arrays['last_update'][player])
+        )
+        profile.window_actions = WindowedCounters(
+            num_categories, profile.WINDOW_BUCKETS, arrays['window'][player].tolist(), int(arrays['current_bucket'][player])
+        )
+        profile.refresh_ratios()
+        profile.classify_opponent(clusterer)
+        profiles.append(profile)
+
+    return profiles
+
+def rebuild_profile_store(processed_files, db_path):
+    """
+    Rebuilds the profile database from processed hand history partitions.
+
+    Args:
+        processed_files (list): Paths of processed hand history partitions.
+        db_path (str): SQLite database to write the profiles to.
+
+    Returns:
+        ProfileStore: The store holding the rebuilt profiles.
+    """
+    df = pd.concat([load_processed_data(path) for path in processed_files], ignore_index=True)
+    store = ProfileStore()
+    store.put_many(build_profiles(df, store.clusterer))
+    store.refit_clusters()
+    store.flush(db_path)
+    store.db_path = db_path
+    return store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild opponent profiles from processed hand histories.")
+    parser.add_argument('--input_dir', type=str, default="./data/processed/", help="Directory of processed partitions")
+    parser.add_argument('--db_path', type=str, default="./data/opponent_profiles/opponent_profiles.db", help="Profile database")
+    args = parser.parse_args()
+
+    files = sorted(
+        os.path.join(args.input_dir, name) for name in os.listdir(args.input_dir)
+        if name.startswith('processed_') and name.endswith('.csv')
+    )
+    store = rebuild_profile_store(files, args.db_path)
+    print(f"Rebuilt {len(store)} opponent profiles into {args.db_path}")
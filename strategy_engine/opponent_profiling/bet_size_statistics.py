@@ -0,0 +1,281 @@
+# bet_size_statistics.py
+
+"""
+Constant-memory streaming statistics for opponent bet sizes.
+Every tracker has an O(1) (amortized) update and a fixed-size state, so a profile costs the same
+amount of memory after ten bets as after ten thousand.
+"""
+
+import math
+from bisect import bisect_right
+
+# Upper edges of the bet-size histogram buckets (in chips); the last bucket is open-ended
+DEFAULT_BUCKET_EDGES = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+class RunningMoments:
+    """
+    Welford's online algorithm for the mean and variance.
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, value):
+        """
+        Adds a single observation.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Sample variance of the observations (0 for fewer than two observations)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Sample standard deviation of the observations."""
+        return self.variance ** 0.5
+
+
+class FixedHistogram:
+    """
+    Histogram over a fixed set of bucket edges.
+    """
+
+    def __init__(self, edges=DEFAULT_BUCKET_EDGES, counts=None):
+        """
+        Args:
+            edges (tuple): Sorted upper edges of the buckets. Values above the last edge go to an overflow bucket.
+            counts (list, optional): Existing bucket counts (len(edges) + 1 entries).
+        """
+        self.edges = tuple(edges)
+        self.counts = list(counts) if counts is not None else [0] * (len(self.edges) + 1)
+
+    def update(self, value):
+        """
+        Counts a single observation in its bucket.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.counts[bisect_right(self.edges, value)] += 1
+
+
+class QuantileSketch:
+    """
+    Merging t-digest style quantile sketch.
+    Observations are buffered and periodically merged into a bounded list of weighted centroids.
+    Centroids near the median may hold many points while those in the tails stay small, so tail
+    quantiles remain accurate. The arcsine scale function bounds the number of centroids by the compression factor.
+    """
+
+    def __init__(self, compression=100, centroids=None, count=0, minimum=None, maximum=None):
+        """
+        Args:
+            compression (int): Controls the accuracy/size trade-off (more centroids for larger values).
+            centroids (list, optional): Existing [mean, weight] pairs.
+            count (int): Number of observations represented by the centroids.
+            minimum (float, optional): Smallest observation seen.
+            maximum (float, optional): Largest observation seen.
+        """
+        self.compression = compression
+        self.centroids = [list(centroid) for centroid in centroids] if centroids else []
+        self.count = count
+        self.minimum = minimum
+        self.maximum = maximum
+        self._buffer = []
+
+    def update(self, value):
+        """
+        Adds a single observation. Merging happens once the buffer fills, so the amortized cost is O(1).
+
+        Args:
+            value (float): The observed value.
+        """
+        self._buffer.append(value)
+        self.count += 1
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if len(self._buffer) >= 2 * self.compression:
+            self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + [[value, 1] for value in self._buffer])
+        self._buffer = []
+
+        merged = [points[0]]
+        cumulative = 0.0
+        k_left = self._scale(0.0)
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            combined = current[1] + weight
+            # A centroid may only span one unit of the arcsine scale, which bounds the centroid count
+            if self._scale((cumulative + combined) / self.count) - k_left <= 1:
+                current[0] += (mean - current[0]) * weight / combined
+                current[1] = combined
+            else:
+                cumulative += current[1]
+                k_left = self._scale(cumulative / self.count)
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def _scale(self, q):
+        return self.compression / (2 * math.pi) * math.asin(min(1.0, max(-1.0, 2 * q - 1)))
+
+    def quantile(self, q):
+        """
+        Estimates a quantile of the observations.
+
+        Args:
+            q (float): The quantile to estimate, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile, or None if nothing has been observed.
+        """
+        self._compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+
+        target = q * self.count
+        cumulative = 0.0
+        previous_center, previous_mean = 0.0, self.minimum
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span > 0 else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            cumulative += weight
+            previous_center, previous_mean = center, mean
+
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span > 0 else 1.0
+        return previous_mean + fraction * (self.maximum - previous_mean)
+
+
+class BetSizeStats:
+    """
+    Bundles the running moments, histogram and quantile sketch tracked for an opponent's bet sizes.
+    """
+
+    __slots__ = ('moments', 'histogram', 'sketch')
+
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.histogram = FixedHistogram()
+        self.sketch = QuantileSketch()
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def update(self, bet_size):
+        """
+        Records a single bet size in every tracker.
+
+        Args:
+            bet_size (float): The size of the opponent's bet.
+        """
+        self.moments.update(bet_size)
+        self.histogram.update(bet_size)
+        self.sketch.update(bet_size)
+
+    def to_dict(self):
+        """
+        Returns the tracker state as a compact, JSON-serializable dictionary.
+        """
+        self.sketch._compress()
+        return {
+            "count": self.moments.count,
+            "mean": self.moments.mean,
+            "m2": self.moments.m2,
+            "histogram": list(self.histogram.counts),
+            "centroids": [list(centroid) for centroid in self.sketch.centroids],
+            "min": self.sketch.minimum,
+            "max": self.sketch.maximum
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Restores the trackers from the dictionary produced by to_dict().
+
+        Args:
+            data (dict): The serialized tracker state.
+
+        Returns:
+            BetSizeStats: The restored statistics.
+        """
+        stats = cls()
+        stats.moments = RunningMoments(data["count"], data["mean"], data["m2"])
+        stats.histogram = FixedHistogram(counts=data["histogram"])
+        stats.sketch = QuantileSketch(
+            centroids=data["centroids"], count=data["count"], minimum=data["min"], maximum=data["max"]
+        )
+        return stats
+
+    @classmethod
+    def from_values(cls, bet_sizes):
+        """
+        Builds statistics from a list of raw bet sizes, e.g. from profiles saved by older versions.
+
+        Args:
+            bet_sizes (list): The recorded bet sizes.
+
+        Returns:
+            BetSizeStats: The statistics of the given bets.
+        """
+        stats = cls()
+        for bet_size in bet_sizes:
+            stats.update(bet_size)
+        return stats
+
+    @classmethod
+    def from_aggregates(cls, count, mean, m2, histogram, values):
+        """
+        Builds statistics from precomputed aggregates, as produced by a vectorized group-by.
+
+        Args:
+            count (int): Number of bets.
+            mean (float): Mean bet size.
+            m2 (float): Sum of squared deviations from the mean.
+            histogram (list): Bucket counts over DEFAULT_BUCKET_EDGES.
+            values (array-like): The bet sizes, used to seed the quantile sketch.
+
+        Returns:
+            BetSizeStats: The statistics of the given bets.
+        """
+        stats = cls()
+        stats.moments = RunningMoments(int(count), float(mean), float(m2))
+        stats.histogram = FixedHistogram(counts=[int(c) for c in histogram])
+        sketch = stats.sketch
+        sketch._buffer = [float(value) for value in values]
+        sketch.count = len(sketch._buffer)
+        if sketch._buffer:
+            sketch.minimum, sketch.maximum = min(sketch._buffer), max(sketch._buffer)
+        sketch._compress()
+        return stats
+
+    def summary(self):
+        """
+        Returns the headline statistics used by the strategy engine.
+        """
+        return {
+            "count": self.moments.count,
+            "mean": self.moments.mean,
+            "std": self.moments.std,
+            "median": self.sketch.quantile(0.5),
+            "p90": self.sketch.quantile(0.9)
+        }
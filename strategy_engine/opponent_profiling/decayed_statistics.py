@@ -0,0 +1,138 @@
+# decayed_statistics.py
+
+"""
+Time-aware action counters for opponent profiles.
+DecayedCounters weights each action by how recent it is (exponential decay with a half-life) and
+WindowedCounters counts actions in a sliding time window built from fixed-width buckets. Both
+apply the passage of time lazily from the last update, so recording an action is O(1) and no
+raw action history is stored.
+"""
+
+from array import array
+
+class DecayedCounters:
+    """
+    Exponentially decayed counts for a fixed number of categories.
+    Slot 0 holds the decayed total, slots 1.. the decayed count of each category.
+    """
+
+    __slots__ = ('values', 'last_update')
+
+    def __init__(self, num_categories, values=None, last_update=None):
+        """
+        Args:
+            num_categories (int): Number of tracked categories.
+            values (list, optional): Existing decayed values (num_categories + 1 entries).
+            last_update (float, optional): Timestamp (in seconds) of the last update.
+        """
+        self.values = array('d', values if values is not None else [0.0] * (num_categories + 1))
+        self.last_update = last_update
+
+    def _decay_factor(self, timestamp, half_life):
+        if self.last_update is None or timestamp <= self.last_update:
+            return 1.0
+        return 0.5 ** ((timestamp - self.last_update) / half_life)
+
+    def update(self, category, timestamp, half_life):
+        """
+        Decays the existing counts to the given time and adds one observation. An observation older
+        than the last update is added at the weight it has decayed to by then.
+
+        Args:
+            category (int): Index of the observed category (0-based), or None to only count the total.
+            timestamp (float): Time of the observation in seconds.
+            half_life (float): Time in seconds after which an observation carries half its weight.
+        """
+        factor = self._decay_factor(timestamp, half_life)
+        values = self.values
+        if factor != 1.0:
+            for index in range(len(values)):
+                values[index] *= factor
+        weight = 1.0
+        if self.last_update is not None and timestamp < self.last_update:
+            weight = 0.5 ** ((self.last_update - timestamp) / half_life)
+        values[0] += weight
+        if category is not None:
+            values[category + 1] += weight
+        if self.last_update is None or timestamp > self.last_update:
+            self.last_update = timestamp
+
+    def ratio(self, category):
+        """
+        Returns the decayed share of a category. Decay scales every slot equally, so ratios
+        do not need to be re-decayed when read.
+        """
+        return self.values[category + 1] / self.values[0] if self.values[0] else 0.0
+
+    def total(self, timestamp, half_life):
+        """
+        Returns the decayed weight of all observations as of the given time.
+        """
+        return self.values[0] * self._decay_factor(timestamp, half_life)
+
+
+class WindowedCounters:
+    """
+    Counts per category over a sliding time window of num_buckets buckets of bucket_seconds each.
+    Running totals are maintained as buckets enter and leave the window.
+    """
+
+    __slots__ = ('num_categories', 'num_buckets', 'buckets', 'totals', 'current_bucket')
+
+    def __init__(self, num_categories, num_buckets, buckets=None, current_bucket=None):
+        """
+        Args:
+            num_categories (int): Number of tracked categories.
+            num_buckets (int): Number of buckets in the window.
+            buckets (list, optional): Existing flat bucket counts (num_buckets * (num_categories + 1) entries).
+            current_bucket (int, optional): Absolute index of the newest bucket.
+        """
+        self.num_categories = num_categories
+        self.num_buckets = num_buckets
+        width = num_categories + 1
+        self.buckets = array('I', buckets if buckets is not None else [0] * (num_buckets * width))
+        self.totals = array('I', [0] * width)
+        for start in range(0, len(self.buckets), width):
+            for index in range(width):
+                self.totals[index] += self.buckets[start + index]
+        self.current_bucket = current_bucket
+
+    def _advance(self, bucket):
+        width = self.num_categories + 1
+        if self.current_bucket is None:
+            self.current_bucket = bucket
+            return
+        # At most num_buckets buckets expire, however long the player was away
+        for expired in range(self.current_bucket + 1, min(bucket, self.current_bucket + self.num_buckets) + 1):
+            start = (expired % self.num_buckets) * width
+            for index in range(width):
+                self.totals[index] -= self.buckets[start + index]
+                self.buckets[start + index] = 0
+        self.current_bucket = bucket
+
+    def update(self, category, timestamp, bucket_seconds):
+        """
+        Adds one observation at the given time, expiring buckets that fell out of the window.
+
+        Args:
+            category (int): Index of the observed category (0-based), or None to only count the total.
+            timestamp (float): Time of the observation in seconds.
+            bucket_seconds (float): Width of each bucket in seconds.
+        """
+        bucket = int(timestamp // bucket_seconds)
+        if self.current_bucket is not None and bucket <= self.current_bucket - self.num_buckets:
+            return  # Older than the whole window
+        if self.current_bucket is None or bucket > self.current_bucket:
+            self._advance(bucket)
+        start = (bucket % self.num_buckets) * (self.num_categories + 1)
+        self.buckets[start] += 1
+        self.totals[0] += 1
+        if category is not None:
+            self.buckets[start + category + 1] += 1
+            self.totals[category + 1] += 1
+
+    def ratio(self, category):
+        """
+        Returns the share of a category within the window as of the last update.
+        """
+        return self.totals[category + 1] / self.totals[0] if self.totals[0] else 0.0
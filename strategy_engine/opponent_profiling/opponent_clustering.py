@@ -0,0 +1,143 @@
+# opponent_clustering.py
+
+"""
+Mini-batch k-means clustering of opponent profiles.
+Profiles are reduced to a small feature vector (decayed raise, fold, check and bluff shares) and
+assigned to the nearest of k centroids, so classifying a player is one O(k) distance computation
+however many players are profiled. The centroids start at hand-placed archetype prototypes, which
+makes assignment meaningful from a cold start, and are refit incrementally with mini-batch updates
+as profile snapshots arrive. Every centroid carries the label of its nearest archetype.
+"""
+
+import numpy as np
+
+FEATURE_NAMES = ('raise', 'fold', 'check', 'bluff')
+
+# Archetype prototypes in feature space, in FEATURE_NAMES order
+ARCHETYPES = {
+    'Aggressive': (0.8, 0.1, 0.1, 0.0),
+    'Tight': (0.1, 0.8, 0.1, 0.0),
+    'Passive': (0.1, 0.1, 0.8, 0.0),
+    'Loose': (0.25, 0.25, 0.25, 0.15)
+}
+
+class OpponentClusterer:
+    """
+    Mini-batch k-means over profile feature vectors, seeded with the archetype prototypes.
+    """
+
+    def __init__(self, n_clusters=len(ARCHETYPES), prior_count=10.0, seed=0, centroids=None, counts=None,
+                 max_count=1000.0):
+        """
+        Args:
+            n_clusters (int): Number of clusters (at least the number of archetypes).
+            prior_count (float): Pseudo-count of each initial centroid; larger values make early refits move them less.
+            seed (int): Seed for the jitter of centroids beyond the archetype prototypes.
+            centroids (array-like, optional): Existing centroids, e.g. loaded from the profile database.
+            counts (array-like, optional): Number of points absorbed by each existing centroid.
+            max_count (float): Cap on each centroid's count. The learning rate of a centroid never falls
+                below (points in batch) / max_count, so centroids keep tracking changing tendencies.
+        """
+        prototypes = np.array(list(ARCHETYPES.values()))
+        if centroids is not None:
+            self.centroids = np.array(centroids, dtype=np.float64)
+            self.counts = np.array(counts, dtype=np.float64)
+        else:
+            if n_clusters < len(prototypes):
+                raise ValueError(f"n_clusters must be at least {len(prototypes)}")
+            # Extra clusters start as jittered copies of the prototypes so they can split an archetype
+            rng = np.random.default_rng(seed)
+            extra = prototypes[np.arange(n_clusters - len(prototypes)) % len(prototypes)]
+            extra = np.clip(extra + rng.normal(0.0, 0.05, extra.shape), 0.0, 1.0)
+            self.centroids = np.vstack([prototypes, extra])
+            self.counts = np.full(n_clusters, prior_count)
+        self.max_count = float(max_count)
+        self._prototypes = prototypes
+        self._refresh_labels()
+
+    @property
+    def n_clusters(self):
+        return len(self.centroids)
+
+    def _refresh_labels(self):
+        distances = ((self.centroids[:, None, :] - self._prototypes[None, :, :]) ** 2).sum(axis=2)
+        names = list(ARCHETYPES)
+        self.labels = [names[index] for index in distances.argmin(axis=1)]
+
+    def assign(self, features):
+        """
+        Returns the nearest cluster of each feature vector.
+
+        Args:
+            features (np.ndarray): Feature vectors of shape (n, len(FEATURE_NAMES)), or a single vector.
+
+        Returns:
+            np.ndarray: Cluster index of each vector (an int for a single vector).
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim == 1:
+            return int(((self.centroids - features) ** 2).sum(axis=1).argmin())
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; the ||x||^2 term does not change the argmin
+        distances = (self.centroids ** 2).sum(axis=1) - 2.0 * features @ self.centroids.T
+        return distances.argmin(axis=1)
+
+    def label(self, cluster):
+        """
+        Returns the archetype label of a cluster.
+        """
+        return self.labels[cluster]
+
+    def partial_fit(self, features):
+        """
+        Updates the centroids with one mini-batch. Each centroid moves towards the mean of its
+        assigned points with a per-centroid learning rate of (points in batch) / (points seen), where
+        points seen is capped at max_count.
+
+        Args:
+            features (np.ndarray): Feature vectors of shape (n, len(FEATURE_NAMES)).
+
+        Returns:
+            np.ndarray: Cluster index of each vector after the update.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if len(features) == 0:
+            return np.zeros(0, dtype=np.int64)
+        assignments = self.assign(features)
+        batch_counts = np.bincount(assignments, minlength=self.n_clusters).astype(np.float64)
+        sums = np.zeros_like(self.centroids)
+        np.add.at(sums, assignments, features)
+
+        self.counts = np.minimum(self.counts + batch_counts, np.maximum(self.max_count, batch_counts))
+        moved = batch_counts > 0
+        self.centroids[moved] += (sums[moved] - batch_counts[moved, None] * self.centroids[moved]) / self.counts[moved, None]
+        self._refresh_labels()
+        return self.assign(features)
+
+    def to_rows(self):
+        """
+        Returns (cluster_id, centroid values, count) rows for persistence.
+        """
+        return [(index, list(map(float, centroid)), float(count)) for index, (centroid, count) in enumerate(zip(self.centroids, self.counts))]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Rebuilds a clusterer from the rows produced by to_rows().
+        """
+        rows = sorted(rows)
+        return cls(centroids=[row[1] for row in rows], counts=[row[2] for row in rows])
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    clusterer = OpponentClusterer(n_clusters=8)
+    # Simulated population: maniacs, nits and calling stations
+    population = np.vstack([
+        rng.dirichlet((8, 1, 1, 1), 500),
+        rng.dirichlet((1, 8, 1, 0.5), 500),
+        rng.dirichlet((1, 1, 8, 0.5), 500)
+    ])
+    for batch in np.array_split(rng.permutation(population), 10):
+        clusterer.partial_fit(batch)
+    for centroid, count, label in zip(clusterer.centroids, clusterer.counts, clusterer.labels):
+        print(f"{label:<10} n={count:6.0f} centroid={np.round(centroid, 2).tolist()}")
@@ -2,12 +2,61 @@
 
 import json
 import os
+import sqlite3
+import time
+import numpy as np
+from contextlib import closing
+from strategy_engine.opponent_profiling.bet_size_statistics import BetSizeStats
+from strategy_engine.opponent_profiling.decayed_statistics import DecayedCounters, WindowedCounters
+from strategy_engine.opponent_profiling.opponent_clustering import OpponentClusterer
+from strategy_engine.opponent_profiling.range_model import OpponentRangeModel
+
+# Actions tracked by the decayed and windowed counters, in counter order
+ACTION_CATEGORIES = ('raise', 'fold', 'check', 'bluff')
+ACTION_CATEGORY_INDEX = {action: index for index, action in enumerate(ACTION_CATEGORIES)}
+
+# Clusterer used when a profile is classified without one; it stays at the archetype prototypes
+ARCHETYPE_CLUSTERER = OpponentClusterer()
 
 class OpponentProfile:
     """
     A class to represent and manage an opponent's profile, tracking their behavior over time.
+    Profiles use __slots__ so that hundreds of thousands of them can be kept in memory, and each
+    action only increments a counter in place. Besides lifetime counters, every profile keeps
+    exponentially decayed and sliding-window action counts so recent behavior dominates.
     """
 
+    __slots__ = (
+        'player_id', 'hands_played', 'aggressiveness', 'passiveness', 'bluffing_frequency',
+        'fold_frequency', 'bet_size_stats', 'opponent_type', 'recent_actions', 'window_actions',
+        'agg_ratio', 'fold_ratio', 'passive_ratio', 'vpip', 'pfr', 'aggression_factor', 'fold_to_bet',
+        'cluster'
+    )
+
+    # Decay and sliding-window settings (in seconds)
+    HALF_LIFE_SECONDS = 6 * 3600
+    WINDOW_BUCKETS = 12
+    WINDOW_BUCKET_SECONDS = 300
+
+    # Persisted fields and their SQLite column types
+    COLUMNS = (
+        ('player_id', 'TEXT PRIMARY KEY'),
+        ('hands_played', 'INTEGER'),
+        ('aggressiveness', 'REAL'),
+        ('passiveness', 'REAL'),
+        ('bluffing_frequency', 'REAL'),
+        ('fold_frequency', 'REAL'),
+        ('bet_size_stats', 'TEXT'),
+        ('opponent_type', 'TEXT'),
+        ('recent_actions', 'TEXT'),
+        ('window_actions', 'TEXT'),
+        ('vpip', 'REAL'),
+        ('pfr', 'REAL'),
+        ('aggression_factor', 'REAL'),
+        ('fold_to_bet', 'REAL'),
+        ('cluster', 'INTEGER')
+    )
+
     def __init__(self, player_id):
         self.player_id = player_id
         self.hands_played = 0
@@ -15,17 +64,32 @@ class OpponentProfile:
         self.passiveness = 0.0
         self.bluffing_frequency = 0.0
         self.fold_frequency = 0.0
-        self.bet_sizes = []
+        self.bet_size_stats = BetSizeStats()
         self.opponent_type = "Unknown"
-
-    def update_profile(self, action, bet_size=None):
+        self.recent_actions = DecayedCounters(len(ACTION_CATEGORIES))
+        self.window_actions = WindowedCounters(len(ACTION_CATEGORIES), self.WINDOW_BUCKETS)
+        self.agg_ratio = 0.0
+        self.fold_ratio = 0.0
+        self.passive_ratio = 0.0
+        # Hand-level features computed offline from hand histories (see batch_profile_builder.py)
+        self.vpip = 0.0
+        self.pfr = 0.0
+        self.aggression_factor = 0.0
+        self.fold_to_bet = 0.0
+        self.cluster = -1
+
+    def update_profile(self, action, bet_size=None, timestamp=None, clusterer=None):
         """
         Updates the opponent profile based on the action taken by the opponent in the game.
 
         Args:
             action (str): The action taken by the opponent (e.g., 'raise', 'fold', 'check', 'bet', 'bluff').
             bet_size (float, optional): The size of the opponent's bet if applicable.
+            timestamp (float, optional): Time of the action in seconds. Defaults to the current time.
+            clusterer (OpponentClusterer, optional): The clusterer used to classify the opponent.
         """
+        if timestamp is None:
+            timestamp = time.time()
         self.hands_played += 1
 
         if action == "raise":
@@ -37,33 +101,59 @@ class OpponentProfile:
         elif action == "check":
             self.passiveness += 1
         elif action == "bet" and bet_size:
-            self.bet_sizes.append(bet_size)
+            self.bet_size_stats.update(bet_size)
+
+        category = ACTION_CATEGORY_INDEX.get(action)
+        self.recent_actions.update(category, timestamp, self.HALF_LIFE_SECONDS)
+        self.window_actions.update(category, timestamp, self.WINDOW_BUCKET_SECONDS)
+        self.refresh_ratios()
+        self.classify_opponent(clusterer)
+
+    def refresh_ratios(self):
+        """
+        Recomputes the cached action ratios from the decayed counters.
+        """
+        self.agg_ratio = self.recent_actions.ratio(ACTION_CATEGORY_INDEX['raise'])
+        self.fold_ratio = self.recent_actions.ratio(ACTION_CATEGORY_INDEX['fold'])
+        self.passive_ratio = self.recent_actions.ratio(ACTION_CATEGORY_INDEX['check'])
+
+    def window_ratio(self, action):
+        """
+        Returns the share of an action among the opponent's actions in the sliding window.
 
-        self.classify_opponent()
+        Args:
+            action (str): One of ACTION_CATEGORIES.
 
-    def classify_opponent(self):
+        Returns:
+            float: The share of the action, 0 if nothing was observed in the window.
         """
-        Classifies the opponent based on the collected data. Opponents are classified into four types:
+        return self.window_actions.ratio(ACTION_CATEGORY_INDEX[action])
+
+    def features(self):
+        """
+        Returns the feature vector used for clustering (decayed raise, fold, check and bluff shares).
+        """
+        return (self.agg_ratio, self.fold_ratio, self.passive_ratio,
+                self.recent_actions.ratio(ACTION_CATEGORY_INDEX['bluff']))
+
+    def classify_opponent(self, clusterer=None):
+        """
+        Classifies the opponent by assigning their feature vector to the nearest cluster centroid.
+        Each cluster is labeled with one of four types:
         - Aggressive
         - Passive
         - Tight
         - Loose
+
+        Args:
+            clusterer (OpponentClusterer, optional): The clusterer to use. Defaults to the archetype prototypes.
         """
         if self.hands_played == 0:
             return
 
-        agg_ratio = self.aggressiveness / self.hands_played
-        fold_ratio = self.fold_frequency / self.hands_played
-        passive_ratio = self.passiveness / self.hands_played
-
-        if agg_ratio > 0.6:
-            self.opponent_type = "Aggressive"
-        elif fold_ratio > 0.6:
-            self.opponent_type = "Tight"
-        elif passive_ratio > 0.6:
-            self.opponent_type = "Passive"
-        else:
-            self.opponent_type = "Loose"
+        clusterer = clusterer or ARCHETYPE_CLUSTERER
+        self.cluster = clusterer.assign(self.features())
+        self.opponent_type = clusterer.label(self.cluster)
 
     def get_profile(self):
         """
@@ -76,41 +166,340 @@ class OpponentProfile:
             "passiveness": self.passiveness,
             "bluffing_frequency": self.bluffing_frequency,
             "fold_frequency": self.fold_frequency,
-            "bet_sizes": self.bet_sizes,
-            "opponent_type": self.opponent_type
+            "bet_size_stats": self.bet_size_stats.to_dict(),
+            "opponent_type": self.opponent_type,
+            "recent_actions": {
+                "values": self.recent_actions.values.tolist(),
+                "last_update": self.recent_actions.last_update
+            },
+            "window_actions": {
+                "buckets": self.window_actions.buckets.tolist(),
+                "current_bucket": self.window_actions.current_bucket
+            },
+            "vpip": self.vpip,
+            "pfr": self.pfr,
+            "aggression_factor": self.aggression_factor,
+            "fold_to_bet": self.fold_to_bet,
+            "cluster": self.cluster
         }
 
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a profile from the dictionary produced by get_profile(). Profiles saved by older
+        versions with a raw 'bet_sizes' list are folded into streaming statistics.
+
+        Args:
+            data (dict): The profile dictionary.
+
+        Returns:
+            OpponentProfile: The restored profile.
+        """
+        profile = cls(data["player_id"])
+        for name, _ in cls.COLUMNS[1:]:
+            if data.get(name) is not None:
+                setattr(profile, name, data[name])
+        if isinstance(profile.bet_size_stats, dict):
+            profile.bet_size_stats = BetSizeStats.from_dict(profile.bet_size_stats)
+        elif data.get("bet_sizes"):
+            profile.bet_size_stats = BetSizeStats.from_values(data["bet_sizes"])
+
+        recent = data.get("recent_actions")
+        if recent:
+            profile.recent_actions = DecayedCounters(len(ACTION_CATEGORIES), recent["values"], recent["last_update"])
+        else:
+            # Older profiles only have lifetime counters; use them as the starting decayed counts
+            profile.recent_actions = DecayedCounters(len(ACTION_CATEGORIES), [
+                profile.hands_played, profile.aggressiveness, profile.fold_frequency,
+                profile.passiveness, profile.bluffing_frequency
+            ])
+        window = data.get("window_actions")
+        if window:
+            profile.window_actions = WindowedCounters(
+                len(ACTION_CATEGORIES), cls.WINDOW_BUCKETS, window["buckets"], window["current_bucket"]
+            )
+        profile.refresh_ratios()
+        return profile
+
+    def to_row(self):
+        """
+        Returns the profile as a tuple of column values matching COLUMNS.
+        """
+        return (
+            self.player_id, self.hands_played, self.aggressiveness, self.passiveness,
+            self.bluffing_frequency, self.fold_frequency,
+            json.dumps(self.bet_size_stats.to_dict(), separators=(',', ':')), self.opponent_type,
+            json.dumps([self.recent_actions.values.tolist(), self.recent_actions.last_update], separators=(',', ':')),
+            json.dumps([self.window_actions.buckets.tolist(), self.window_actions.current_bucket], separators=(',', ':')),
+            self.vpip, self.pfr, self.aggression_factor, self.fold_to_bet, self.cluster
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Rebuilds a profile from a database row.
+
+        Args:
+            row (sqlite3.Row): A row with the columns listed in COLUMNS.
+
+        Returns:
+            OpponentProfile: The restored profile.
+        """
+        data = dict(row)
+        for name in ("bet_size_stats", "bet_sizes"):
+            if data.get(name):
+                data[name] = json.loads(data[name])
+        if data.get("recent_actions"):
+            values, last_update = json.loads(data["recent_actions"])
+            data["recent_actions"] = {"values": values, "last_update": last_update}
+        if data.get("window_actions"):
+            buckets, current_bucket = json.loads(data["window_actions"])
+            data["window_actions"] = {"buckets": buckets, "current_bucket": current_bucket}
+        return cls.from_dict(data)
+
+
+class ProfileStore:
+    """
+    Indexed in-memory store of opponent profiles backed by SQLite.
+    Profiles are looked up by player id in a dict, updates mutate them in place, and only
+    profiles modified since the last flush are written back. The store also owns the clusterer
+    that assigns profiles to archetypes, whose centroids are persisted alongside the profiles.
+    """
+
+    TABLE = "opponent_profiles"
+    CLUSTER_TABLE = "opponent_clusters"
+    # Profiles need this many actions before they take part in refitting the clusters
+    MIN_FIT_HANDS = 20
+    # Number of experienced profiles sampled for each refit
+    REFIT_BATCH_SIZE = 256
+
+    def __init__(self, db_path=None, clusterer=None, seed=None):
+        """
+        Args:
+            db_path (str, optional): SQLite database to load from and flush to.
+            clusterer (OpponentClusterer, optional): The clusterer to use. A new one seeded with the archetypes is created if omitted.
+            seed (int, optional): Seed for sampling the refit mini-batches.
+        """
+        self.db_path = db_path
+        self.rng = np.random.default_rng(seed)
+        self.profiles = {}
+        self.clusterer = clusterer if clusterer is not None else OpponentClusterer()
+        self._dirty = set()
+        if db_path and os.path.exists(db_path):
+            self.load(db_path)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __contains__(self, player_id):
+        return player_id in self.profiles
+
+    def __iter__(self):
+        return iter(self.profiles.values())
+
+    def get(self, player_id):
+        """
+        Returns the profile of a player, or None if the player is unknown.
+        """
+        return self.profiles.get(player_id)
+
+    def get_or_create(self, player_id):
+        """
+        Returns the profile of a player, creating an empty one for new players.
+        """
+        profile = self.profiles.get(player_id)
+        if profile is None:
+            profile = self.profiles[player_id] = OpponentProfile(player_id)
+        return profile
+
+    def record_action(self, player_id, action, bet_size=None, timestamp=None):
+        """
+        Applies a single observed action to a player's profile.
+
+        Args:
+            player_id (str): The unique identifier of the opponent.
+            action (str): The action taken by the opponent.
+            bet_size (float, optional): The size of the opponent's bet if applicable.
+            timestamp (float, optional): Time of the action in seconds. Defaults to the current time.
+
+        Returns:
+            OpponentProfile: The updated profile.
+        """
+        profile = self.get_or_create(player_id)
+        profile.update_profile(action, bet_size, timestamp, self.clusterer)
+        self._dirty.add(player_id)
+        return profile
+
+    def put(self, profile):
+        """
+        Inserts or replaces a whole profile.
+        """
+        self.profiles[profile.player_id] = profile
+        self._dirty.add(profile.player_id)
+
+    def put_many(self, profiles):
+        """
+        Inserts or replaces many profiles at once, e.g. after an offline rebuild.
+
+        Args:
+            profiles (iterable): The OpponentProfile objects to store.
+        """
+        for profile in profiles:
+            self.profiles[profile.player_id] = profile
+            self._dirty.add(profile.player_id)
+
+    def refit_clusters(self, batch_size=None):
+        """
+        Refits the cluster centroids with one mini-batch sampled from the experienced profiles and
+        reassigns every profile. Profiles whose cluster changed are flagged for the next flush.
+
+        Args:
+            batch_size (int, optional): Profiles in the mini-batch. Defaults to REFIT_BATCH_SIZE.
+
+        Returns:
+            int: The number of profiles whose cluster changed.
+        """
+        profiles = [profile for profile in self.profiles.values() if profile.hands_played]
+        if not profiles:
+            return 0
+        features = np.array([profile.features() for profile in profiles])
+        experienced = np.flatnonzero([profile.hands_played >= self.MIN_FIT_HANDS for profile in profiles])
+        if len(experienced):
+            batch_size = self.REFIT_BATCH_SIZE if batch_size is None else batch_size
+            batch = self.rng.choice(experienced, size=min(batch_size, len(experienced)), replace=False)
+            self.clusterer.partial_fit(features[batch])
+
+        changed = 0
+        for profile, cluster in zip(profiles, self.clusterer.assign(features).tolist()):
+            label = self.clusterer.label(cluster)
+            if cluster != profile.cluster or label != profile.opponent_type:
+                profile.cluster, profile.opponent_type = cluster, label
+                self._dirty.add(profile.player_id)
+                changed += 1
+        return changed
+
+    def mark_dirty(self, player_id):
+        """
+        Flags a profile that was modified directly so the next flush persists it.
+        """
+        self._dirty.add(player_id)
+
+    def _connect(self, db_path):
+        connection = sqlite3.connect(db_path)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type in OpponentProfile.COLUMNS)
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({columns})")
+
+        # Databases written by older versions may lack newer columns
+        existing = {row["name"] for row in connection.execute(f"PRAGMA table_info({self.TABLE})")}
+        for name, sql_type in OpponentProfile.COLUMNS:
+            if name not in existing:
+                connection.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN {name} {sql_type}")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.CLUSTER_TABLE} (cluster_id INTEGER PRIMARY KEY, centroid TEXT, count REAL)"
+        )
+        return connection
+
+    def load(self, db_path=None):
+        """
+        Loads all profiles from the SQLite database, replacing those held in memory.
+
+        Args:
+            db_path (str, optional): Database path. Defaults to the store's db_path.
+        """
+        db_path = db_path or self.db_path
+        with closing(self._connect(db_path)) as connection:
+            rows = connection.execute(f"SELECT * FROM {self.TABLE}")
+            self.profiles = {row["player_id"]: OpponentProfile.from_row(row) for row in rows}
+            clusters = [
+                (row["cluster_id"], json.loads(row["centroid"]), row["count"])
+                for row in connection.execute(f"SELECT * FROM {self.CLUSTER_TABLE}")
+            ]
+        if clusters:
+            self.clusterer = OpponentClusterer.from_rows(clusters)
+        self._dirty.clear()
+
+    def flush(self, db_path=None, full=False):
+        """
+        Writes modified profiles to the SQLite database.
+
+        Args:
+            db_path (str, optional): Database path. Defaults to the store's db_path.
+            full (bool): If True, writes every profile instead of only the modified ones.
+
+        Returns:
+            int: The number of profiles written.
+        """
+        db_path = db_path or self.db_path
+        player_ids = self.profiles.keys() if full else self._dirty
+        rows = [self.profiles[player_id].to_row() for player_id in player_ids if player_id in self.profiles]
+        names = ", ".join(name for name, _ in OpponentProfile.COLUMNS)
+        placeholders = ", ".join("?" for _ in OpponentProfile.COLUMNS)
+        with closing(self._connect(db_path)) as connection:
+            with connection:
+                connection.executemany(f"INSERT OR REPLACE INTO {self.TABLE} ({names}) VALUES ({placeholders})", rows)
+                connection.execute(f"DELETE FROM {self.CLUSTER_TABLE}")
+                connection.executemany(
+                    f"INSERT INTO {self.CLUSTER_TABLE} (cluster_id, centroid, count) VALUES (?, ?, ?)",
+                    [(index, json.dumps(centroid), count) for index, centroid, count in self.clusterer.to_rows()]
+                )
+        self._dirty.clear()
+        return len(rows)
+
 
 class OpponentProfiler:
     """
     A class responsible for managing multiple opponent profiles and updating them in real-time.
     """
 
-    def __init__(self):
-        self.opponent_profiles = {}
+    def __init__(self, store=None, range_model=None):
+        """
+        Args:
+            store (ProfileStore, optional): The profile store to use. A new in-memory store is created if omitted.
+            range_model (OpponentRangeModel, optional): The hand-range model to use. A new one is created if omitted.
+        """
+        self.store = store if store is not None else ProfileStore()
+        self.range_model = range_model if range_model is not None else OpponentRangeModel()
+
+    @property
+    def opponent_profiles(self):
+        """
+        Dictionary view of all profiles, keyed by player id. Built on demand; avoid in hot paths.
+        """
+        return {profile.player_id: profile.get_profile() for profile in self.store}
 
     def load_profiles(self, file_path):
         """
-        Loads existing opponent profiles from a JSON file.
+        Loads existing opponent profiles from a SQLite database, or from a legacy JSON file.
 
         Args:
-            file_path (str): Path to the JSON file containing opponent profiles.
+            file_path (str): Path to the database or JSON file containing opponent profiles.
         """
-        if os.path.exists(file_path):
+        if not os.path.exists(file_path):
+            return
+        if file_path.endswith('.json'):
             with open(file_path, 'r') as file:
-                self.opponent_profiles = json.load(file)
+                for data in json.load(file).values():
+                    self.store.put(OpponentProfile.from_dict(data))
+        else:
+            self.store.load(file_path)
 
     def save_profiles(self, file_path):
         """
-        Saves the current opponent profiles to a JSON file.
+        Saves the current opponent profiles. SQLite databases only receive the profiles modified
+        since the last save; '.json' paths are written in full in the legacy format.
 
         Args:
-            file_path (str): Path to the JSON file where profiles will be saved.
+            file_path (str): Path to the database or JSON file where profiles will be saved.
         """
-        with open(file_path, 'w') as file:
-            json.dump(self.opponent_profiles, file, indent=4)
+        if file_path.endswith('.json'):
+            with open(file_path, 'w') as file:
+                json.dump(self.opponent_profiles, file)
+        else:
+            self.store.flush(file_path)
 
-    def update_opponent(self, player_id, action, bet_size=None):
+    def update_opponent(self, player_id, action, bet_size=None, timestamp=None):
         """
         Updates the profile of a specific opponent based on their latest action.
 
@@ -118,27 +507,40 @@ class OpponentProfiler:
             player_id (str): The unique identifier of the opponent.
             action (str): The action taken by the opponent (e.g., 'raise', 'fold', 'check', 'bet', 'bluff').
             bet_size (float, optional): The size of the opponent's bet if applicable.
+            timestamp (float, optional): Time of the action in seconds. Defaults to the current time.
         """
-        if player_id not in self.opponent_profiles:
-            self.opponent_profiles[player_id] = OpponentProfile(player_id).get_profile()
+        self.store.record_action(player_id, action, bet_size, timestamp)
 
-        # Update the opponent's profile with new action
-        profile = OpponentProfile(player_id)
-        profile.__dict__ = self.opponent_profiles[player_id]
-        profile.update_profile(action, bet_size)
+    def record_showdown(self, player_id, hole_cards):
+        """
+        Records the hole cards an opponent revealed at showdown, sharpening their range prior.
 
-        # Save the updated profile back to the dictionary
-        self.opponent_profiles[player_id] = profile.get_profile()
+        Args:
+            player_id (str): The unique identifier of the opponent.
+            hole_cards (list): The two cards shown (e.g., ['Ah', 'Kd']).
+        """
+        self.range_model.observe_showdown(player_id, hole_cards)
+
+    def get_opponent_range(self, player_id, history, board=(), dead_cards=()):
+        """
+        Returns the estimated hand range of an opponent given their actions in the current hand.
+
+        Args:
+            player_id (str): The unique identifier of the opponent.
+            history (list): The opponent's actions in the hand as (street, action) pairs.
+            board (list): Community cards dealt so far.
+            dead_cards (list): Other known cards, such as our hole cards.
+
+        Returns:
+            np.ndarray: Weight of each of the 1326 combos, summing to 1.
+        """
+        return self.range_model.posterior(player_id, history, board, dead_cards, self.store.get(player_id))
 
     def classify_all_opponents(self):
         """
-        Classifies all known opponents based on their current behavior profiles.
+        Refits the opponent clusters on the current profiles and reclassifies all known opponents.
         """
-        for player_id, profile_data in self.opponent_profiles.items():
-            profile = OpponentProfile(player_id)
-            profile.__dict__ = profile_data
-            profile.classify_opponent()
-            self.opponent_profiles[player_id] = profile.get_profile()
+        self.store.refit_clusters()
 
     def get_opponent_type(self, player_id):
         """
@@ -150,8 +552,9 @@ class OpponentProfiler:
         Returns:
             str: The classified type of the opponent (e.g., 'Aggressive', 'Passive').
         """
-        if player_id in self.opponent_profiles:
-            return self.opponent_profiles[player_id]["opponent_type"]
+        profile = self.store.get(player_id)
+        if profile is not None:
+            return profile.opponent_type
         return "Unknown"
 
 
@@ -159,8 +562,8 @@ class OpponentProfiler:
 if __name__ == "__main__":
     profiler = OpponentProfiler()
 
-    # Load existing profiles from file
-    profiler.load_profiles('opponent_profiles.json')
+    # Load existing profiles from the profile database
+    profiler.load_profiles('opponent_profiles.db')
 
     # Update an opponent profile
     profiler.update_opponent(player_id='player_123', action='raise')
@@ -170,8 +573,8 @@ if __name__ == "__main__":
     # Classify all opponents
     profiler.classify_all_opponents()
 
-    # Save the updated profiles to file
-    profiler.save_profiles('opponent_profiles.json')
+    # Save the updated profiles (only modified rows are written)
+    profiler.save_profiles('opponent_profiles.db')
 
     # Get the type of a specific opponent
     print(profiler.get_opponent_type('player_123'))
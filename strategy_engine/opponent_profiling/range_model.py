@@ -0,0 +1,225 @@
+# range_model.py
+
+"""
+Bayesian hand-range model for opponents.
+Each opponent's range is a weight vector over the 1326 two-card combos. The prior comes from the
+hands the opponent showed down, and every observed action multiplies the range by a vectorized
+likelihood of that action given each combo's strength. Posteriors are cached per
+(player, board, action sequence) in an LRU cache, and a longer sequence is built from the cached
+posterior of its prefix, so following a hand action by action costs one vector multiply per action.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from strategy_engine.card_encoding import (
+    COMBO_HAND_CLASS, COMBO_PREFLOP_STRENGTH, HAND_CLASS_COMBOS, INVALID_CARD, NUM_COMBOS,
+    NUM_HAND_CLASSES, blocked_combos, hand_class_id, parse_card
+)
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+# Number of board cards visible on each street
+STREET_BOARD_CARDS = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+# Action tendencies assumed for opponents without enough observed actions
+DEFAULT_TENDENCIES = {'aggression': 0.2, 'fold': 0.3, 'bluff': 0.05}
+
+def _card_codes(cards):
+    codes = tuple(parse_card(card) if isinstance(card, str) else int(card) for card in cards)
+    if INVALID_CARD in codes:
+        raise ValueError(f"Invalid card in {cards}")
+    return codes
+
+def preflop_strength(board):
+    """
+    Default combo strength function: the preflop strength of each combo, whatever the board.
+
+    Args:
+        board (tuple): Board card codes (ignored).
+
+    Returns:
+        np.ndarray: Strength in [0, 1] of each of the 1326 combos.
+    """
+    return COMBO_PREFLOP_STRENGTH
+
+def action_likelihoods(action, strength, aggression, fold, bluff, temperature=0.08):
+    """
+    Vectorized likelihood of an action for every combo.
+    Opponents are assumed to bet or raise with roughly the top `aggression` share of their hands
+    (plus bluffs at rate `bluff`), fold the bottom `fold` share and call or check with the rest.
+
+    Args:
+        action (str): The observed action ('raise', 'bet', 'bluff', 'call', 'check' or 'fold').
+        strength (np.ndarray): Strength in [0, 1] of each combo.
+        aggression (float): Share of hands the opponent plays aggressively.
+        fold (float): Share of hands the opponent folds.
+        bluff (float): Rate at which the opponent bets regardless of strength.
+        temperature (float): Softness of the strength thresholds.
+
+    Returns:
+        np.ndarray: P(action | combo) for each combo.
+    """
+    aggressive = 1.0 / (1.0 + np.exp(-(strength - (1.0 - aggression)) / temperature))
+    folds = 1.0 / (1.0 + np.exp((strength - fold) / temperature))
+
+    if action in ('raise', 'bet', 'bluff'):
+        return (1.0 - bluff) * aggressive + bluff
+    if action == 'fold':
+        return folds
+    if action in ('call', 'check'):
+        # Whatever is neither raised nor folded, with a floor for slow-played and trapping hands
+        return np.clip(1.0 - aggressive - folds, 0.0, None) + 0.1 * aggressive
+    raise ValueError(f"Unknown action '{action}'")
+
+
+class OpponentRangeModel:
+    """
+    Per-opponent combo ranges with showdown-informed priors and cached posteriors.
+    """
+
+    def __init__(self, cache_size=4096, prior_strength=50.0, temperature=0.08, strength_fn=preflop_strength):
+        """
+        Args:
+            cache_size (int): Maximum number of cached posteriors.
+            prior_strength (float): Weight of the uniform prior relative to showdown observations.
+            temperature (float): Softness of the action likelihood thresholds.
+            strength_fn (callable): Maps a tuple of board card codes to the strength of each combo.
+        """
+        self.cache_size = cache_size
+        self.prior_strength = prior_strength
+        self.temperature = temperature
+        self.strength_fn = strength_fn
+        self._showdown_counts = {}
+        self._versions = {}
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def observe_showdown(self, player_id, hole_cards):
+        """
+        Records the hole cards an opponent showed down. Cached posteriors of the player become stale.
+
+        Args:
+            player_id (str): The opponent's identifier.
+            hole_cards (list): Two cards, as strings ('Ah') or card codes.
+        """
+        hand_class = hand_class_id(list(_card_codes(hole_cards)))
+        if hand_class < 0:
+            raise ValueError(f"Invalid hole cards {hole_cards}")
+        counts = self._showdown_counts.setdefault(player_id, np.zeros(NUM_HAND_CLASSES))
+        counts[hand_class] += 1
+        self._versions[player_id] = self._versions.get(player_id, 0) + 1
+
+    def prior(self, player_id):
+        """
+        Returns the normalized prior range of an opponent. Showdown counts are smoothed towards the
+        uniform distribution with a Dirichlet prior worth `prior_strength` observations.
+
+        Args:
+            player_id (str): The opponent's identifier.
+
+        Returns:
+            np.ndarray: Weight of each combo, summing to 1.
+        """
+        counts = self._showdown_counts.get(player_id)
+        if counts is None:
+            return np.full(NUM_COMBOS, 1.0 / NUM_COMBOS)
+        class_weights = (self.prior_strength * HAND_CLASS_COMBOS / NUM_COMBOS + counts) / HAND_CLASS_COMBOS
+        weights = class_weights[COMBO_HAND_CLASS]
+        return weights / weights.sum()
+
+    def tendencies(self, profile=None):
+        """
+        Returns the (aggression, fold, bluff) tendencies used by the likelihoods, read from an
+        OpponentProfile when available. Values are rounded so they can be part of the cache key.
+        """
+        if profile is None or not profile.hands_played:
+            values = (DEFAULT_TENDENCIES['aggression'], DEFAULT_TENDENCIES['fold'], DEFAULT_TENDENCIES['bluff'])
+        else:
+            bluff = profile.bluffing_frequency / profile.hands_played
+            values = (profile.agg_ratio + bluff, profile.fold_ratio, bluff)
+        return tuple(round(min(max(value, 0.01), 0.95) * 20) / 20 for value in values)
+
+    def posterior(self, player_id, history, board=(), dead_cards=(), profile=None):
+        """
+        Returns the opponent's range after the given action sequence.
+
+        Args:
+            player_id (str): The opponent's identifier.
+            history (list): The opponent's actions in the hand as (street, action) pairs.
+            board (list): Community cards dealt so far, as strings or card codes.
+            dead_cards (list): Other known cards (e.g. our hole cards). They and the whole board are
+                removed from the range, whatever street the history ends on.
+            profile (OpponentProfile, optional): The opponent's profile, used for action tendencies.
+
+        Returns:
+            np.ndarray: Weight of each combo, summing to 1 (all zeros if no combo is possible).
+        """
+        history = tuple((street, action.lower()) for street, action in history)
+        board = _card_codes(board)
+        weights = self._cached_posterior(player_id, history, board, self.tendencies(profile))
+        blocked = tuple(board) + tuple(_card_codes(dead_cards))
+        if blocked:
+            weights = np.where(blocked_combos(blocked), 0.0, weights)
+            total = weights.sum()
+            weights = weights / total if total > 0 else weights
+        return weights
+
+    def _cached_posterior(self, player_id, history, board, tendencies):
+        street = history[-1][0] if history else 'preflop'
+        if street not in STREET_BOARD_CARDS:
+            raise ValueError(f"Unknown street '{street}'")
+        visible_board = board[:STREET_BOARD_CARDS[street]]
+        key = (player_id, self._versions.get(player_id, 0), tendencies, visible_board, history)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        if not history:
+            weights = self.prior(player_id)
+        else:
+            weights = self._cached_posterior(player_id, history[:-1], board, tendencies)
+            aggression, fold, bluff = tendencies
+            likelihood = action_likelihoods(
+                history[-1][1], self.strength_fn(visible_board), aggression, fold, bluff, self.temperature
+            )
+            weights = weights * likelihood
+        if visible_board:
+            weights = np.where(blocked_combos(visible_board), 0.0, weights)
+        total = weights.sum()
+        if total > 0:
+            weights = weights / total
+        weights.flags.writeable = False
+
+        self._cache[key] = weights
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return weights
+
+    def class_weights(self, weights):
+        """
+        Aggregates a combo range into the 169 starting-hand classes.
+
+        Args:
+            weights (np.ndarray): Weight of each combo.
+
+        Returns:
+            np.ndarray: Total weight of each hand class.
+        """
+        return np.bincount(COMBO_HAND_CLASS, weights=weights, minlength=NUM_HAND_CLASSES)
+
+
+if __name__ == "__main__":
+    from strategy_engine.card_encoding import HAND_CLASS_NAMES
+
+    model = OpponentRangeModel()
+    model.observe_showdown('player_123', ['Ah', 'Kh'])
+    posterior = model.posterior('player_123', [('preflop', 'raise')], dead_cards=['As', 'Ad'])
+    by_class = model.class_weights(posterior)
+    top = np.argsort(-by_class)[:10]
+    print("Most likely hand classes after a preflop raise:")
+    for index in top:
+        print(f"  {HAND_CLASS_NAMES[index]}: {by_class[index]:.3f}")
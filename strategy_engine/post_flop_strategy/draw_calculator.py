@@ -0,0 +1,213 @@
+# draw_calculator.py
+
+"""
+Outs and draw potential for post-flop hands.
+Ranks are represented as 13-bit masks (bit 0 = deuce, bit 12 = ace). Straight-draw outs for every
+possible rank mask are precomputed once, so finding the exact improving cards of a hand is a
+few table lookups instead of re-evaluating the hand with each of the ~45 unseen cards.
+Hand potential (the chance of falling behind or pulling ahead by the river) is estimated by
+Monte Carlo on top of the evaluator.
+"""
+
+from math import comb
+import numpy as np
+from strategy_engine.card_encoding import INVALID_CARD, NUM_CARDS, parse_card
+from strategy_engine.solver.card_abstraction import showdown_strength
+
+NUM_RANK_MASKS = 1 << 13
+
+def _straight_masks():
+    # Wheel (A-2-3-4-5) first, then 2-6 up to T-A
+    masks = [(1 << 12) | 0b1111]
+    masks += [0b11111 << low for low in range(9)]
+    return np.array(masks, dtype=np.int64)
+
+STRAIGHT_MASKS = _straight_masks()
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(NUM_RANK_MASKS)], dtype=np.uint8)
+
+def _straight_tables():
+    masks = np.arange(NUM_RANK_MASKS, dtype=np.int64)
+    made = np.zeros(NUM_RANK_MASKS, dtype=bool)
+    outs = np.zeros(NUM_RANK_MASKS, dtype=np.int64)
+    for straight in STRAIGHT_MASKS:
+        missing = straight & ~masks
+        made |= missing == 0
+        # A straight missing exactly one rank is drawn to by that rank
+        outs |= np.where(POPCOUNT[missing] == 1, missing, 0)
+    outs[made] = 0
+    return made, outs.astype(np.uint16)
+
+# HAS_STRAIGHT[mask]: the ranks contain a straight; STRAIGHT_OUT_RANKS[mask]: ranks that would complete one
+HAS_STRAIGHT, STRAIGHT_OUT_RANKS = _straight_tables()
+
+def _card_codes(cards):
+    codes = [parse_card(card) if isinstance(card, str) else int(card) for card in cards]
+    if INVALID_CARD in codes:
+        raise ValueError(f"Invalid card in {cards}")
+    return codes
+
+def rank_mask(codes):
+    """
+    Returns the 13-bit mask of the ranks present among the given card codes.
+    """
+    mask = 0
+    for code in codes:
+        mask |= 1 << (code // 4)
+    return mask
+
+def _ace_low_mask(mask):
+    # 14-bit mask with the ace at both ends: bit 0 = ace (low), bit 1 = deuce, ..., bit 13 = ace
+    return (mask << 1) | (mask >> 12 & 1)
+
+def draw_shape(present_ranks, out_ranks):
+    """
+    Classifies a straight draw by the straights its outs complete.
+
+    Args:
+        present_ranks (int): Rank mask of the known cards.
+        out_ranks (int): Rank mask of the cards that complete a straight.
+
+    Returns:
+        str or None: 'open-ended' (four in a row, open at both ends), 'double gutshot' (two
+            different one-gap straights), 'gutshot' (a single rank, including one-ended runs such
+            as J-Q-K-A), or None without outs.
+    """
+    count = int(POPCOUNT[out_ranks])
+    if count == 0:
+        return None
+    present, outs = _ace_low_mask(present_ranks), _ace_low_mask(out_ranks)
+    for low in range(1, 10):
+        if (present >> low) & 0b1111 == 0b1111 and outs >> (low - 1) & 1 and outs >> (low + 4) & 1:
+            return 'open-ended'
+    return 'gutshot' if count == 1 else 'double gutshot'
+
+def count_outs(hole_cards, community_cards):
+    """
+    Finds the exact unseen cards that give the hand a flush, a straight or a set.
+    Straight outs only count when the straight uses a hole card (a card completing a straight on
+    the board alone improves every hand). With a flush already made, only cards that make a
+    straight flush count as straight outs. A card that completes several draws counts once.
+
+    Args:
+        hole_cards (list): The player's two cards (e.g., ['9H', 'TH']).
+        community_cards (list): The flop or turn (3 or 4 cards).
+
+    Returns:
+        dict: 'outs' (number of improving cards), 'cards' (their codes), 'flush_draw' (bool),
+            'straight_draw' ('open-ended', 'double gutshot', 'gutshot' or None, see draw_shape) and
+            'set_outs' (int).
+    """
+    hole, board = _card_codes(hole_cards), _card_codes(community_cards)
+    known = np.zeros(NUM_CARDS, dtype=bool)
+    known[hole + board] = True
+    improving = np.zeros(NUM_CARDS, dtype=bool)
+
+    # Flush draw: four cards of a suit, at least one of them in the hand
+    suit_counts = np.bincount([code % 4 for code in hole + board], minlength=4)
+    hole_suits = {code % 4 for code in hole}
+    flush_suits = [suit for suit in range(4) if suit_counts[suit] == 4 and suit in hole_suits]
+    for suit in flush_suits:
+        improving[suit::4] = True
+
+    # Straight draw: ranks that complete a straight with our cards but not with the board alone.
+    # A plain straight does not beat a made flush, so then only straight-flush cards count.
+    made_flush = [suit for suit in range(4) if suit_counts[suit] >= 5]
+    straight_suits = made_flush or range(4)
+    cards = [code for code in hole + board if not made_flush or code % 4 == made_flush[0]]
+    board_cards = [code for code in board if not made_flush or code % 4 == made_flush[0]]
+    out_ranks = int(STRAIGHT_OUT_RANKS[rank_mask(cards)]) & ~int(STRAIGHT_OUT_RANKS[rank_mask(board_cards)])
+    if HAS_STRAIGHT[rank_mask(board_cards)]:
+        out_ranks = 0
+    for rank in range(13):
+        if out_ranks >> rank & 1:
+            for suit in straight_suits:
+                improving[rank * 4 + suit] = True
+    straight_draw = draw_shape(rank_mask(cards), out_ranks)
+
+    # Set mining: an unimproved pocket pair hits a set with either remaining card of its rank
+    set_outs = 0
+    if hole[0] // 4 == hole[1] // 4 and all(code // 4 != hole[0] // 4 for code in board):
+        rank = hole[0] // 4
+        improving[rank * 4:rank * 4 + 4] = True
+        set_outs = 2
+
+    improving &= ~known
+    cards = np.flatnonzero(improving)
+    return {
+        'outs': len(cards),
+        'cards': cards.tolist(),
+        'flush_draw': bool(flush_suits),
+        'straight_draw': straight_draw,
+        'set_outs': set_outs
+    }
+
+def hit_probability(outs, cards_to_come, unseen_cards=None):
+    """
+    Probability of hitting at least one out in the remaining cards.
+
+    Args:
+        outs (int or array-like): Number of outs.
+        cards_to_come (int): Cards still to be dealt (2 on the flop, 1 on the turn).
+        unseen_cards (int, optional): Number of unseen cards. Defaults to 47 on the flop and 46 on the turn.
+
+    Returns:
+        float or np.ndarray: The probability of improving.
+    """
+    if unseen_cards is None:
+        unseen_cards = 45 + cards_to_come
+    outs = np.asarray(outs)
+    misses = np.vectorize(lambda count: comb(unseen_cards - int(count), cards_to_come))(outs)
+    probability = 1.0 - misses / comb(unseen_cards, cards_to_come)
+    return float(probability) if probability.ndim == 0 else probability
+
+def hand_potential(hole_cards, community_cards, num_samples=500, rng=None):
+    """
+    Estimates the hand potential against a random opponent hand.
+    PPot is the chance of being behind now and ahead at the river, NPot the chance of being ahead
+    now and behind at the river, and the effective hand strength EHS = HS * (1 - NPot) + (1 - HS) * PPot.
+
+    Args:
+        hole_cards (list): The player's two cards.
+        community_cards (list): The flop or turn.
+        num_samples (int): Number of sampled opponent hands and runouts.
+        rng (np.random.Generator, optional): Random generator used for sampling.
+
+    Returns:
+        dict: 'hand_strength', 'ppot', 'npot' and 'ehs'.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    hole, board = _card_codes(hole_cards), _card_codes(community_cards)
+    deck = np.setdiff1d(np.arange(NUM_CARDS), hole + board)
+    missing = 5 - len(board)
+    ours_now = showdown_strength(hole, board)
+
+    # Counts indexed by [status now][status at the river] with 0 = ahead, 1 = tied, 2 = behind
+    counts = np.zeros((3, 3))
+    for _ in range(num_samples):
+        cards = rng.choice(deck, size=2 + missing, replace=False).tolist()
+        opponent, runout = cards[:2], board + cards[2:]
+        theirs_now = showdown_strength(opponent, board)
+        now = 0 if ours_now > theirs_now else 1 if ours_now == theirs_now else 2
+        ours_final, theirs_final = showdown_strength(hole, runout), showdown_strength(opponent, runout)
+        final = 0 if ours_final > theirs_final else 1 if ours_final == theirs_final else 2
+        counts[now, final] += 1
+
+    totals = counts.sum(axis=1)
+    hand_strength = (totals[0] + totals[1] / 2) / num_samples
+    behind_or_tied = totals[2] + totals[1] / 2
+    ahead_or_tied = totals[0] + totals[1] / 2
+    ppot = (counts[2, 0] + counts[2, 1] / 2 + counts[1, 0] / 2) / behind_or_tied if behind_or_tied else 0.0
+    npot = (counts[0, 2] + counts[0, 1] / 2 + counts[1, 2] / 2) / ahead_or_tied if ahead_or_tied else 0.0
+    return {
+        'hand_strength': hand_strength,
+        'ppot': ppot,
+        'npot': npot,
+        'ehs': hand_strength * (1 - npot) + (1 - hand_strength) * ppot
+    }
+
+if __name__ == "__main__":
+    # Example usage: open-ended straight flush draw on the flop
+    draw = count_outs(['9H', 'TH'], ['8H', 'JC', '2H'])
+    print(f"Outs: {draw['outs']} (flush draw: {draw['flush_draw']}, straight draw: {draw['straight_draw']})")
+    print(f"Chance to hit by the river: {hit_probability(draw['outs'], 2):.2%}")
+    print(f"Hand potential: {hand_potential(['9H', 'TH'], ['8H', 'JC', '2H'], num_samples=300)}")
@@ -1,6 +1,11 @@
 # hand_evaluation.py
 
-from itertools import combinations
+"""
+Poker hand evaluation.
+Each hand is analyzed once: a single pass over the cards builds a rank histogram and a per-suit
+rank bitmask, and every category (with its kickers) is derived from them. rank_key() returns a
+tuple that orders hands exactly as at showdown, so two hands can be compared with < and ==.
+"""
 
 # Define standard poker hand rankings
 HAND_RANKINGS = {
@@ -15,163 +20,298 @@ HAND_RANKINGS = {
     "Straight Flush": 9,
     "Royal Flush": 10
 }
+HAND_TYPES = {value: hand_type for hand_type, value in HAND_RANKINGS.items()}
+
+ACE = 14
+# Five consecutive rank bits, shifted to each straight's lowest rank
+STRAIGHT_BITS = 0b11111
 
 def evaluate_hand(player_hand, community_cards):
     """
     Evaluates the strength of the AI's hand after the flop.
-    
+
     Args:
         player_hand (list): A list of two cards held by the player (e.g., ['9H', 'KD']).
         community_cards (list): A list of five community cards on the board (e.g., ['3H', '4S', '5D', '8H', 'KH']).
-        
+
+    Returns:
+        dict: A dictionary containing the best hand type, value, the combination of cards used
+            (up to five cards, strongest first) and the comparable rank key.
+    """
+    all_cards = list(player_hand) + list(community_cards)
+    values, suits = _parse(all_cards)
+    key = rank_key(values, suits)
+    return {
+        "type": HAND_TYPES[key[0]],
+        "value": key[0],
+        "cards": _combination(all_cards, values, suits, key),
+        "rank": key
+    }
+
+def hand_rank(cards):
+    """
+    Returns the comparable rank key of the best five-card hand among the given cards.
+    """
+    return rank_key(*_parse(cards))
+
+def card_value(card):
+    """
+    Converts card rank into numerical values. E.g., A -> 14, K -> 13, Q -> 12, J -> 11, T -> 10.
+
+    Args:
+        card (str): The rank of the card as a string.
+
     Returns:
-        dict: A dictionary containing the best hand type, value, and the combination of cards used.
-    """
-    all_cards = player_hand + community_cards
-    best_hand = {"type": "High Card", "value": HAND_RANKINGS["High Card"], "cards": []}
-
-    # Check for different hand combinations
-    if is_royal_flush(all_cards):
-        best_hand = {"type": "Royal Flush", "value": HAND_RANKINGS["Royal Flush"], "cards": all_cards}
-    elif is_straight_flush(all_cards):
-        best_hand = {"type": "Straight Flush", "value": HAND_RANKINGS["Straight Flush"], "cards": all_cards}
-    elif is_four_of_a_kind(all_cards):
-        best_hand = {"type": "Four of a Kind", "value": HAND_RANKINGS["Four of a Kind"], "cards": get_hand(all_cards, 4)}
-    elif is_full_house(all_cards):
-        best_hand = {"type": "Full House", "value": HAND_RANKINGS["Full House"], "cards": get_hand(all_cards, 3, 2)}
-    elif is_flush(all_cards):
-        best_hand = {"type": "Flush", "value": HAND_RANKINGS["Flush"], "cards": get_flush_cards(all_cards)}
-    elif is_straight(all_cards):
-        best_hand = {"type": "Straight", "value": HAND_RANKINGS["Straight"], "cards": get_straight(all_cards)}
-    elif is_three_of_a_kind(all_cards):
-        best_hand = {"type": "Three of a Kind", "value": HAND_RANKINGS["Three of a Kind"], "cards": get_hand(all_cards, 3)}
-    elif is_two_pair(all_cards):
-        best_hand = {"type": "Two Pair", "value": HAND_RANKINGS["Two Pair"], "cards": get_two_pair(all_cards)}
-    elif is_pair(all_cards):
-        best_hand = {"type": "One Pair", "value": HAND_RANKINGS["One Pair"], "cards": get_hand(all_cards, 2)}
-
-    return best_hand
+        int: The numerical value of the card rank.
+    """
+    rank = card.upper()
+    if rank == 'A':
+        return 14
+    elif rank == 'K':
+        return 13
+    elif rank == 'Q':
+        return 12
+    elif rank == 'J':
+        return 11
+    elif rank == 'T':
+        return 10
+    else:
+        return int(rank)
+
+def _parse(cards):
+    return [card_value(card[:-1]) for card in cards], [card[-1].upper() for card in cards]
+
+def _straight_high(mask):
+    """
+    Returns the highest card of the best straight in a rank bitmask (bit v set for rank value v), or 0.
+    """
+    if mask >> ACE & 1:
+        mask |= 1 << 1  # The ace also plays low in the wheel
+    for high in range(ACE, 4, -1):
+        if (mask >> (high - 4)) & STRAIGHT_BITS == STRAIGHT_BITS:
+            return high
+    return 0
+
+def _analyze(values, suits):
+    # Single pass: rank histogram, per-suit rank masks and suit counts
+    counts = [0] * (ACE + 1)
+    suit_masks, suit_counts = {}, {}
+    for value, suit in zip(values, suits):
+        counts[value] += 1
+        suit_masks[suit] = suit_masks.get(suit, 0) | 1 << value
+        suit_counts[suit] = suit_counts.get(suit, 0) + 1
+    return counts, suit_masks, suit_counts
+
+def rank_key(values, suits):
+    """
+    Ranks the best five-card hand among any number of cards.
+
+    Args:
+        values (list): Rank value of each card (2-14, ace high).
+        suits (list): Suit of each card (any hashable label, one per card).
+
+    Returns:
+        tuple: (category value, tie-breaking ranks...). Keys compare like the hands at showdown.
+    """
+    counts, suit_masks, suit_counts = _analyze(values, suits)
+
+    flush_mask = 0
+    for suit, count in suit_counts.items():
+        if count >= 5:
+            flush_mask = suit_masks[suit]
+            high = _straight_high(flush_mask)
+            if high:
+                return (HAND_RANKINGS["Royal Flush"] if high == ACE else HAND_RANKINGS["Straight Flush"], high)
+
+    # Ranks grouped by multiplicity, highest first
+    quads, trips, pairs, singles = [], [], [], []
+    groups = {4: quads, 3: trips, 2: pairs, 1: singles}
+    for value in range(ACE, 1, -1):
+        if counts[value]:
+            groups[min(counts[value], 4)].append(value)
+
+    if quads:
+        kickers = sorted(trips + pairs + singles + quads[1:], reverse=True)
+        return (HAND_RANKINGS["Four of a Kind"], quads[0]) + tuple(kickers[:1])
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return (HAND_RANKINGS["Full House"], trips[0], pair)
+    if flush_mask:
+        flush = [value for value in range(ACE, 1, -1) if flush_mask >> value & 1]
+        return (HAND_RANKINGS["Flush"],) + tuple(flush[:5])
+    high = _straight_high(sum(1 << value for value in range(2, ACE + 1) if counts[value]))
+    if high:
+        return (HAND_RANKINGS["Straight"], high)
+    if trips:
+        return (HAND_RANKINGS["Three of a Kind"], trips[0]) + tuple(singles[:2])
+    if len(pairs) >= 2:
+        kickers = sorted(pairs[2:] + singles, reverse=True)
+        return (HAND_RANKINGS["Two Pair"], pairs[0], pairs[1]) + tuple(kickers[:1])
+    if pairs:
+        return (HAND_RANKINGS["One Pair"], pairs[0]) + tuple(singles[:3])
+    return (HAND_RANKINGS["High Card"],) + tuple(singles[:5])
+
+def _combination(cards, values, suits, key):
+    # The actual cards of the hand described by a rank key, strongest first
+    category = key[0]
+    if category >= HAND_RANKINGS["Straight Flush"] or category == HAND_RANKINGS["Flush"]:
+        flush_suit = max(set(suits), key=suits.count)
+        ranks = _straight_ranks(key[1]) if category != HAND_RANKINGS["Flush"] else key[1:]
+        return [_take(cards, values, suits, value, 1, flush_suit)[0] for value in ranks]
+    if category == HAND_RANKINGS["Straight"]:
+        return [_take(cards, values, suits, value, 1)[0] for value in _straight_ranks(key[1])]
+
+    # Grouped hands: the key lists each rank once, with the group size implied by the category
+    sizes = {
+        HAND_RANKINGS["Four of a Kind"]: (4, 1),
+        HAND_RANKINGS["Full House"]: (3, 2),
+        HAND_RANKINGS["Three of a Kind"]: (3, 1, 1),
+        HAND_RANKINGS["Two Pair"]: (2, 2, 1),
+        HAND_RANKINGS["One Pair"]: (2, 1, 1, 1),
+    }.get(category, (1, 1, 1, 1, 1))
+    combination = []
+    for value, size in zip(key[1:], sizes):
+        combination += _take(cards, values, suits, value, size)
+    return combination
+
+def _straight_ranks(high):
+    return [ACE if value == 1 else value for value in range(high, high - 5, -1)]
+
+def _take(cards, values, suits, value, count, suit=None):
+    return [
+        card for card, card_rank, card_suit in zip(cards, values, suits)
+        if card_rank == value and (suit is None or card_suit == suit)
+    ][:count]
 
 def is_flush(cards):
     """
     Checks if the hand is a flush (5 cards of the same suit).
-    
+
     Args:
         cards (list): List of cards in the hand.
-        
+
     Returns:
         bool: True if the hand is a flush, False otherwise.
     """
-    suits = [card[-1] for card in cards]
-    return max(suits.count(suit) for suit in set(suits)) >= 5
+    _, _, suit_counts = _analyze(*_parse(cards))
+    return max(suit_counts.values(), default=0) >= 5
 
 def is_straight(cards):
     """
-    Checks if the hand is a straight (5 cards in sequence).
-    
+    Checks if the hand is a straight (5 cards in sequence, including the A-2-3-4-5 wheel).
+
     Args:
         cards (list): List of cards in the hand.
-        
+
     Returns:
         bool: True if the hand is a straight, False otherwise.
     """
-    ranks = sorted([card_value(card[:-1]) for card in cards])
-    return any(all(ranks[i + j] == ranks[i] + j for j in range(5)) for i in range(len(ranks) - 4))
+    _, suit_masks, _ = _analyze(*_parse(cards))
+    mask = 0
+    for suit_mask in suit_masks.values():
+        mask |= suit_mask
+    return _straight_high(mask) > 0
 
 def is_straight_flush(cards):
     """
     Checks if the hand is a straight flush (5 consecutive cards of the same suit).
-    
+
     Args:
         cards (list): List of cards in the hand.
-        
+
     Returns:
         bool: True if the hand is a straight flush, False otherwise.
     """
-    return is_flush(cards) and is_straight(cards)
+    _, suit_masks, _ = _analyze(*_parse(cards))
+    return any(_straight_high(mask) for mask in suit_masks.values())
 
 def is_royal_flush(cards):
     """
     Checks if the hand is a royal flush (10, J, Q, K, A of the same suit).
-    
+
     Args:
         cards (list): List of cards in the hand.
-        
+
     Returns:
         bool: True if the hand is a royal flush, False otherwise.
     """
-    return is_straight_flush(cards) and set(card_value(card[:-1]) for card in cards) == {10, 11, 12, 13, 14}
+    _, suit_masks, _ = _analyze(*_parse(cards))
+    return any(_straight_high(mask) == ACE for mask in suit_masks.values())
 
 def is_four_of_a_kind(cards):
     return has_same_rank(cards, 4)
 
 def is_full_house(cards):
-    return has_same_rank(cards, 3) and has_same_rank(cards, 2)
+    counts = sorted(_analyze(*_parse(cards))[0], reverse=True)
+    return counts[0] >= 3 and counts[1] >= 2
 
 def is_three_of_a_kind(cards):
     return has_same_rank(cards, 3)
 
 def is_two_pair(cards):
-    return len([rank for rank in set(card_value(card[:-1]) for card in cards) if cards.count(rank) == 2]) >= 2
+    counts = _analyze(*_parse(cards))[0]
+    return sum(count >= 2 for count in counts) >= 2
 
 def is_pair(cards):
     return has_same_rank(cards, 2)
 
 def has_same_rank(cards, count):
-    ranks = [card_value(card[:-1]) for card in cards]
-    return any(ranks.count(rank) == count for rank in set(ranks))
+    """
+    Checks if at least `count` cards share a rank.
+    """
+    return max(_analyze(*_parse(cards))[0]) >= count
 
 def get_hand(cards, primary_count, secondary_count=None):
     """
-    Returns the cards that form the best combination for a hand, such as a Full House or Four of a Kind.
+    Returns the cards that form the best combination for a hand, such as a Full House or Four of a Kind:
+    the highest rank held at least primary_count times and, if secondary_count is given, the highest
+    other rank held at least secondary_count times.
     """
-    ranks = sorted([card_value(card[:-1]) for card in cards], reverse=True)
+    values, suits = _parse(cards)
+    counts = _analyze(values, suits)[0]
+    primary = next((value for value in range(ACE, 1, -1) if counts[value] >= primary_count), None)
+    if primary is None:
+        return []
+    combination = _take(cards, values, suits, primary, primary_count)
     if secondary_count:
-        return ranks[:primary_count] + ranks[-secondary_count:]
-    return ranks[:primary_count]
+        secondary = next((value for value in range(ACE, 1, -1)
+                          if value != primary and counts[value] >= secondary_count), None)
+        if secondary is not None:
+            combination += _take(cards, values, suits, secondary, secondary_count)
+    return combination
 
-def card_value(card):
+def get_two_pair(cards):
     """
-    Converts card rank into numerical values. E.g., A -> 14, K -> 13, Q -> 12, J -> 11.
-    
-    Args:
-        card (str): The rank of the card as a string.
-        
-    Returns:
-        int: The numerical value of the card rank.
+    Returns the cards of the two highest pairs.
     """
-    if card == 'A':
-        return 14
-    elif card == 'K':
-        return 13
-    elif card == 'Q':
-        return 12
-    elif card == 'J':
-        return 11
-    else:
-        return int(card)
+    values, suits = _parse(cards)
+    counts = _analyze(values, suits)[0]
+    pairs = [value for value in range(ACE, 1, -1) if counts[value] >= 2][:2]
+    return [card for value in pairs for card in _take(cards, values, suits, value, 2)]
 
 def get_flush_cards(cards):
     """
-    Returns the cards that form a flush.
+    Returns the five highest cards of the flush suit.
     """
-    suits = [card[-1] for card in cards]
+    values, suits = _parse(cards)
     flush_suit = max(set(suits), key=suits.count)
-    return [card for card in cards if card[-1] == flush_suit]
+    flush = sorted((card for card, suit in zip(cards, suits) if suit == flush_suit),
+                   key=lambda card: card_value(card[:-1]), reverse=True)
+    return flush[:5]
 
 def get_straight(cards):
     """
-    Returns the cards that form a straight.
+    Returns the cards that form the highest straight, or None.
     """
-    ranks = sorted([card_value(card[:-1]) for card in cards])
-    for i in range(len(ranks) - 4):
-        if all(ranks[i + j] == ranks[i] + j for j in range(5)):
-            return ranks[i:i + 5]
-    return None
+    values, suits = _parse(cards)
+    high = _straight_high(sum(1 << value for value in set(values)))
+    if not high:
+        return None
+    return [_take(cards, values, suits, value, 1)[0] for value in _straight_ranks(high)]
 
 if __name__ == "__main__":
     # Example usage:
     player_hand = ['9H', 'KD']
     community_cards = ['3H', '4S', '5D', '8H', 'KH']
     result = evaluate_hand(player_hand, community_cards)
-    print(f"Best hand: {result['type']}, Cards: {result['cards']}")
+    print(f"Best hand: {result['type']}, Cards: {result['cards']}, Rank: {result['rank']}")
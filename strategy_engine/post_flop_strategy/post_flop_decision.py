@@ -0,0 +1,190 @@
+# post_flop_decision.py
+
+"""
+Post-flop decision logic for PokerAI.
+make_post_flop_decision reads decisions from a precomputed strategy table (see
+strategy_engine/solver/strategy_table.py) when one is supplied and contains the spot; otherwise the
+pot-odds rules decide. PostFlopEngine estimates equity against the opponent's modeled range once per
+street, caches it by (hole cards, board, opponent), and scores every decision on that street from
+the cached equity with the pot-odds and EV functions.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from strategy_engine.card_encoding import COMBOS, INVALID_CARD, NUM_CARDS, NUM_COMBOS, blocked_combos, parse_card
+from strategy_engine.post_flop_strategy.pot_odds_calculator import bet_ev_array, call_ev_array, should_call
+from strategy_engine.solver.card_abstraction import NUM_PREFLOP_BUCKETS, showdown_strength
+from strategy_engine.solver.strategy_table import action_decision, card_infoset_key
+
+# Hand equity (in percent) above which the rules bet when not facing a bet
+VALUE_BET_EQUITY = 60.0
+
+def make_post_flop_decision(hole_cards, community_cards, pot_size, bet_to_call, hand_equity,
+                            strategy_table=None, history='', player=1):
+    """
+    Determines the action to take on the flop, turn or river.
+
+    Args:
+        hole_cards (list): The player's two cards (e.g., ['AS', 'KD']).
+        community_cards (list): The visible community cards (3 to 5 cards).
+        pot_size (float): The size of the pot.
+        bet_to_call (float): The amount needed to call (0 if the player is not facing a bet).
+        hand_equity (float): The estimated probability (in percentage) of winning the hand.
+        strategy_table (StrategyTable, optional): Precomputed strategy to read the decision from.
+        history (str): The betting history of the hand in the strategy table's action characters.
+        player (int): The player's seat in the table's heads-up game (0 = button, 1 = big blind).
+
+    Returns:
+        str: The recommended action ('fold', 'check', 'call' or 'raise').
+    """
+    if strategy_table is not None:
+        num_buckets = strategy_table.metadata.get('num_preflop_buckets', NUM_PREFLOP_BUCKETS)
+        key = card_infoset_key(player, hole_cards, community_cards, history, num_buckets)
+        action = strategy_table.best_action(key)
+        if action is not None:
+            return action_decision(action, bet_to_call > 0)
+
+    if bet_to_call <= 0:
+        return 'raise' if hand_equity >= VALUE_BET_EQUITY else 'check'
+    return 'call' if should_call(pot_size, bet_to_call, hand_equity) else 'fold'
+
+def _card_codes(cards):
+    codes = tuple(parse_card(card) if isinstance(card, str) else int(card) for card in cards)
+    if INVALID_CARD in codes:
+        raise ValueError(f"Invalid card in {cards}")
+    return codes
+
+
+class PostFlopEngine:
+    """
+    Post-flop decisions from range equity, pot odds and opponent profiles, with equity cached per street.
+    """
+
+    def __init__(self, profiler=None, num_samples=400, cache_size=1024, bet_fraction=0.5,
+                 raise_equity=0.75, strategy_table=None, seed=None):
+        """
+        Args:
+            profiler (OpponentProfiler, optional): Source of opponent ranges and fold tendencies.
+                Without it opponents are assumed to hold any two cards.
+            num_samples (int): Monte Carlo samples per equity estimate.
+            cache_size (int): Maximum number of cached equities.
+            bet_fraction (float): Bet size, as a fraction of the pot, used to score betting.
+            raise_equity (float): Equity (0-1) above which a bet is raised rather than called.
+            strategy_table (StrategyTable, optional): Precomputed strategy consulted before the equity rules.
+            seed (int, optional): Seed of the Monte Carlo sampler.
+        """
+        self.profiler = profiler
+        self.num_samples = num_samples
+        self.cache_size = cache_size
+        self.bet_fraction = bet_fraction
+        self.raise_equity = raise_equity
+        self.strategy_table = strategy_table
+        self.rng = np.random.default_rng(seed)
+        self._equity_cache = OrderedDict()
+
+    def opponent_range(self, hole, board, opponent_id=None, opponent_history=()):
+        """
+        Returns the opponent's combo weights with our cards and the board removed (the profiler's
+        range model blocks the board itself).
+        """
+        if self.profiler is not None and opponent_id is not None:
+            return self.profiler.get_opponent_range(opponent_id, opponent_history, board, dead_cards=hole)
+        weights = np.where(blocked_combos(hole + board), 0.0, 1.0)
+        return weights / weights.sum()
+
+    def equity(self, hole_cards, community_cards, opponent_id=None, opponent_history=()):
+        """
+        Returns the probability (0-1) of winning at showdown against the opponent's range, counting
+        ties as half. The estimate is computed at the first request of a street and cached by
+        (hole cards, board, opponent); later decisions on the same street reuse it.
+
+        Args:
+            hole_cards (list): The player's two cards.
+            community_cards (list): The visible community cards (3 to 5 cards).
+            opponent_id (str, optional): The opponent whose range is used.
+            opponent_history (list): The opponent's (street, action) pairs, used for the range at the first request.
+
+        Returns:
+            float: The estimated equity.
+        """
+        hole, board = _card_codes(hole_cards), _card_codes(community_cards)
+        key = (tuple(sorted(hole)), tuple(sorted(board)), opponent_id)
+        cached = self._equity_cache.get(key)
+        if cached is not None:
+            self._equity_cache.move_to_end(key)
+            return cached
+
+        equity = self._simulate(hole, board, self.opponent_range(hole, board, opponent_id, opponent_history))
+        self._equity_cache[key] = equity
+        if len(self._equity_cache) > self.cache_size:
+            self._equity_cache.popitem(last=False)
+        return equity
+
+    def _simulate(self, hole, board, weights):
+        if weights.sum() <= 0:
+            weights = np.where(blocked_combos(hole + board), 0.0, 1.0)
+        combos = COMBOS[self.rng.choice(NUM_COMBOS, size=self.num_samples, p=weights / weights.sum())]
+        missing = 5 - len(board)
+        live = np.ones(NUM_CARDS, dtype=bool)
+        live[list(hole + board)] = False
+
+        score = 0.0
+        for opponent in combos.tolist():
+            deck = live.copy()
+            deck[opponent] = False
+            runout = board + tuple(self.rng.choice(np.flatnonzero(deck), size=missing, replace=False).tolist())
+            ours = showdown_strength(list(hole), list(runout))
+            theirs = showdown_strength(opponent, list(runout))
+            score += 1.0 if ours > theirs else 0.5 if ours == theirs else 0.0
+        return score / self.num_samples
+
+    def decide(self, hole_cards, community_cards, pot_size, bet_to_call, opponent_id=None,
+               opponent_history=(), history='', player=1):
+        """
+        Determines the action to take on the flop, turn or river.
+        Facing a bet, the hand calls when calling has positive EV (equity beats the pot odds) and
+        raises with equity above raise_equity. Otherwise it bets when the EV of a bet, including the
+        opponent's fold-to-bet tendency, beats the EV of checking.
+
+        Args:
+            hole_cards (list): The player's two cards.
+            community_cards (list): The visible community cards.
+            pot_size (float): The size of the pot (including any bet to call).
+            bet_to_call (float): The amount needed to call (0 if not facing a bet).
+            opponent_id (str, optional): The main opponent in the hand.
+            opponent_history (list): The opponent's (street, action) pairs in this hand.
+            history (str): The betting history in strategy table action characters.
+            player (int): The player's seat in the strategy table's heads-up game.
+
+        Returns:
+            str: The recommended action ('fold', 'check', 'call' or 'raise').
+        """
+        if self.strategy_table is not None:
+            num_buckets = self.strategy_table.metadata.get('num_preflop_buckets', NUM_PREFLOP_BUCKETS)
+            action = self.strategy_table.best_action(card_infoset_key(player, hole_cards, community_cards, history, num_buckets))
+            if action is not None:
+                return action_decision(action, bet_to_call > 0)
+
+        equity = self.equity(hole_cards, community_cards, opponent_id, opponent_history)
+        if bet_to_call > 0:
+            if equity >= self.raise_equity:
+                return 'raise'
+            return 'call' if call_ev_array(pot_size, bet_to_call, equity * 100) > 0 else 'fold'
+
+        fold_probability = 0.0
+        if self.profiler is not None and opponent_id is not None:
+            profile = self.profiler.store.get(opponent_id)
+            fold_probability = profile.fold_to_bet * 100 if profile is not None else 0.0
+        bet_ev = bet_ev_array(pot_size, self.bet_fraction * pot_size, equity * 100, fold_probability)
+        check_ev = call_ev_array(pot_size, 0.0, equity * 100)
+        return 'raise' if bet_ev > check_ev else 'check'
+
+if __name__ == "__main__":
+    # Example usage: no strategy table, so the pot-odds rules decide
+    decision = make_post_flop_decision(['AS', 'KD'], ['2H', '7C', 'KH'], pot_size=100.0, bet_to_call=25.0, hand_equity=45.0)
+    print(f"Post-flop decision: {decision}")
+
+    # The engine estimates equity once for the flop and reuses it for both decisions
+    engine = PostFlopEngine(num_samples=200, seed=0)
+    print(f"Engine decision: {engine.decide(['AS', 'KD'], ['2H', '7C', 'KH'], pot_size=100.0, bet_to_call=0.0)}")
+    print(f"Facing a raise: {engine.decide(['AS', 'KD'], ['2H', '7C', 'KH'], pot_size=200.0, bet_to_call=50.0)}")
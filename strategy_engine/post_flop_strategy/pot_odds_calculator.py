@@ -1,5 +1,7 @@
 # pot_odds_calculator.py
 
+import numpy as np
+
 def calculate_pot_odds(pot_size, bet_to_call):
     """
     Calculates the pot odds, which determine whether calling a bet is mathematically profitable.
@@ -50,6 +52,106 @@ def calculate_implied_odds(pot_size, bet_to_call, future_bet_estimate):
     implied_odds = bet_to_call / (total_pot_with_future_bets + bet_to_call)
     return implied_odds * 100  # Return as a percentage
 
+def _spot_arrays(*values):
+    return np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in values))
+
+def pot_odds_array(pot_sizes, bets_to_call):
+    """
+    Vectorized calculate_pot_odds. Spots without a bet to call (checks) are masked instead of raising.
+
+    Args:
+        pot_sizes (array-like): Pot sizes before each bet.
+        bets_to_call (array-like): Amounts to call.
+
+    Returns:
+        np.ma.MaskedArray: Pot odds percentages, masked where the bet to call is zero.
+    """
+    pot_sizes, bets_to_call = _spot_arrays(pot_sizes, bets_to_call)
+    checks = bets_to_call <= 0
+    total = np.where(checks, 1.0, pot_sizes + bets_to_call)
+    return np.ma.masked_array(bets_to_call / total * 100, mask=checks)
+
+def implied_odds_array(pot_sizes, bets_to_call, future_bet_estimates):
+    """
+    Vectorized calculate_implied_odds. Spots without a bet to call are masked.
+
+    Args:
+        pot_sizes (array-like): Current pot sizes.
+        bets_to_call (array-like): Amounts to call.
+        future_bet_estimates (array-like): Additional amounts expected to be won on improving.
+
+    Returns:
+        np.ma.MaskedArray: Implied odds percentages, masked where the bet to call is zero.
+    """
+    pot_sizes, bets_to_call, future_bet_estimates = _spot_arrays(pot_sizes, bets_to_call, future_bet_estimates)
+    return pot_odds_array(pot_sizes + future_bet_estimates, bets_to_call)
+
+def should_call_array(pot_sizes, bets_to_call, hand_equities):
+    """
+    Vectorized should_call. Checking is free, so spots without a bet to call are always True.
+
+    Args:
+        pot_sizes (array-like): Pot sizes.
+        bets_to_call (array-like): Amounts to call.
+        hand_equities (array-like): Probabilities (in percentage) of winning the hand.
+
+    Returns:
+        np.ndarray: Boolean call decision of each spot.
+    """
+    pot_odds = pot_odds_array(pot_sizes, bets_to_call)
+    hand_equities = np.broadcast_to(np.asarray(hand_equities, dtype=np.float64), pot_odds.shape)
+    return (hand_equities >= pot_odds).filled(True)
+
+def call_ev_array(pot_sizes, bets_to_call, hand_equities):
+    """
+    Expected value of calling: equity * pot - (1 - equity) * bet. For checks this is the share of
+    the pot the hand is expected to win.
+
+    Args:
+        pot_sizes (array-like): Pot sizes, including the bet to call.
+        bets_to_call (array-like): Amounts to call.
+        hand_equities (array-like): Probabilities (in percentage) of winning the hand.
+
+    Returns:
+        np.ndarray: Expected value of each call, in chips.
+    """
+    pot_sizes, bets_to_call, hand_equities = _spot_arrays(pot_sizes, bets_to_call, hand_equities)
+    equity = hand_equities / 100
+    return equity * pot_sizes - (1 - equity) * np.maximum(bets_to_call, 0)
+
+def fold_equity_array(pot_sizes, fold_probabilities):
+    """
+    Fold equity of a bet: the chips won outright when the opponent folds.
+
+    Args:
+        pot_sizes (array-like): Pot sizes before the bet.
+        fold_probabilities (array-like): Probabilities (in percentage) that the opponent folds.
+
+    Returns:
+        np.ndarray: Fold equity of each spot, in chips.
+    """
+    pot_sizes, fold_probabilities = _spot_arrays(pot_sizes, fold_probabilities)
+    return fold_probabilities / 100 * pot_sizes
+
+def bet_ev_array(pot_sizes, bet_sizes, hand_equities, fold_probabilities):
+    """
+    Expected value of betting: fold equity plus the value of being called,
+    fold * pot + (1 - fold) * (equity * (pot + 2 * bet) - bet).
+
+    Args:
+        pot_sizes (array-like): Pot sizes before the bet.
+        bet_sizes (array-like): Sizes of the bets.
+        hand_equities (array-like): Probabilities (in percentage) of winning when called.
+        fold_probabilities (array-like): Probabilities (in percentage) that the opponent folds.
+
+    Returns:
+        np.ndarray: Expected value of each bet, in chips.
+    """
+    pot_sizes, bet_sizes, hand_equities, fold_probabilities = _spot_arrays(pot_sizes, bet_sizes, hand_equities, fold_probabilities)
+    folds = fold_probabilities / 100
+    called = hand_equities / 100 * (pot_sizes + 2 * bet_sizes) - bet_sizes
+    return folds * pot_sizes + (1 - folds) * called
+
 # Example usage:
 if __name__ == "__main__":
     # Scenario: pot size is $100, opponent bets $25, and the AI estimates a 35% chance of winning the hand
@@ -69,3 +171,10 @@ if __name__ == "__main__":
     future_bet_estimate = 50.0
     implied_odds = calculate_implied_odds(pot_size, bet_to_call, future_bet_estimate)
     print(f"Implied Odds: {implied_odds:.2f}%")
+
+    # Batch scoring: the second spot is a check, so its pot odds are masked
+    pots = np.array([100.0, 80.0, 200.0])
+    bets = np.array([25.0, 0.0, 150.0])
+    equities = np.array([35.0, 50.0, 30.0])
+    print(f"Pot odds: {pot_odds_array(pots, bets)}")
+    print(f"Call EV: {call_ev_array(pots, bets, equities)}")
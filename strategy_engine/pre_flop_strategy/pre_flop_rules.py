@@ -5,20 +5,34 @@
 Pre-flop strategy engine for PokerAI.
 This module determines the optimal action to take pre-flop based on hand strength, table position,
 and opponent profiling. The strategy can be adjusted based on the AI's learned experiences.
+When a precomputed strategy table (see strategy_engine/solver/strategy_table.py) is supplied,
+decisions are read from it; otherwise a preflop chart (see preflop_charts.py), when supplied,
+decides from the table size, seat, stack depth and action faced. The rules below only cover the
+remaining spots.
 """
 
+from strategy_engine.card_encoding import hand_class_id
+from strategy_engine.pre_flop_strategy.range_parser import class_value_table
+from strategy_engine.solver.card_abstraction import NUM_PREFLOP_BUCKETS, class_buckets
+from strategy_engine.solver.strategy_table import action_decision
+
 # Poker hand rankings for pre-flop decisions
 POKER_HAND_RANKINGS = {
     'AA': 10, 'KK': 9, 'QQ': 9, 'JJ': 8, 'AKs': 8, 'TT': 7, 'AQs': 7, 'AJs': 7, 'KQs': 7, 
     '99': 6, '88': 6, '77': 5, 'AK': 6, 'AQ': 5, 'AJs': 5, '66': 4, '55': 4, '44': 4,
     '33': 3, '22': 3, 'A2s-A5s': 4  # Example for suited aces
 }
+# The rankings compiled per hand class; keys are range notation, so 'AK' covers AKs and AKo
+# and a class in several ranges keeps its highest rating
+HAND_CLASS_RANKINGS = class_value_table(POKER_HAND_RANKINGS)
 
 # Poker position mapping
 POSITION_RANKINGS = {
     'early': -1,   # Tighten range for early position
     'middle': 0,   # Neutral
-    'late': 1      # Looser range in late position
+    'late': 1,     # Looser range in late position
+    # Seat names (see preflop_charts.SEAT_NAMES)
+    'UTG': -1, 'UTG+1': -1, 'UTG+2': -1, 'LJ': 0, 'HJ': 0, 'CO': 1, 'BTN': 1, 'SB': 0, 'BB': 0
 }
 
 # Opponent profiling adjustments (placeholders)
@@ -37,7 +51,8 @@ def evaluate_hand_strength(hand):
     Returns:
         int: A numerical rating of the hand's strength.
     """
-    return POKER_HAND_RANKINGS.get(hand, 0)
+    class_id = hand_class_id(hand)
+    return int(HAND_CLASS_RANKINGS[class_id]) if class_id >= 0 else 0
 
 def evaluate_position(position):
     """
@@ -61,7 +76,31 @@ def evaluate_opponent_profile(profile):
     """
     return OPPONENT_PROFILES.get(profile, 0)
 
-def make_pre_flop_decision(hand, position, opponent_profile, pot_odds):
+def table_pre_flop_decision(strategy_table, hand, position, history=''):
+    """
+    Looks up the pre-flop action in a precomputed strategy table.
+    The table's heads-up abstraction is mapped onto the table by treating late position as the
+    small blind / button and every other position as the big blind.
+
+    Args:
+        strategy_table (StrategyTable): The memory-mapped strategy table.
+        hand (str): The player's hand (e.g., 'AK', '77', 'JTs').
+        position (str): The player's position at the table ('early', 'middle', 'late').
+        history (str): The pre-flop betting so far in the table's action characters.
+
+    Returns:
+        str: The recommended action ('raise', 'call', 'fold'), or None if the table has no entry.
+    """
+    class_id = hand_class_id(hand)
+    if class_id < 0:
+        return None
+    num_buckets = strategy_table.metadata.get('num_preflop_buckets', NUM_PREFLOP_BUCKETS)
+    player = 0 if position == 'late' else 1
+    action = strategy_table.best_action(f"{player}:{int(class_buckets(class_id, num_buckets))}|{history}")
+    return action_decision(action) if action else None
+
+def make_pre_flop_decision(hand, position, opponent_profile, pot_odds, strategy_table=None, history='',
+                           chart=None, num_players=6, stack_bb=100.0, facing='unopened'):
     """
     Determines the optimal action to take pre-flop (raise, call, or fold).
     Args:
@@ -69,10 +108,23 @@ def make_pre_flop_decision(hand, position, opponent_profile, pot_odds):
         position (str): The player's position at the table ('early', 'middle', 'late').
         opponent_profile (str): The dominant opponent's play style ('aggressive', 'passive', 'neutral').
         pot_odds (float): The current pot odds ratio.
+        strategy_table (StrategyTable, optional): Precomputed strategy to read the decision from.
+        history (str): The pre-flop betting so far in the strategy table's action characters.
+        chart (PreflopChart, optional): Preflop chart to read the decision from.
+        num_players (int): Number of players dealt in, for the chart.
+        stack_bb (float): Effective stack in big blinds, for the chart.
+        facing (str): The action faced ('unopened', 'limped', 'raised', 're-raised'), for the chart.
 
     Returns:
         str: The recommended action ('raise', 'call', 'fold').
     """
+    if strategy_table is not None:
+        decision = table_pre_flop_decision(strategy_table, hand, position, history)
+        if decision is not None:
+            return decision
+    if chart is not None and hand_class_id(hand) >= 0:
+        return chart.decide(hand, num_players, position, stack_bb, facing)
+
     # Evaluate hand strength, position, and opponent profile
     hand_strength = evaluate_hand_strength(hand)
     position_adjustment = evaluate_position(position)
@@ -0,0 +1,252 @@
+# preflop_charts.py
+
+"""
+Position- and stack-aware preflop charts.
+A chart is one dense array of action frequencies indexed by
+    (number of players - 2, seat, effective stack bucket, action faced, hand class, action)
+with seats numbered in preflop acting order (0 = first to act, the big blind last), so a decision
+is a single array read and many spots are looked up at once with fancy indexing.
+
+The default chart opens a share of the strongest hands that shrinks with the number of players
+left to act, flats more with deeper stacks and defends wider from the big blind. Classes on the
+edge of a range get mixed frequencies, so every spot plays an exact share of combos. Individual
+spots can be overridden with range notation (see range_parser.py).
+"""
+
+from functools import lru_cache
+import numpy as np
+from strategy_engine.card_encoding import (
+    HAND_CLASS_COMBOS, HAND_CLASS_PERCENTILE, HAND_CLASS_STRENGTH, NUM_COMBOS, NUM_HAND_CLASSES, hand_class_id
+)
+from strategy_engine.pre_flop_strategy.range_parser import range_class_weights
+
+MIN_PLAYERS, MAX_PLAYERS = 2, 9
+ACTIONS = ('fold', 'call', 'raise')
+FACING = ('unopened', 'limped', 'raised', 're-raised')
+# Effective stack bucket edges in big blinds: <10, 10-20, 20-40, 40-100, 100+
+STACK_BUCKET_EDGES = np.array([10.0, 20.0, 40.0, 100.0])
+NUM_STACK_BUCKETS = len(STACK_BUCKET_EDGES) + 1
+
+# Seat names of a full ring in acting order; shorter tables drop seats from the front
+SEAT_NAMES = ('UTG', 'UTG+1', 'UTG+2', 'LJ', 'HJ', 'CO', 'BTN', 'SB', 'BB')
+# Legacy position names mapped to a share of the way through the acting order
+POSITION_SHARES = {'early': 0.0, 'middle': 0.5, 'late': 1.0}
+
+# Default chart parameters
+OPEN_SHARE = 0.6             # Opening share with one player left to act, divided by behind ** 0.75 otherwise
+LIMP_SHARE = 0.1             # Extra share the small blind completes (or over-limps) behind its raising range
+THREE_BET_SHARE = 0.05
+CALL_RAISE_SHARE = 0.08      # Share that flats a raise, before position and stack adjustments
+BIG_BLIND_DEFENSE = 0.3      # Share the big blind calls a single raise with
+FOUR_BET_SHARE = 0.025
+CALL_RE_RAISE_SHARE = 0.04
+# Multipliers per stack bucket: short stacks shove or fold, deep stacks flat more
+STACK_RAISE_FACTORS = np.array([1.1, 1.0, 1.0, 1.0, 0.95])
+STACK_CALL_FACTORS = np.array([0.0, 0.5, 0.8, 1.0, 1.2])
+
+def seat_names(num_players):
+    """
+    Returns the seat names of a table in preflop acting order.
+    """
+    _check_players(num_players)
+    return ('SB', 'BB') if num_players == 2 else SEAT_NAMES[-num_players:]
+
+def seat_index(position, num_players):
+    """
+    Converts a position into a seat index in acting order.
+
+    Args:
+        position (int or str): A seat index, a seat name ('UTG', 'CO', 'BTN', 'BB', ...) or
+            'early' / 'middle' / 'late' (first seat, middle seat, button). At short tables, where the
+            early seats are not dealt, 'UTG', 'UTG+1' and 'UTG+2' mean the first seat to act.
+        num_players (int): Number of players dealt in (2-9).
+
+    Returns:
+        int: The seat index.
+    """
+    names = seat_names(num_players)
+    if isinstance(position, str):
+        if position in POSITION_SHARES:
+            # The blinds act last preflop, so 'late' means the button (the small blind heads-up)
+            last_open_seat = max(len(names) - 3, 0)
+            return int(round(POSITION_SHARES[position] * last_open_seat))
+        if position.upper() in SEAT_NAMES[:3] and position.upper() not in names:
+            return 0
+        if position.upper() not in names:
+            raise ValueError(f"Unknown position '{position}' at a {num_players}-handed table")
+        return names.index(position.upper())
+    if not 0 <= position < num_players:
+        raise ValueError(f"Seat {position} does not exist at a {num_players}-handed table")
+    return int(position)
+
+def stack_buckets(stacks_bb):
+    """
+    Buckets effective stacks given in big blinds.
+    """
+    return np.searchsorted(STACK_BUCKET_EDGES, np.asarray(stacks_bb, dtype=np.float64), side='right')
+
+def _check_players(num_players):
+    if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+        raise ValueError(f"Charts cover {MIN_PLAYERS} to {MAX_PLAYERS} players, got {num_players}")
+
+def _range_frequencies(raise_share, call_share):
+    """
+    Fold/call/raise frequencies of every class when the strongest raise_share of combos raise and
+    the next call_share call. Classes straddling a boundary mix in proportion to the overlap.
+    """
+    lower = 1.0 - HAND_CLASS_STRENGTH  # Share of combos strictly stronger than each class
+    width = HAND_CLASS_PERCENTILE - lower
+    raised = np.clip((raise_share - lower) / width, 0.0, 1.0)
+    continued = np.clip((raise_share + call_share - lower) / width, 0.0, 1.0)
+    return np.stack([1.0 - continued, continued - raised, raised], axis=-1)
+
+def _default_spot(num_players, seat, stack_bucket, facing):
+    behind = num_players - 1 - seat  # Players left to act after this seat
+    big_blind = behind == 0
+    raise_factor, call_factor = STACK_RAISE_FACTORS[stack_bucket], STACK_CALL_FACTORS[stack_bucket]
+    if facing == 'unopened':
+        if big_blind:
+            return _range_frequencies(0.0, 1.0)  # Everyone folded: the big blind checks
+        raise_share = min(OPEN_SHARE / behind ** 0.75 * raise_factor, 1.0)
+        # Only the small blind open-limps; every other seat raises or folds
+        return _range_frequencies(raise_share, LIMP_SHARE * call_factor if behind == 1 else 0.0)
+    if facing == 'limped':
+        raise_share = min(0.8 * OPEN_SHARE / max(behind, 1) ** 0.75 * raise_factor, 1.0)
+        # The big blind checks its option rather than folding
+        return _range_frequencies(raise_share, 1.0 if big_blind else LIMP_SHARE * call_factor)
+    if facing == 'raised':
+        call_share = BIG_BLIND_DEFENSE if big_blind else CALL_RAISE_SHARE * (1.0 + 1.0 / (behind + 1))
+        return _range_frequencies(THREE_BET_SHARE * raise_factor, call_share * call_factor)
+    return _range_frequencies(FOUR_BET_SHARE * raise_factor, CALL_RE_RAISE_SHARE * call_factor)
+
+
+class PreflopChart:
+    """
+    Dense preflop chart with scalar and batch lookups.
+    """
+
+    def __init__(self, frequencies=None):
+        """
+        Args:
+            frequencies (np.ndarray, optional): Array of shape (8, 9, NUM_STACK_BUCKETS, len(FACING), 169, 3)
+                holding fold/call/raise frequencies. Defaults to the built-in chart.
+        """
+        shape = (MAX_PLAYERS - MIN_PLAYERS + 1, MAX_PLAYERS, NUM_STACK_BUCKETS, len(FACING), NUM_HAND_CLASSES, len(ACTIONS))
+        if frequencies is None:
+            frequencies = np.zeros(shape, dtype=np.float32)
+            frequencies[..., 0] = 1.0  # Seats that do not exist fold everything
+            for num_players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+                for seat in range(num_players):
+                    for stack_bucket in range(NUM_STACK_BUCKETS):
+                        for facing_index, facing in enumerate(FACING):
+                            frequencies[num_players - MIN_PLAYERS, seat, stack_bucket, facing_index] = \
+                                _default_spot(num_players, seat, stack_bucket, facing)
+        frequencies = np.asarray(frequencies, dtype=np.float32)
+        if frequencies.shape != shape:
+            raise ValueError(f"Chart frequencies must have shape {shape}, got {frequencies.shape}")
+        self.frequencies = frequencies
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a chart saved with save().
+        """
+        return cls(np.load(path))
+
+    def save(self, path):
+        """
+        Saves the chart as a .npy file.
+        """
+        np.save(path, self.frequencies)
+
+    def set_ranges(self, num_players, position, stack_bucket, facing, raise_range='', call_range=''):
+        """
+        Overrides one spot with ranges in standard notation (e.g. '77+, ATs+, KQs').
+        Raising takes precedence where the ranges overlap; everything else folds.
+
+        Args:
+            num_players (int): Number of players dealt in.
+            position (int or str): The seat (see seat_index).
+            stack_bucket (int): Effective stack bucket (see stack_buckets).
+            facing (str): One of FACING.
+            raise_range (str): Hands that raise, optionally weighted.
+            call_range (str): Hands that call, optionally weighted.
+        """
+        _check_players(num_players)
+        raised = range_class_weights(raise_range) if raise_range else np.zeros(NUM_HAND_CLASSES)
+        called = range_class_weights(call_range) if call_range else np.zeros(NUM_HAND_CLASSES)
+        called = np.minimum(called, 1.0 - raised)
+        spot = (num_players - MIN_PLAYERS, seat_index(position, num_players), stack_bucket, FACING.index(facing))
+        self.frequencies[spot] = np.stack([1.0 - raised - called, called, raised], axis=-1)
+
+    def lookup(self, num_players, seats, stacks_bb, facing, hand_classes):
+        """
+        Batch lookup of action frequencies. All arguments broadcast together.
+
+        Args:
+            num_players (int or array-like): Number of players dealt in (2-9).
+            seats (int or array-like): Seat indices in acting order.
+            stacks_bb (float or array-like): Effective stacks in big blinds.
+            facing (int, str or array-like): Indices into FACING (a single name is also accepted).
+            hand_classes (int or array-like): Hand class ids (0-168).
+
+        Returns:
+            np.ndarray: Fold/call/raise frequencies with shape (..., 3).
+        """
+        if isinstance(facing, str):
+            facing = FACING.index(facing)
+        num_players, seats = np.asarray(num_players), np.asarray(seats)
+        if np.any((num_players < MIN_PLAYERS) | (num_players > MAX_PLAYERS)) or np.any((seats < 0) | (seats >= num_players)):
+            raise ValueError("Every seat must exist at a table of 2 to 9 players")
+        return self.frequencies[num_players - MIN_PLAYERS, seats, stack_buckets(stacks_bb), facing, hand_classes]
+
+    def actions(self, num_players, seats, stacks_bb, facing, hand_classes, rng=None):
+        """
+        Batch decisions: the most frequent action of each spot, or an action sampled from the
+        frequencies when a random generator is given.
+
+        Returns:
+            np.ndarray: Indices into ACTIONS.
+        """
+        frequencies = self.lookup(num_players, seats, stacks_bb, facing, hand_classes)
+        if rng is None:
+            return frequencies.argmax(axis=-1)
+        cumulative = frequencies.cumsum(axis=-1)
+        draws = rng.random(frequencies.shape[:-1])[..., None] * cumulative[..., -1:]
+        return np.minimum((draws >= cumulative).sum(axis=-1), len(ACTIONS) - 1)
+
+    def decide(self, hand, num_players, position, stack_bb=100.0, facing='unopened', rng=None):
+        """
+        Returns the chart decision ('fold', 'call' or 'raise') for one hand.
+
+        Args:
+            hand (str or list): The hand ('AKs', 'T9o', '77') or its two cards.
+            num_players (int): Number of players dealt in.
+            position (int or str): The seat (see seat_index).
+            stack_bb (float): Effective stack in big blinds.
+            facing (str): One of FACING.
+            rng (np.random.Generator, optional): Samples mixed strategies instead of taking the most frequent action.
+        """
+        class_id = hand_class_id(hand)
+        if class_id < 0:
+            raise ValueError(f"Cannot parse hand {hand}")
+        action = self.actions(num_players, seat_index(position, num_players), stack_bb, FACING.index(facing), class_id, rng)
+        return ACTIONS[int(action)]
+
+@lru_cache(maxsize=1)
+def default_chart():
+    """
+    Returns the shared built-in chart (built on first use).
+    """
+    return PreflopChart()
+
+if __name__ == "__main__":
+    chart = default_chart()
+    print(f"Button open, 6-handed, 100bb: {chart.decide('K9s', 6, 'BTN')}")
+    print(f"UTG open, 9-handed, 100bb: {chart.decide('K9s', 9, 'UTG')}")
+    print(f"Big blind facing a raise, 15bb: {chart.decide('A9o', 6, 'BB', 15, 'raised')}")
+
+    # Batch lookup: raise frequency of every class from every seat of a 6-handed table
+    seats = np.arange(6)[:, None]
+    raise_frequency = chart.lookup(6, seats, 100, 'unopened', np.arange(NUM_HAND_CLASSES)[None, :])[..., 2]
+    print(f"Share of combos opened by seat: {np.round(raise_frequency @ HAND_CLASS_COMBOS / NUM_COMBOS, 3)}")
@@ -0,0 +1,154 @@
+# range_parser.py
+
+"""
+Parser for standard hand-range notation.
+A range is a comma-separated list of items, each optionally weighted with ':weight':
+    'QQ'        a pair                        '77+'       77 up to AA
+    '99-66'     pairs from 99 down to 66      'AKs', 'AKo', 'AK'   suited, offsuit or both
+    'KTo+'      KTo, KJo, KQo                 'A2s-A5s'   A2s up to A5s
+    'AhKh'      a single combo                'AQs:0.5'   AQs at half weight
+Ranges compile into arrays over the 1326 combos (see card_encoding.COMBOS), so combining ranges,
+removing blocked combos or weighting equity is plain NumPy. Compiled arrays are cached by range
+string and returned read-only.
+"""
+
+import re
+from functools import lru_cache
+import numpy as np
+from strategy_engine.card_encoding import (
+    COMBO_HAND_CLASS, HAND_CLASS_COMBOS, HAND_CLASS_INDEX, INVALID_CARD, NUM_COMBOS, NUM_HAND_CLASSES,
+    RANKS, blocked_combos, combo_index, parse_card
+)
+
+RANGE_CACHE_SIZE = 1024
+
+_RANK = '[2-9TJQKA]'
+CLASS_PATTERN = re.compile(f'^({_RANK})({_RANK})([so]?)(\\+?)$', re.IGNORECASE)
+SPAN_PATTERN = re.compile(f'^({_RANK})({_RANK})([so]?)-({_RANK})({_RANK})([so]?)$', re.IGNORECASE)
+COMBO_PATTERN = re.compile(f'^({_RANK}[hdcs])({_RANK}[hdcs])$', re.IGNORECASE)
+
+def _class_names(high, low, suffix):
+    # Class names of one rank pair; a missing suffix means both suited and offsuit
+    if high == low:
+        return [RANKS[high] * 2]
+    return [RANKS[high] + RANKS[low] + kind for kind in (suffix or 'so')]
+
+def _ranks(first, second):
+    # Rank indices of a two-rank token, highest first
+    return sorted((RANKS.index(first.upper()), RANKS.index(second.upper())), reverse=True)
+
+def _parse_item(item):
+    """
+    Returns the hand class ids and the combo indices named by one range item.
+    """
+    match = COMBO_PATTERN.match(item)
+    if match:
+        cards = [parse_card(card) for card in match.groups()]
+        if INVALID_CARD in cards or cards[0] == cards[1]:
+            raise ValueError(f"Invalid combo '{item}'")
+        return [], [combo_index(*cards)]
+
+    match = CLASS_PATTERN.match(item)
+    if match:
+        first, second, suffix, plus = match.groups()
+        (high, low), suffix = _ranks(first, second), suffix.lower()
+        if high == low:
+            if suffix:
+                raise ValueError(f"Pairs cannot be suited or offsuit: '{item}'")
+            ranks = [(rank, rank) for rank in range(high, 13 if plus else high + 1)]
+        else:
+            ranks = [(high, kicker) for kicker in range(low, high if plus else low + 1)]
+        return [HAND_CLASS_INDEX[name] for pair in ranks for name in _class_names(*pair, suffix)], []
+
+    match = SPAN_PATTERN.match(item)
+    if match:
+        first_1, second_1, suffix_1, first_2, second_2, suffix_2 = match.groups()
+        if suffix_1.lower() != suffix_2.lower():
+            raise ValueError(f"Both ends of '{item}' must have the same suitedness")
+        (high_1, low_1), (high_2, low_2) = _ranks(first_1, second_1), _ranks(first_2, second_2)
+        if high_1 == low_1 and high_2 == low_2 and not suffix_1:
+            bottom, top = sorted((high_1, high_2))
+            ranks = [(rank, rank) for rank in range(bottom, top + 1)]
+        elif high_1 == high_2 and high_1 not in (low_1, low_2):
+            bottom, top = sorted((low_1, low_2))
+            ranks = [(high_1, kicker) for kicker in range(bottom, top + 1)]
+        else:
+            raise ValueError(f"'{item}' must span pairs or kickers of the same high card")
+        return [HAND_CLASS_INDEX[name] for pair in ranks for name in _class_names(*pair, suffix_1.lower())], []
+
+    raise ValueError(f"Cannot parse range item '{item}'")
+
+@lru_cache(maxsize=RANGE_CACHE_SIZE)
+def _compile(range_text):
+    weights = np.zeros(NUM_COMBOS)
+    for item in range_text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        item, _, weight = item.partition(':')
+        weight = float(weight) if weight else 1.0
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError(f"Range weights must be between 0 and 1, got {weight}")
+        classes, combos = _parse_item(item.strip())
+        if classes:
+            weights[np.isin(COMBO_HAND_CLASS, classes)] = weight
+        weights[combos] = weight
+    weights.flags.writeable = False
+    return weights
+
+def range_weights(range_text, dead_cards=()):
+    """
+    Compiles a range into per-combo weights.
+
+    Args:
+        range_text (str): The range, e.g. '22+, A2s-A5s, KTo+, QJs'. Later items override earlier ones.
+        dead_cards (list): Known cards (strings or codes); combos containing them get weight 0.
+            An unparseable card raises ValueError.
+
+    Returns:
+        np.ndarray: Weights (0-1) of the 1326 combos. Read-only when no dead cards are given.
+    """
+    weights = _compile(range_text)
+    if not len(dead_cards):
+        return weights
+    codes = [parse_card(card) if isinstance(card, str) else int(card) for card in dead_cards]
+    if INVALID_CARD in codes:
+        raise ValueError(f"Invalid dead card in {dead_cards}")
+    return np.where(blocked_combos(codes), 0.0, weights)
+
+def range_mask(range_text, dead_cards=()):
+    """
+    Returns the boolean combo mask of a range (combos with a non-zero weight).
+    """
+    return range_weights(range_text, dead_cards) > 0
+
+def range_class_weights(range_text):
+    """
+    Returns the share of each of the 169 hand classes covered by a range (weighted by combo weight).
+    """
+    return np.bincount(COMBO_HAND_CLASS, weights=_compile(range_text), minlength=NUM_HAND_CLASSES) / HAND_CLASS_COMBOS
+
+def class_value_table(ranges, default=0):
+    """
+    Builds a 169-entry table from a mapping of ranges to values. A class in several ranges gets the
+    highest of their values; classes in none get the default.
+
+    Args:
+        ranges (dict): Range string -> value (e.g. {'AA': 10, 'A2s-A5s': 4}).
+        default (int or float): Value of classes not covered by any range.
+
+    Returns:
+        np.ndarray: The value of each hand class (floats).
+    """
+    values = np.full(NUM_HAND_CLASSES, default, dtype=float)
+    for range_text, value in ranges.items():
+        covered = range_class_weights(range_text) > 0
+        values[covered] = np.maximum(values[covered], value)
+    return values
+
+if __name__ == "__main__":
+    # Example usage: a late-position opening range, then the combos left when an ace is on the board
+    opening = '22+, A2s-A5s, ATs+, KTo+, QJs, AhKh:0.5'
+    mask = range_mask(opening)
+    print(f"{opening}: {mask.sum()} combos ({mask.mean():.1%} of all hands)")
+    print(f"Live combos with AS on the board: {range_mask(opening, dead_cards=['AS']).sum()}")
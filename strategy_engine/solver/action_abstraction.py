@@ -0,0 +1,137 @@
+# action_abstraction.py
+
+"""
+Discrete bet-size abstraction shared by the solvers, the RL agents and hand-history replay.
+Action indices are: fold, check/call, raises of 0.33, 0.5, 0.75, 1 and 2 times the pot, and all-in.
+A raise of fraction f takes the total bet to current_bet + f * (pot after calling), so a pot-sized
+raise facing a bet of B into a pot of P raises to 3B + P.
+
+Observed bets of arbitrary size are translated back onto the abstraction with the pseudo-harmonic
+mapping: a bet of x (as a pot fraction) between the abstract sizes a < x < b maps to a with
+probability ((b - x)(1 + a)) / ((b - a)(1 + x)) and to b otherwise. Everything is vectorized, so
+whole hand histories or batches of observations are translated in one call.
+"""
+
+import numpy as np
+
+POT_FRACTIONS = (0.33, 0.5, 0.75, 1.0, 2.0)
+
+FOLD = 0
+CHECK_CALL = 1
+FIRST_SIZE = 2
+ALL_IN = FIRST_SIZE + len(POT_FRACTIONS)
+NUM_ACTIONS = ALL_IN + 1
+ACTION_NAMES = ('fold', 'call') + tuple(f'raise {fraction:g}x pot' for fraction in POT_FRACTIONS) + ('all-in',)
+
+def pseudo_harmonic_lower_probability(x, a, b):
+    """
+    Probability of mapping a bet of x onto the smaller abstract size a rather than b (a <= x <= b).
+
+    Args:
+        x (float or np.ndarray): Observed bet sizes as pot fractions.
+        a (float or np.ndarray): The next smaller abstract size.
+        b (float or np.ndarray): The next larger abstract size.
+
+    Returns:
+        float or np.ndarray: The probability of choosing a.
+    """
+    x, a, b = np.asarray(x, dtype=np.float64), np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        probability = ((b - x) * (1 + a)) / ((b - a) * (1 + x))
+    return np.clip(np.where(b > a, probability, 1.0), 0.0, 1.0)
+
+def bet_fractions(raise_to, pot, current_bet, player_bet):
+    """
+    Expresses raises as fractions of the pot after calling (the inverse of raise_targets).
+
+    Args:
+        raise_to (array-like): Total bets raised to on the current round.
+        pot (array-like): The pot before the raise (all bets included).
+        current_bet (array-like): The bet faced before the raise.
+        player_bet (array-like): Chips the raiser had already put in on the round.
+
+    Returns:
+        np.ndarray: The raise sizes as pot fractions.
+    """
+    pot_after_call = np.asarray(pot, dtype=np.float64) + np.asarray(current_bet) - np.asarray(player_bet)
+    return (np.asarray(raise_to) - np.asarray(current_bet)) / np.maximum(pot_after_call, 1)
+
+def raise_targets(pot, current_bet, player_bet, fractions=POT_FRACTIONS):
+    """
+    Total bets of the abstract raise sizes.
+
+    Args:
+        pot (array-like): The pot before the raise (all bets included).
+        current_bet (array-like): The bet faced.
+        player_bet (array-like): Chips the player has already put in on the round.
+        fractions (tuple): Raise sizes as pot fractions.
+
+    Returns:
+        np.ndarray: Integer raise-to amounts of shape (..., len(fractions)).
+    """
+    pot, current_bet, player_bet = (np.asarray(value)[..., None] for value in (pot, current_bet, player_bet))
+    pot_after_call = pot + current_bet - player_bet
+    return np.rint(current_bet + np.asarray(fractions) * pot_after_call).astype(np.int64)
+
+def legal_raise_targets(pot, current_bet, player_bet, min_raise_to, max_raise_to, fractions=POT_FRACTIONS):
+    """
+    Raise-to amounts of the abstract sizes and which of them are legal. Sizes below the minimum raise
+    are raised to it, sizes that would need the whole stack are left to the all-in action, and sizes
+    that end up at the same amount as a smaller one are dropped.
+
+    Args:
+        pot, current_bet, player_bet: See raise_targets.
+        min_raise_to (array-like): The smallest legal raise-to amount.
+        max_raise_to (array-like): The all-in amount.
+        fractions (tuple): Raise sizes as pot fractions.
+
+    Returns:
+        tuple: (targets, legal) arrays of shape (..., len(fractions)).
+    """
+    targets = np.maximum(raise_targets(pot, current_bet, player_bet, fractions), np.asarray(min_raise_to)[..., None])
+    legal = targets < np.asarray(max_raise_to)[..., None]
+    legal[..., 1:] &= np.diff(targets, axis=-1) > 0
+    return targets, legal
+
+def translate_bet_sizes(fractions, all_in_fractions=None, pot_fractions=POT_FRACTIONS, rng=None):
+    """
+    Maps observed raise sizes onto abstract actions with the pseudo-harmonic mapping.
+
+    Args:
+        fractions (array-like): Observed raises as pot fractions (see bet_fractions).
+        all_in_fractions (array-like, optional): The size of an all-in for each observation. Abstract
+            sizes at or above it are replaced by the all-in action. Defaults to deep stacks.
+        pot_fractions (tuple): The abstract raise sizes (ascending).
+        rng (np.random.Generator, optional): Randomizes between the two neighbouring sizes. Without
+            one, the size with the larger mapping probability is chosen.
+
+    Returns:
+        np.ndarray: Abstract action indices (FIRST_SIZE ... ALL_IN) of the same shape as fractions.
+    """
+    fractions = np.asarray(fractions, dtype=np.float64)
+    all_in = np.full(fractions.shape, np.inf) if all_in_fractions is None else np.broadcast_to(all_in_fractions, fractions.shape)
+    sizes = np.asarray(pot_fractions, dtype=np.float64)
+
+    # Per observation: the abstract sizes below all-in, then all-in itself
+    grid = np.minimum(np.append(sizes, np.inf), all_in[..., None])
+    actions = np.where(grid < all_in[..., None], FIRST_SIZE + np.arange(len(sizes) + 1), ALL_IN)
+
+    # Neighbouring sizes; observations outside the grid map onto its ends
+    upper = np.minimum((fractions[..., None] >= grid).sum(axis=-1), len(sizes))
+    lower = np.maximum(upper - 1, 0)
+    low_size = np.take_along_axis(grid, lower[..., None], axis=-1)[..., 0]
+    high_size = np.take_along_axis(grid, upper[..., None], axis=-1)[..., 0]
+    x = np.clip(fractions, low_size, np.where(np.isinf(high_size), low_size, high_size))
+    probability = pseudo_harmonic_lower_probability(x, low_size, np.where(np.isinf(high_size), low_size, high_size))
+
+    draws = rng.random(fractions.shape) if rng is not None else np.full(fractions.shape, 0.5)
+    chosen = np.where(draws <= probability, lower, upper)
+    return np.take_along_axis(actions, chosen[..., None], axis=-1)[..., 0]
+
+if __name__ == "__main__":
+    # Example usage: translate a few observed raises facing a 10-chip bet into a 30-chip pot
+    raise_to = np.array([20, 25, 40, 55, 80, 150])
+    observed = bet_fractions(raise_to, pot=30, current_bet=10, player_bet=0)
+    abstract = translate_bet_sizes(observed, all_in_fractions=bet_fractions(150, 30, 10, 0))
+    for amount, fraction, action in zip(raise_to, observed, abstract):
+        print(f"Raise to {amount:>3} ({fraction:.2f}x pot) -> {ACTION_NAMES[action]}")
@@ -0,0 +1,71 @@
+# card_abstraction.py
+
+"""
+Card bucketing for the abstracted games solved offline.
+Preflop, the 169 hand classes are split into equal-mass buckets by their preflop strength.
+Postflop, hands are bucketed by the made-hand category returned by the hand evaluator, so hands
+of the same category share strategy. Buckets are numbered from 0 (strongest) upwards.
+"""
+
+import numpy as np
+from strategy_engine.card_encoding import HAND_CLASS_PERCENTILE, RANKS, SUITS, hand_class_ids
+from strategy_engine.post_flop_strategy.hand_evaluation import HAND_RANKINGS, rank_key
+
+NUM_PREFLOP_BUCKETS = 8
+# Royal flushes share the straight flush bucket
+NUM_POSTFLOP_BUCKETS = HAND_RANKINGS["Straight Flush"]
+
+def evaluator_card(code):
+    """
+    Converts a card code into the string form read by hand_evaluation ('10H', 'AS', ...).
+    """
+    rank = RANKS[code // 4]
+    return ('10' if rank == 'T' else rank) + SUITS[code % 4].upper()
+
+def preflop_buckets(card_1, card_2, num_buckets=NUM_PREFLOP_BUCKETS):
+    """
+    Vectorized preflop bucketing. Each bucket holds roughly the same share of all combos.
+
+    Args:
+        card_1 (array-like): Codes of the first hole card.
+        card_2 (array-like): Codes of the second hole card.
+        num_buckets (int): Number of buckets.
+
+    Returns:
+        np.ndarray: Bucket of each hand (0 = strongest).
+    """
+    return class_buckets(hand_class_ids(card_1, card_2), num_buckets)
+
+def class_buckets(class_ids, num_buckets=NUM_PREFLOP_BUCKETS):
+    """
+    Returns the preflop bucket of each of the given hand class ids.
+    """
+    percentile = HAND_CLASS_PERCENTILE[class_ids]
+    return np.minimum(((percentile - 1e-9) * num_buckets).astype(np.int64), num_buckets - 1)
+
+def postflop_bucket(hole_cards, board):
+    """
+    Buckets a hand on the flop, turn or river by its made-hand category.
+
+    Args:
+        hole_cards (list): The two hole card codes.
+        board (list): The visible board card codes.
+
+    Returns:
+        int: Bucket of the hand (0 = strongest category).
+    """
+    return NUM_POSTFLOP_BUCKETS - min(showdown_strength(hole_cards, board)[0], NUM_POSTFLOP_BUCKETS)
+
+def showdown_strength(hole_cards, board):
+    """
+    Returns a value that orders hands at showdown (higher wins, equal values split the pot).
+
+    Args:
+        hole_cards (list): The two hole card codes.
+        board (list): The board card codes.
+
+    Returns:
+        tuple: The evaluator's rank key (made-hand category followed by the tie-breaking ranks).
+    """
+    codes = list(hole_cards) + list(board)
+    return rank_key([code // 4 + 2 for code in codes], [code % 4 for code in codes])
@@ -0,0 +1,361 @@
+# mccfr.py
+
+"""
+External-sampling Monte Carlo CFR for abstracted heads-up no-limit hold'em.
+The abstracted game uses the card buckets from card_abstraction.py and a small set of pot-fraction
+bet sizes. Infoset keys are mapped to integer ids, and the cumulative regrets and strategy sums
+live in NumPy arrays indexed by those ids. Several worker processes can run iterations in
+parallel; their regret and strategy updates are merged by infoset key after every round.
+"""
+
+import argparse
+import multiprocessing
+import numpy as np
+from strategy_engine.solver.card_abstraction import (
+    NUM_PREFLOP_BUCKETS, postflop_bucket, preflop_buckets, showdown_strength
+)
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+BOARD_CARDS = (0, 3, 4, 5)
+
+# Action characters used in betting histories; bet sizes are digits indexing the bet size list
+FOLD, CALL, ALL_IN = 'f', 'c', 'a'
+
+class AbstractGame:
+    """
+    Heads-up betting abstraction. Player 0 is the small blind and acts first preflop, player 1
+    acts first after the flop. Bets and raises are fractions of the pot after calling.
+    """
+
+    def __init__(self, stack=100.0, blinds=(0.5, 1.0), bet_sizes=(0.5, 1.0), max_raises=2,
+                 num_streets=4, num_preflop_buckets=NUM_PREFLOP_BUCKETS):
+        """
+        Args:
+            stack (float): Starting stack of both players, in big blinds.
+            blinds (tuple): Small and big blind.
+            bet_sizes (tuple): Bet and raise sizes as fractions of the pot.
+            max_raises (int): Maximum number of bets and raises per street (all-ins are always allowed).
+            num_streets (int): Number of betting streets (1 = preflop only, 4 = through the river).
+            num_preflop_buckets (int): Number of preflop card buckets.
+        """
+        if not 1 <= num_streets <= len(STREETS):
+            raise ValueError(f"num_streets must be between 1 and {len(STREETS)}")
+        if len(bet_sizes) > 10:
+            raise ValueError("At most 10 bet sizes are supported")
+        self.stack = stack
+        self.blinds = blinds
+        self.bet_sizes = tuple(bet_sizes)
+        self.max_raises = max_raises
+        self.num_streets = num_streets
+        self.num_preflop_buckets = num_preflop_buckets
+        self.max_actions = len(self.bet_sizes) + 3
+
+    def deal(self, rng):
+        """
+        Samples the chance outcome of one hand: hole cards, buckets and the showdown result.
+
+        Returns:
+            tuple: (buckets, winner) where buckets[player][street] is the card bucket and winner is
+                0 or 1 for the player with the better showdown hand, or -1 for a split pot.
+        """
+        cards = rng.choice(52, size=9, replace=False)
+        holes = (cards[0:2], cards[2:4])
+        board = cards[4:9]
+        buckets = []
+        for hole in holes:
+            player_buckets = [int(preflop_buckets(hole[0], hole[1], self.num_preflop_buckets))]
+            for street in range(1, self.num_streets):
+                player_buckets.append(postflop_bucket(hole.tolist(), board[:BOARD_CARDS[street]].tolist()))
+            buckets.append(tuple(player_buckets))
+
+        if self.num_streets == 1:
+            # Preflop-only games are settled by preflop strength
+            strengths = [-bucket[0] for bucket in buckets]
+        else:
+            strengths = [showdown_strength(hole.tolist(), board.tolist()) for hole in holes]
+        winner = -1 if strengths[0] == strengths[1] else int(strengths[1] > strengths[0])
+        return tuple(buckets), winner
+
+    def legal_actions(self, contributions, player, raises):
+        """
+        Returns the legal action characters and the resulting contribution of the acting player.
+
+        Args:
+            contributions (tuple): Chips put in the pot by each player so far.
+            player (int): The acting player.
+            raises (int): Number of bets and raises made on the current street.
+
+        Returns:
+            list: (action, new contribution) pairs.
+        """
+        mine, theirs = contributions[player], contributions[1 - player]
+        to_call = theirs - mine
+        actions = []
+        if to_call > 0:
+            actions.append((FOLD, mine))
+        actions.append((CALL, min(theirs, self.stack)))
+        if theirs >= self.stack or mine + to_call >= self.stack:
+            return actions
+
+        pot_after_call = 2 * theirs
+        if raises < self.max_raises:
+            for index, size in enumerate(self.bet_sizes):
+                total = theirs + size * pot_after_call
+                if total < self.stack:
+                    actions.append((str(index), total))
+        actions.append((ALL_IN, self.stack))
+        return actions
+
+
+class InfosetTable:
+    """
+    Growable NumPy tables of cumulative regrets and strategy sums indexed by infoset id.
+    """
+
+    def __init__(self, max_actions, capacity=1024):
+        self.max_actions = max_actions
+        self.ids = {}
+        self.keys = []
+        self.labels = []
+        self.num_actions = np.zeros(capacity, dtype=np.int8)
+        self.regrets = np.zeros((capacity, max_actions))
+        self.strategy_sums = np.zeros((capacity, max_actions))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def infoset_id(self, key, labels):
+        """
+        Returns the id of an infoset, allocating table rows for new infosets.
+
+        Args:
+            key (str): The infoset key.
+            labels (str): The characters of the legal actions at the infoset, in table column order.
+        """
+        infoset = self.ids.get(key)
+        if infoset is None:
+            infoset = len(self.keys)
+            if infoset == len(self.num_actions):
+                self._grow()
+            self.ids[key] = infoset
+            self.keys.append(key)
+            self.labels.append(labels)
+            self.num_actions[infoset] = len(labels)
+        return infoset
+
+    def _grow(self):
+        capacity = 2 * len(self.num_actions)
+        self.num_actions = np.resize(self.num_actions, capacity)
+        self.num_actions[len(self.keys):] = 0
+        for name in ('regrets', 'strategy_sums'):
+            table = np.zeros((capacity, self.max_actions))
+            table[:len(self.keys)] = getattr(self, name)[:len(self.keys)]
+            setattr(self, name, table)
+
+    def current_strategy(self, infoset):
+        """
+        Regret matching: the strategy is proportional to the positive cumulative regrets.
+        """
+        count = self.num_actions[infoset]
+        positive = np.maximum(self.regrets[infoset, :count], 0.0)
+        total = positive.sum()
+        return positive / total if total > 0 else np.full(count, 1.0 / count)
+
+    def average_strategy(self):
+        """
+        Returns the average strategy of every infoset as a (num_infosets, max_actions) array.
+        Infosets that were never reached by the averaging player get a uniform strategy.
+        """
+        size = len(self.keys)
+        sums = self.strategy_sums[:size]
+        totals = sums.sum(axis=1, keepdims=True)
+        legal = np.arange(self.max_actions) < self.num_actions[:size, None]
+        uniform = legal / np.maximum(self.num_actions[:size, None], 1)
+        return np.where(totals > 0, sums / np.where(totals > 0, totals, 1.0), uniform)
+
+    def export(self):
+        """
+        Returns the tables in a picklable form keyed by infoset key, used to merge parallel workers.
+        """
+        size = len(self.keys)
+        return list(self.keys), list(self.labels), self.regrets[:size].copy(), self.strategy_sums[:size].copy()
+
+    def merge(self, keys, labels, regrets, strategy_sums):
+        """
+        Adds regret and strategy-sum updates to the tables, matching infosets by key.
+        """
+        infosets = np.array([self.infoset_id(key, actions) for key, actions in zip(keys, labels)], dtype=np.int64)
+        if len(infosets):
+            np.add.at(self.regrets, infosets, regrets)
+            np.add.at(self.strategy_sums, infosets, strategy_sums)
+
+
+class MCCFRSolver:
+    """
+    External-sampling MCCFR. Each iteration samples one deal and, for each traverser, explores all
+    of the traverser's actions while sampling a single action at opponent nodes.
+    """
+
+    def __init__(self, game=None, seed=None):
+        """
+        Args:
+            game (AbstractGame, optional): The game to solve. Defaults to the full four-street game.
+            seed (int, optional): Seed of the random generator used for sampling.
+        """
+        self.game = game if game is not None else AbstractGame()
+        self.table = InfosetTable(self.game.max_actions)
+        self.rng = np.random.default_rng(seed)
+        self.iterations = 0
+
+    def infoset_key(self, player, buckets, street, history):
+        """
+        Builds the key of an infoset from what the acting player knows.
+        """
+        return f"{player}:{'.'.join(map(str, buckets[player][:street + 1]))}|{history}"
+
+    def run(self, iterations):
+        """
+        Runs MCCFR iterations.
+
+        Args:
+            iterations (int): Number of iterations (one sampled deal each).
+        """
+        blinds = self.game.blinds
+        for _ in range(iterations):
+            buckets, winner = self.game.deal(self.rng)
+            for traverser in (0, 1):
+                self._traverse(buckets, winner, traverser, (blinds[0], blinds[1]), 0, 0, 0, 0, "")
+            self.iterations += 1
+
+    def _terminal_value(self, contributions, traverser, winner, folder=None):
+        if folder is not None:
+            return -contributions[traverser] if folder == traverser else contributions[1 - traverser]
+        if winner == -1:
+            return 0.0
+        return contributions[1 - traverser] if winner == traverser else -contributions[traverser]
+
+    def _traverse(self, buckets, winner, traverser, contributions, player, street, raises, street_actions, history):
+        game = self.game
+        actions = game.legal_actions(contributions, player, raises)
+        key = self.infoset_key(player, buckets, street, history)
+        infoset = self.table.ids.get(key)
+        if infoset is None:
+            infoset = self.table.infoset_id(key, ''.join(action for action, _ in actions))
+        strategy = self.table.current_strategy(infoset)
+
+        if player == traverser:
+            values = np.zeros(len(actions))
+            for index, (action, amount) in enumerate(actions):
+                values[index] = self._child_value(
+                    buckets, winner, traverser, contributions, player, street, raises, street_actions, history, action, amount
+                )
+            node_value = strategy @ values
+            self.table.regrets[infoset, :len(actions)] += values - node_value
+            return node_value
+
+        # Opponent node: accumulate the average strategy and follow one sampled action
+        self.table.strategy_sums[infoset, :len(actions)] += strategy
+        index = self.rng.choice(len(actions), p=strategy)
+        action, amount = actions[index]
+        return self._child_value(
+            buckets, winner, traverser, contributions, player, street, raises, street_actions, history, action, amount
+        )
+
+    def _child_value(self, buckets, winner, traverser, contributions, player, street, raises, street_actions, history, action, amount):
+        if action == FOLD:
+            return self._terminal_value(contributions, traverser, winner, folder=player)
+
+        updated = list(contributions)
+        updated[player] = amount
+        updated = tuple(updated)
+        history += action
+
+        if action != CALL:
+            return self._traverse(buckets, winner, traverser, updated, 1 - player, street, raises + 1, street_actions + 1, history)
+
+        # A check or call closes the street unless it is the first action on it
+        if street_actions == 0:
+            return self._traverse(buckets, winner, traverser, updated, 1 - player, street, raises, 1, history)
+        if street + 1 >= self.game.num_streets or max(updated) >= self.game.stack:
+            return self._terminal_value(updated, traverser, winner)
+        return self._traverse(buckets, winner, traverser, updated, 1, street + 1, 0, 0, history + '/')
+
+    def average_strategy(self):
+        """
+        Returns the average strategy as a dictionary of infoset key -> action probabilities.
+        """
+        strategy = self.table.average_strategy()
+        return {
+            key: strategy[infoset, :self.table.num_actions[infoset]]
+            for infoset, key in enumerate(self.table.keys)
+        }
+
+
+def _run_worker(args):
+    game, tables, iterations, seed = args
+    solver = MCCFRSolver(game, seed)
+    if tables is not None:
+        solver.table.merge(*tables)
+    start = solver.table.export()
+    solver.run(iterations)
+
+    # Return only the updates made in this round so the parent can add them up
+    keys, labels, regrets, strategy_sums = solver.table.export()
+    regrets[:len(start[0])] -= start[2]
+    strategy_sums[:len(start[0])] -= start[3]
+    return keys, labels, regrets, strategy_sums
+
+def solve_parallel(game, iterations, num_workers=None, rounds=10, seed=0):
+    """
+    Runs MCCFR in several processes. Every round, each worker starts from the merged tables, runs
+    its share of the iterations on independent samples, and its regret and strategy-sum updates
+    are added to the merged tables by infoset key.
+
+    Args:
+        game (AbstractGame): The game to solve.
+        iterations (int): Total number of iterations.
+        num_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        rounds (int): Number of synchronization rounds.
+        seed (int): Base seed; each worker and round gets its own stream.
+
+    Returns:
+        MCCFRSolver: A solver holding the merged tables.
+    """
+    num_workers = num_workers or multiprocessing.cpu_count()
+    solver = MCCFRSolver(game, seed)
+    per_worker = max(1, iterations // (num_workers * rounds))
+    seeds = np.random.SeedSequence(seed).spawn(num_workers * rounds)
+
+    with multiprocessing.Pool(num_workers) as pool:
+        for round_index in range(rounds):
+            tables = solver.table.export() if len(solver.table) else None
+            jobs = [
+                (game, tables, per_worker, seeds[round_index * num_workers + worker])
+                for worker in range(num_workers)
+            ]
+            for update in pool.map(_run_worker, jobs):
+                solver.table.merge(*update)
+            solver.iterations += per_worker * num_workers
+    return solver
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve an abstracted heads-up hold'em game with MCCFR.")
+    parser.add_argument('--iterations', type=int, default=2000, help="Number of MCCFR iterations")
+    parser.add_argument('--streets', type=int, default=2, help="Number of betting streets (1-4)")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes")
+    args = parser.parse_args()
+
+    game = AbstractGame(num_streets=args.streets)
+    if args.workers > 1:
+        solver = solve_parallel(game, args.iterations, args.workers)
+    else:
+        solver = MCCFRSolver(game, seed=0)
+        solver.run(args.iterations)
+
+    strategy = solver.average_strategy()
+    print(f"Solved {len(strategy)} infosets in {solver.iterations} iterations")
+    for bucket in range(game.num_preflop_buckets):
+        key = f"0:{bucket}|"
+        if key in strategy:
+            print(f"Small blind opening, bucket {bucket}: {np.round(strategy[key], 2).tolist()}")
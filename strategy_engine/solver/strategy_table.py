@@ -0,0 +1,222 @@
+# strategy_table.py
+
+"""
+Compact, versioned binary strategy tables for decision-time lookups.
+A table maps infoset keys to action probabilities. Keys are stored as sorted 64-bit hashes next
+to a uint8 matrix of action characters and a float16 probability matrix. Readers map the file
+with np.memmap, so opening a table is instant and only the pages touched by lookups are read.
+
+File layout (little endian):
+    header    magic (8 bytes), format version (uint32), max actions (uint32),
+              number of entries (uint64), metadata length (uint32)
+    metadata  UTF-8 JSON, padded to a multiple of 8 bytes
+    hashes    uint64[entries], sorted
+    actions   uint8[entries, max actions], action characters (0 for unused columns), padded to 8 bytes
+    probs     float16[entries, max actions]
+"""
+
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from strategy_engine.card_encoding import INVALID_CARD, parse_card
+from strategy_engine.solver.card_abstraction import NUM_PREFLOP_BUCKETS, postflop_bucket, preflop_buckets
+
+MAGIC = b'PKRSTRAT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIIQI')
+
+def key_hash(key):
+    """
+    Returns the stable 64-bit hash of an infoset key.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+# Decision returned for each action character of the solver's betting abstraction
+ACTION_DECISIONS = {'f': 'fold', 'c': 'call', 'a': 'raise'}
+
+def action_decision(action, facing_bet=True):
+    """
+    Converts an action character into a decision ('fold', 'check', 'call' or 'raise').
+    """
+    if action == 'c' and not facing_bet:
+        return 'check'
+    return ACTION_DECISIONS.get(action, 'raise')
+
+def card_infoset_key(player, hole_cards, community_cards, history='', num_preflop_buckets=NUM_PREFLOP_BUCKETS):
+    """
+    Builds the solver infoset key of a real decision from the player's cards.
+
+    Args:
+        player (int): 0 for the small blind / button, 1 for the big blind.
+        hole_cards (list): The player's two cards, as strings or card codes.
+        community_cards (list): The visible board cards, as strings or card codes.
+        history (str): The betting history in the solver's action characters ('/' separates streets).
+        num_preflop_buckets (int): Number of preflop buckets of the table's game.
+
+    Returns:
+        str: The infoset key.
+    """
+    hole = [parse_card(card) if isinstance(card, str) else int(card) for card in hole_cards]
+    board = [parse_card(card) if isinstance(card, str) else int(card) for card in community_cards]
+    if INVALID_CARD in hole + board:
+        raise ValueError(f"Invalid cards {hole_cards} {community_cards}")
+    buckets = [int(preflop_buckets(hole[0], hole[1], num_preflop_buckets))]
+    buckets += [postflop_bucket(hole, board[:count]) for count in (3, 4, 5) if len(board) >= count]
+    return f"{player}:{'.'.join(map(str, buckets))}|{history}"
+
+def write_strategy_table(path, keys, labels, probabilities, metadata=None):
+    """
+    Writes a strategy table.
+
+    Args:
+        path (str): Output file path.
+        keys (list): Infoset keys.
+        labels (list): Legal action characters of each infoset (e.g. 'fc0a'), in column order.
+        probabilities (array-like): Action probabilities of shape (entries, max actions).
+        metadata (dict, optional): JSON-serializable description of the game the table belongs to.
+
+    Returns:
+        int: The number of entries written.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float16)
+    num_entries, max_actions = probabilities.shape if probabilities.ndim == 2 else (0, 0)
+    if len(keys) != num_entries or len(labels) != num_entries:
+        raise ValueError("keys, labels and probabilities must have the same length")
+
+    hashes = np.array([key_hash(key) for key in keys], dtype=np.uint64)
+    order = np.argsort(hashes, kind='stable')
+    hashes = hashes[order]
+    if num_entries > 1 and (hashes[1:] == hashes[:-1]).any():
+        raise ValueError("Infoset key hash collision; rename the colliding keys")
+    actions = np.zeros((num_entries, max_actions), dtype=np.uint8)
+    for row, label in enumerate(labels):
+        actions[row, :len(label)] = np.frombuffer(label.encode('ascii'), dtype=np.uint8)
+
+    meta = json.dumps(metadata or {}, separators=(',', ':')).encode('utf-8')
+    meta += b' ' * (-len(meta) % 8)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, max_actions, num_entries, len(meta)))
+        file.write(b'\0' * (-HEADER.size % 8))
+        file.write(meta)
+        file.write(hashes.tobytes())
+        file.write(actions[order].tobytes())
+        file.write(b'\0' * (-actions.size % 8))
+        file.write(probabilities[order].tobytes())
+    os.replace(tmp_path, path)
+    return num_entries
+
+def export_solver_strategy(solver, path):
+    """
+    Writes the average strategy of an MCCFRSolver as a strategy table.
+
+    Args:
+        solver (MCCFRSolver): The solver to export.
+        path (str): Output file path.
+
+    Returns:
+        int: The number of entries written.
+    """
+    game = solver.game
+    metadata = {
+        'source': 'mccfr',
+        'iterations': solver.iterations,
+        'num_streets': game.num_streets,
+        'num_preflop_buckets': game.num_preflop_buckets,
+        'bet_sizes': list(game.bet_sizes),
+        'stack': game.stack
+    }
+    return write_strategy_table(path, solver.table.keys, solver.table.labels, solver.table.average_strategy(), metadata)
+
+
+class StrategyTable:
+    """
+    Read-only, memory-mapped view of a strategy table file.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of a file written by write_strategy_table().
+        """
+        with open(path, 'rb') as file:
+            magic, version, max_actions, num_entries, meta_length = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a strategy table")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported strategy table version {version} (expected {FORMAT_VERSION})")
+            offset = HEADER.size + (-HEADER.size % 8)
+            file.seek(offset)
+            self.metadata = json.loads(file.read(meta_length).decode('utf-8') or '{}')
+
+        self.path = path
+        self.version = version
+        self.max_actions = max_actions
+        offset += meta_length
+        if num_entries:
+            self.hashes = np.memmap(path, dtype=np.uint64, mode='r', offset=offset, shape=(num_entries,))
+            offset += 8 * num_entries
+            self.actions = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(num_entries, max_actions))
+            offset += num_entries * max_actions + (-(num_entries * max_actions) % 8)
+            self.probabilities = np.memmap(path, dtype=np.float16, mode='r', offset=offset, shape=(num_entries, max_actions))
+        else:
+            self.hashes = np.zeros(0, dtype=np.uint64)
+            self.actions = np.zeros((0, max_actions), dtype=np.uint8)
+            self.probabilities = np.zeros((0, max_actions), dtype=np.float16)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, key):
+        return self.row(key) >= 0
+
+    def row(self, key):
+        """
+        Returns the row of an infoset key, or -1 if the table has no entry for it.
+        """
+        target = np.uint64(key_hash(key))
+        row = int(np.searchsorted(self.hashes, target))
+        if row < len(self.hashes) and self.hashes[row] == target:
+            return row
+        return -1
+
+    def lookup(self, key):
+        """
+        Returns the action probabilities of an infoset.
+
+        Args:
+            key (str): The infoset key.
+
+        Returns:
+            dict: Action character -> probability, or None if the key is not in the table.
+        """
+        row = self.row(key)
+        if row < 0:
+            return None
+        actions = self.actions[row]
+        count = int(np.count_nonzero(actions))
+        return {
+            chr(action): float(probability)
+            for action, probability in zip(actions[:count].tolist(), self.probabilities[row, :count].tolist())
+        }
+
+    def best_action(self, key):
+        """
+        Returns the most likely action character of an infoset, or None if the key is unknown.
+        """
+        probabilities = self.lookup(key)
+        if not probabilities:
+            return None
+        return max(probabilities, key=probabilities.get)
+
+
+if __name__ == "__main__":
+    from strategy_engine.solver.mccfr import AbstractGame, MCCFRSolver
+
+    solver = MCCFRSolver(AbstractGame(num_streets=1), seed=0)
+    solver.run(1000)
+    entries = export_solver_strategy(solver, 'preflop_strategy.bin')
+    table = StrategyTable('preflop_strategy.bin')
+    print(f"Wrote {entries} infosets; small blind opening with the best bucket: {table.lookup('0:0|')}")
@@ -0,0 +1,62 @@
+# test_action_abstraction.py
+
+import unittest
+import numpy as np
+from rl_module.environment.poker_environment import PokerEnvironment
+from strategy_engine.solver.action_abstraction import (
+    ALL_IN, FIRST_SIZE, POT_FRACTIONS, bet_fractions, legal_raise_targets, pseudo_harmonic_lower_probability,
+    raise_targets, translate_bet_sizes
+)
+
+class TestActionAbstraction(unittest.TestCase):
+
+    def test_pseudo_harmonic_mapping(self):
+        self.assertAlmostEqual(float(pseudo_harmonic_lower_probability(0.5, 0.5, 1.0)), 1.0)
+        self.assertAlmostEqual(float(pseudo_harmonic_lower_probability(1.0, 0.5, 1.0)), 0.0)
+        # A 0.75x bet between 0.5x and 1x maps to the smaller size with probability 3/7
+        self.assertAlmostEqual(float(pseudo_harmonic_lower_probability(0.75, 0.5, 1.0)), 3 / 7)
+
+    def test_translation(self):
+        observed = np.array([0.1, 0.33, 0.4, 0.9, 1.2, 5.0])
+        self.assertEqual(translate_bet_sizes(observed).tolist(),
+                         [FIRST_SIZE, FIRST_SIZE, FIRST_SIZE, FIRST_SIZE + 3, FIRST_SIZE + 3, FIRST_SIZE + 4])
+        # With a 1.5x pot all-in the 2x size is unavailable and large bets become all-ins
+        self.assertEqual(translate_bet_sizes([1.45, 3.0], all_in_fractions=1.5).tolist(), [ALL_IN, ALL_IN])
+        self.assertEqual(translate_bet_sizes(0.05, all_in_fractions=0.2).tolist(), ALL_IN)
+
+        # Randomized translation matches the mapping probability
+        rng = np.random.default_rng(0)
+        draws = translate_bet_sizes(np.full(20000, 0.75 * 0.5 + 0.25), rng=rng)
+        lower = pseudo_harmonic_lower_probability(0.625, 0.5, 0.75)
+        self.assertEqual(set(draws.tolist()), {FIRST_SIZE + 1, FIRST_SIZE + 2})
+        self.assertAlmostEqual(np.mean(draws == FIRST_SIZE + 1), float(lower), delta=0.02)
+
+    def test_targets_round_trip(self):
+        targets = raise_targets(pot=[30, 100], current_bet=[10, 0], player_bet=[0, 0])
+        self.assertEqual(targets[0].tolist(), [23, 30, 40, 50, 90])
+        self.assertEqual(targets[1].tolist(), [33, 50, 75, 100, 200])
+        np.testing.assert_allclose(bet_fractions(targets[1], 100, 0, 0), POT_FRACTIONS)
+        self.assertEqual(translate_bet_sizes(bet_fractions(targets[1], 100, 0, 0)).tolist(),
+                         list(range(FIRST_SIZE, ALL_IN)))
+
+        _, legal = legal_raise_targets(100, 0, 0, min_raise_to=40, max_raise_to=100)
+        self.assertEqual(legal.tolist(), [True, True, True, False, False])
+
+    def test_environment_raises_to_abstract_sizes(self):
+        env = PokerEnvironment(num_players=2, starting_stack=200)
+        env.reset()
+        env.step(FIRST_SIZE + 3)  # A pot-sized raise facing the big blind: 2 + 1.0 * 4
+        self.assertEqual(env.current_bet, 6)
+        env.step(FIRST_SIZE + 4)  # Twice the pot: 6 + 2.0 * 12
+        self.assertEqual(env.current_bet, 30)
+
+        # The environment's scalar targets agree with the vectorized ones
+        for _ in range(3):
+            player = env.current_player
+            targets, legal = legal_raise_targets(env.pot, env.current_bet, env.bets[player], env.min_raise_to(),
+                                                 env.max_raise_to())
+            self.assertEqual(env.raise_targets(), (targets.tolist(), legal.tolist()))
+            env.step(FIRST_SIZE + 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# test_action_masking.py
+
+import random
+import unittest
+import numpy as np
+from rl_module.agents.action_masking import as_mask, masked_argmax, masked_softmax, random_legal_action, sample_actions
+from rl_module.environment.poker_environment import ACTIONS, PokerEnvironment
+from rl_module.training.exploration_strategies import (
+    EpsilonGreedyStrategy, SoftmaxExplorationStrategy, UCBExplorationStrategy
+)
+
+class TestActionMasking(unittest.TestCase):
+
+    def test_masked_operations(self):
+        values = np.array([[0.1, 0.9, 0.5], [2.0, -1.0, 0.0]])
+        mask = np.array([[True, False, True], [False, True, True]])
+        self.assertEqual(masked_argmax(values, mask).tolist(), [2, 2])
+        probabilities = masked_softmax(values, mask)
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+        self.assertTrue(np.all(probabilities[~mask] == 0))
+        self.assertEqual(as_mask([0, 2], 3).tolist(), [True, False, True])
+        rng = np.random.default_rng(0)
+        draws = [random_legal_action(np.array([False, True, False, True]), rng) for _ in range(200)]
+        self.assertEqual(set(draws), {1, 3})
+        self.assertEqual(sample_actions(np.array([[0.0, 1.0, 0.0]] * 3), rng).tolist(), [1, 1, 1])
+
+    def test_strategies_never_pick_illegal_actions(self):
+        random.seed(0)
+        np.random.seed(0)
+        q_values = np.array([0.2, 0.5, 0.1, 0.7])
+        mask = np.array([True, True, True, False])
+        strategies = [EpsilonGreedyStrategy(epsilon_start=0.5), SoftmaxExplorationStrategy(temperature=0.1)]
+        for _ in range(100):
+            for strategy in strategies:
+                self.assertNotEqual(strategy.get_action(None, q_values, mask), 3)
+            self.assertNotEqual(UCBExplorationStrategy().get_action(None, q_values, [0, 1, 2], total_steps=5), 3)
+
+    def test_environment_masks(self):
+        env = PokerEnvironment(num_players=3, starting_stack=100)
+        state = env.reset()
+        # Facing the big blind the 0.33x and 0.5x pot raises both round to the minimum raise
+        self.assertEqual(env.legal_action_mask().tolist(), [True, True, True, False, True, True, True, True])
+        # Observations only carry the agent's mask, and only when it is to act
+        expected = env.legal_action_mask() if env.current_player == env.agent_position else np.zeros(len(ACTIONS), dtype=bool)
+        self.assertEqual(state["legal_actions"].tolist(), expected.tolist())
+        env.step(ACTIONS.index('call'))
+        env.step(ACTIONS.index('call'))
+        # The big blind can check its option, so folding is not offered
+        self.assertEqual(env.legal_action_mask().tolist(), [False] + [True] * 7)
+        env.step(ACTIONS.index('call'))
+        env.stacks[env.current_player] = 2
+        self.assertEqual(env.legal_action_mask().tolist(), [False, True] + [False] * 5 + [True])  # Only all-in is left to raise
+        _, _, done, _ = env.step(ACTIONS.index('all-in'))
+        self.assertFalse(done)
+        self.assertEqual(env.legal_action_mask().tolist(), [True] * 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# test_bluff_frequency_solver.py
+
+import unittest
+import numpy as np
+from strategy_engine.bluffing_engine.bluff_frequency_solver import (
+    bluff_fractions, bluff_frequencies, bluff_probabilities
+)
+from strategy_engine.bluffing_engine.bluff_probability import BluffProbabilityCalculator
+
+class TestBluffFrequencySolver(unittest.TestCase):
+
+    def test_polarized_pot_sized_bet(self):
+        result = bluff_frequencies(100.0, 100.0)
+        self.assertAlmostEqual(result['alpha'], 0.5)
+        self.assertAlmostEqual(result['mdf'], 0.5)
+        self.assertAlmostEqual(result['bluff_fraction'], 1 / 3)
+        self.assertAlmostEqual(result['bluff_to_value'], 0.5)
+
+    def test_range_equities_reduce_bluffs(self):
+        fractions = bluff_fractions(np.array([50.0, 100.0, 200.0]), 100.0, value_equity=0.8, bluff_equity=0.1)
+        self.assertEqual(fractions.shape, (3,))
+        self.assertTrue((fractions < bluff_fractions(np.array([50.0, 100.0, 200.0]), 100.0)).all())
+        # A value range too weak to be called profitably leaves no room for bluffs
+        self.assertEqual(bluff_fractions(100.0, 100.0, value_equity=0.6), 0.0)
+
+    def test_matches_calculator_on_a_grid(self):
+        profiles = ['aggressive', 'passive', 'tight', 'loose', 'unknown']
+        stages = ['pre-flop', 'flop', 'turn', 'river', 'showdown']
+        grid = np.array(np.meshgrid(range(5), [0.1, 0.5, 0.9], [0.1, 0.3, 0.7], [-0.5, 0.0, 0.2], range(5))).reshape(5, -1).T
+        profile = np.array(profiles)[grid[:, 0].astype(int)]
+        stage = np.array(stages)[grid[:, 4].astype(int)]
+        batch = bluff_probabilities(profile, grid[:, 1], grid[:, 2], grid[:, 3], stage)
+
+        for index, row in enumerate(grid):
+            calculator = BluffProbabilityCalculator(profile[index], row[1], row[2], row[3], stage[index])
+            self.assertEqual(calculator.calculate_bluff_probability(), batch[index])
+        self.assertTrue(((batch >= 0.05) & (batch <= 0.95)).all())
+        # Hand-checked spots: 0.4 * (1.2 + 1.0 + 1.0 + 1.1) is clipped to 0.95, the minimum base chance is 0.1
+        self.assertAlmostEqual(bluff_probabilities('passive', 0.5, 0.3, 0.0, 'flop'), 0.95)
+        self.assertAlmostEqual(bluff_probabilities('aggressive', 0.9, 0.7, -0.5, 'pre-flop'), 0.1 * (0.8 + 0.5 + 0.8 + 0.9))
+
+if __name__ == "__main__":
+    unittest.main()
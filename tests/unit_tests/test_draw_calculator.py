@@ -0,0 +1,74 @@
+# test_draw_calculator.py
+
+import unittest
+import numpy as np
+from strategy_engine.card_encoding import parse_card
+from strategy_engine.post_flop_strategy.draw_calculator import (
+    HAS_STRAIGHT, STRAIGHT_OUT_RANKS, count_outs, hand_potential, hit_probability
+)
+
+def _has_straight(mask):
+    ranks = [(mask >> rank) & 1 for rank in range(13)]
+    ranks = [ranks[12]] + ranks  # Ace also plays low
+    return any(all(ranks[low:low + 5]) for low in range(10))
+
+class TestDrawCalculator(unittest.TestCase):
+
+    def test_straight_tables_match_brute_force(self):
+        for mask in np.random.default_rng(0).integers(0, 1 << 13, 500).tolist():
+            self.assertEqual(bool(HAS_STRAIGHT[mask]), _has_straight(mask))
+            expected = 0
+            if not _has_straight(mask):
+                for rank in range(13):
+                    if _has_straight(mask | 1 << rank):
+                        expected |= 1 << rank
+            self.assertEqual(int(STRAIGHT_OUT_RANKS[mask]), expected)
+
+    def test_draw_types(self):
+        combo = count_outs(['9H', 'TH'], ['8H', 'JC', '2H'])
+        self.assertTrue(combo['flush_draw'])
+        self.assertEqual(combo['straight_draw'], 'open-ended')
+        self.assertEqual(combo['outs'], 15)  # 9 flush cards + 6 offsuit sevens and queens
+
+        gutshot = count_outs(['9C', 'TD'], ['QH', 'KS', '2H'])
+        self.assertEqual(gutshot['straight_draw'], 'gutshot')
+        self.assertEqual(gutshot['outs'], 4)
+
+        wheel = count_outs(['AC', '2D'], ['3H', '4S', 'KH'])
+        self.assertEqual(wheel['straight_draw'], 'gutshot')  # A-2-3-4 only fills with a five
+        self.assertEqual(wheel['outs'], 4)
+
+        double = count_outs(['7C', '9D'], ['5H', '8S', 'JH'])
+        self.assertEqual(double['straight_draw'], 'double gutshot')  # A six or a ten
+        self.assertEqual(double['outs'], 8)
+
+        one_ended = count_outs(['KC', 'AD'], ['QH', 'JS', '4H'])
+        self.assertEqual(one_ended['straight_draw'], 'gutshot')
+
+        pair = count_outs(['7C', '7D'], ['AH', 'KS', '2H'])
+        self.assertEqual((pair['set_outs'], pair['outs']), (2, 2))
+
+    def test_board_only_straights_are_not_outs(self):
+        draw = count_outs(['2C', '2D'], ['9H', 'TS', 'JH', 'QD'])
+        self.assertIsNone(draw['straight_draw'])
+        self.assertEqual(draw['outs'], 2)
+
+    def test_straights_do_not_count_against_a_made_flush(self):
+        flush = count_outs(['9H', 'TH'], ['8H', 'JC', '2H', '4H'])
+        self.assertIsNone(flush['straight_draw'])
+        self.assertEqual(flush['outs'], 0)
+
+        # Only the suited cards that complete a straight flush remain
+        straight_flush = count_outs(['9H', 'TH'], ['8H', 'JH', '2H'])
+        self.assertEqual(straight_flush['straight_draw'], 'open-ended')
+        self.assertEqual(sorted(straight_flush['cards']), [parse_card('7H'), parse_card('QH')])
+
+    def test_hit_probability_and_potential(self):
+        self.assertAlmostEqual(hit_probability(9, 1), 9 / 46)
+        self.assertAlmostEqual(hit_probability(9, 2), 1 - (38 * 37) / (47 * 46))
+        potential = hand_potential(['9H', 'TH'], ['8H', 'JC', '2H'], num_samples=200, rng=np.random.default_rng(0))
+        self.assertGreater(potential['ppot'], 0.3)
+        self.assertGreater(potential['ehs'], potential['hand_strength'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# test_gym_wrapper.py
+
+import unittest
+import numpy as np
+import gymnasium as gym
+from rl_module.agents.action_masking import random_legal_action
+from rl_module.environment.gym_wrapper import ENV_ID, PokerGymEnv, make_vector_env
+from rl_module.environment.poker_environment import ACTIONS
+
+def always_call(state, legal_mask, rng):
+    return ACTIONS.index('call')
+
+class TestGymWrapper(unittest.TestCase):
+
+    def test_episodes_follow_the_gymnasium_api(self):
+        env = gym.make(ENV_ID, num_players=3, opponent_policy=always_call)
+        self.assertEqual(env.action_space.n, len(ACTIONS))
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            observation, info = env.reset(seed=int(rng.integers(1000)))
+            self.assertTrue(env.observation_space.contains(observation))
+            terminated = False
+            while not terminated:
+                self.assertTrue(info["action_mask"].any())
+                observation, reward, terminated, truncated, info = env.step(random_legal_action(info["action_mask"], rng))
+                self.assertFalse(truncated)
+                self.assertTrue(env.observation_space.contains(observation))
+            self.assertEqual(reward, info["payouts"][env.unwrapped.poker.agent_position])
+        env.close()
+
+    def test_seeded_resets_are_reproducible(self):
+        first, second = PokerGymEnv(num_players=4), PokerGymEnv(num_players=4)
+        first.reset(seed=5)
+        observation, info = first.reset(seed=11)
+        second.reset()
+        repeated, repeated_info = second.reset(seed=11)
+        np.testing.assert_array_equal(observation, repeated)
+        self.assertEqual(info["seed"], repeated_info["seed"])
+
+    def test_vector_env(self):
+        envs = make_vector_env(3, asynchronous=False, num_players=2)
+        observations, infos = envs.reset(seed=0)
+        self.assertEqual(observations.shape, (3, envs.single_observation_space.shape[0]))
+        self.assertEqual(infos["action_mask"].shape, (3, len(ACTIONS)))
+        _, rewards, terminated, _, _ = envs.step(np.full(3, ACTIONS.index('fold')))
+        # Folding heads-up loses the blind that was posted
+        self.assertTrue(np.all(terminated))
+        self.assertTrue(np.all(rewards < 0))
+        envs.close()
+
+if __name__ == "__main__":
+    unittest.main()
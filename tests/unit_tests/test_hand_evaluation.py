@@ -0,0 +1,45 @@
+# test_hand_evaluation.py
+
+import unittest
+from strategy_engine.post_flop_strategy.hand_evaluation import (
+    evaluate_hand, get_hand, hand_rank, is_straight, is_straight_flush, is_two_pair
+)
+
+class TestHandEvaluation(unittest.TestCase):
+
+    def test_categories_and_combinations(self):
+        cases = [
+            (['AH', 'KH'], ['QH', 'JH', 'TH', '2C', '3D'], "Royal Flush", ['AH', 'KH', 'QH', 'JH', 'TH']),
+            (['AS', '2D'], ['3H', '4C', '5S', 'KD', 'KH'], "Straight", ['5S', '4C', '3H', '2D', 'AS']),
+            (['9H', '9D'], ['9C', '4S', '4D', '4H', 'KH'], "Full House", ['9H', '9D', '9C', '4S', '4D']),
+            (['QH', 'QD'], ['5C', '5S', '2D', '2H', 'KH'], "Two Pair", ['QH', 'QD', '5C', '5S', 'KH']),
+            (['10H', '7D'], ['3C', '8S', '2D', 'JH', 'KH'], "High Card", ['KH', 'JH', '10H', '8S', '7D']),
+        ]
+        for hole, board, hand_type, cards in cases:
+            result = evaluate_hand(hole, board)
+            self.assertEqual(result["type"], hand_type)
+            self.assertEqual(result["cards"], cards)
+
+    def test_straight_flush_needs_the_same_cards(self):
+        # Flush in hearts and a straight with mixed suits is only a flush
+        cards = ['2H', '3H', '4H', '5C', '6D', '9H', 'KH']
+        self.assertTrue(is_straight(cards))
+        self.assertFalse(is_straight_flush(cards))
+        self.assertEqual(evaluate_hand(cards[:2], cards[2:])["type"], "Flush")
+        self.assertTrue(is_straight(['AH', '2D', '3C', '4S', '5H']))
+        self.assertTrue(is_straight(['6H', '7D', '7C', '8S', '9H', 'TD']))
+
+    def test_predicates(self):
+        self.assertTrue(is_two_pair(['AH', 'AD', '5C', '5S', '9H']))
+        self.assertFalse(is_two_pair(['AH', 'AD', '5C', '6S', '9H']))
+        self.assertEqual(get_hand(['3H', '3D', 'KC', 'KS', 'KH', '9D'], 3, 2), ['KC', 'KS', 'KH', '3H', '3D'])
+
+    def test_kickers_order_hands(self):
+        self.assertGreater(hand_rank(['AH', 'AD', 'KC', '7S', '2H']), hand_rank(['AS', 'AC', 'QC', 'JS', '9H']))
+        self.assertGreater(hand_rank(['6H', '2D', '3C', '4S', '5H']), hand_rank(['AH', '2D', '3C', '4S', '5H']))
+        self.assertEqual(hand_rank(['KH', 'KD', 'QC', 'QS', '2H', '3D', '9C']), hand_rank(['KS', 'KC', 'QH', 'QD', '9S']))
+        # The best five cards play: the third pair never counts as a kicker over a higher single
+        self.assertEqual(hand_rank(['KH', 'KD', 'QC', 'QS', '3H', '3D', 'AC'])[1:], (13, 12, 14))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# test_mccfr.py
+
+import unittest
+import numpy as np
+from strategy_engine.solver.mccfr import AbstractGame, InfosetTable, MCCFRSolver, solve_parallel
+
+class TestAbstractGame(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AbstractGame(stack=10.0, bet_sizes=(0.5, 1.0))
+
+    def test_small_blind_options(self):
+        actions = dict(self.game.legal_actions((0.5, 1.0), 0, 0))
+        self.assertEqual(list(actions), ['f', 'c', '0', '1', 'a'])
+        self.assertEqual(actions['c'], 1.0)
+        self.assertEqual(actions['0'], 2.0)
+        self.assertEqual(actions['a'], 10.0)
+
+    def test_facing_all_in_only_allows_fold_or_call(self):
+        actions = self.game.legal_actions((10.0, 1.0), 1, 1)
+        self.assertEqual([action for action, _ in actions], ['f', 'c'])
+
+
+class TestMCCFRSolver(unittest.TestCase):
+
+    def test_average_strategy_is_a_distribution(self):
+        solver = MCCFRSolver(AbstractGame(num_streets=1, num_preflop_buckets=3), seed=1)
+        solver.run(300)
+        for key, probabilities in solver.average_strategy().items():
+            self.assertAlmostEqual(probabilities.sum(), 1.0, msg=key)
+            self.assertTrue((probabilities >= 0).all())
+
+    def test_strongest_bucket_calls_all_in(self):
+        solver = MCCFRSolver(AbstractGame(stack=20.0, num_streets=1, num_preflop_buckets=3), seed=2)
+        solver.run(3000)
+        strategy = solver.average_strategy()
+        # Big blind holding the strongest bucket facing an all-in
+        self.assertGreater(strategy['1:0|a'][1], 0.9)
+
+    def test_merge_adds_updates_by_key(self):
+        table = InfosetTable(max_actions=3, capacity=1)
+        table.merge(['x', 'y'], ['fc', 'fc0'], np.array([[1.0, 2.0, 0.0], [1.0, 1.0, 1.0]]), np.ones((2, 3)))
+        table.merge(['y', 'z'], ['fc0', 'c0'], np.array([[1.0, 0.0, 0.0], [0.0, 5.0, 0.0]]), np.ones((2, 3)))
+        self.assertEqual(table.keys, ['x', 'y', 'z'])
+        self.assertEqual(table.labels, ['fc', 'fc0', 'c0'])
+        np.testing.assert_allclose(table.regrets[table.ids['y']], [2.0, 1.0, 1.0])
+        np.testing.assert_allclose(table.strategy_sums[table.ids['y']], [2.0, 2.0, 2.0])
+
+    def test_parallel_solve_merges_workers(self):
+        game = AbstractGame(num_streets=1, num_preflop_buckets=3)
+        solver = solve_parallel(game, iterations=80, num_workers=2, rounds=2)
+        self.assertEqual(solver.iterations, 80)
+        self.assertGreater(len(solver.table), 0)
+        for probabilities in solver.average_strategy().values():
+            self.assertAlmostEqual(probabilities.sum(), 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
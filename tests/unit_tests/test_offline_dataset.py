@@ -0,0 +1,78 @@
+# test_offline_dataset.py
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts import process_hand_histories as hh
+from rl_module.training.offline_dataset import build_offline_dataset, hand_transitions, load_offline_shards
+from strategy_engine.solver.action_abstraction import CHECK_CALL, FIRST_SIZE, FOLD
+
+class TestOfflineDataset(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Writes one processed partition with two short hands.
+        """
+        self.root = tempfile.mkdtemp()
+        raw = pd.DataFrame({
+            'hand_id': [1, 1, 1, 1, 2, 2],
+            'player_id': ['a', 'b', 'a', 'b', 'a', 'b'],
+            'action': ['raise', 'call', 'bet', 'fold', 'check', 'bet'],
+            'amount': [10, 10, 20, 0, 0, 5],
+            'result': [30, -10, 30, -10, -5, 5],
+            'timestamp': pd.date_range('2024-01-01', periods=6, freq='s'),
+            'card_1': ['Ah', '2c', 'Ah', '2c', 'Kd', 'Qs'],
+            'card_2': ['Kh', '7d', 'Kh', '7d', 'Kc', 'Js']
+        })
+        self.partition = os.path.join(self.root, "processed_hands.csv")
+        hh.save_processed_data(hh.process_hand_history(raw), self.partition)
+        self.shard_dir = os.path.join(self.root, "shards")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_transitions_are_split_into_shards(self):
+        index = build_offline_dataset([self.partition], self.shard_dir, batch_size=4, shard_size=4)
+        self.assertEqual([shard['size'] for shard in index['shards']], [4, 2])
+
+        shards = list(load_offline_shards(self.shard_dir))
+        actions = np.concatenate([shard['actions'] for shard in shards])
+        dones = np.concatenate([shard['dones'] for shard in shards])
+        rewards = np.concatenate([shard['rewards'] for shard in shards])
+        # Logged bets and raises are translated onto the bet-size abstraction: a raise to 10 into an
+        # empty pot is the largest size, the bet of 20 into 20 facing 10 is a third of the pot
+        self.assertEqual(actions.tolist(), [FIRST_SIZE + 4, CHECK_CALL, FIRST_SIZE, FOLD, CHECK_CALL, FIRST_SIZE + 4])
+        self.assertEqual(dones.tolist(), [False, False, True, True, True, True])
+        # Rewards are only credited on each player's final decision
+        self.assertEqual(rewards.tolist(), [0, 0, 30, -10, -5, 5])
+
+    def test_next_state_is_players_next_decision(self):
+        build_offline_dataset([self.partition], self.shard_dir)
+        shard = next(load_offline_shards(self.shard_dir))
+        self.assertEqual(shard['states'].shape[1], 27)
+        np.testing.assert_array_equal(shard['next_states'][0], shard['states'][2])
+        # Pot before player a's bet is 20, and the bet faced is 10
+        self.assertEqual(shard['states'][2, 7], 20)
+        self.assertEqual(shard['states'][2, 8], 10)
+
+    def test_bet_sizes_are_translated(self):
+        raw = pd.DataFrame({
+            'hand_id': [3] * 5,
+            'player_id': ['a', 'b', 'a', 'b', 'a'],
+            'action': ['bet', 'call', 'bet', 'raise', 'bet'],
+            'amount': [10, 10, 20, 60, 15],
+            'result': [0] * 5,
+            'timestamp': pd.date_range('2024-01-01', periods=5, freq='s'),
+            'card_1': ['Ah'] * 5,
+            'card_2': ['Kh'] * 5
+        })
+        fields = hand_transitions(hh.process_hand_history(raw))
+        # 20 into 20 facing 10 is a third of the pot; the raise to 60 into 40 facing 20 is 2/3 of the
+        # pot and maps to 0.75x; the later bet of 15 below the earlier 60 opens a street (15 into 100)
+        self.assertEqual(fields['actions'].tolist()[1:], [CHECK_CALL, FIRST_SIZE, FIRST_SIZE + 2, FIRST_SIZE])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,311 @@
+# test_opponent_profiling.py
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from strategy_engine.opponent_profiling.batch_profile_builder import build_profiles
+from strategy_engine.opponent_profiling.bet_size_statistics import BetSizeStats
+from strategy_engine.opponent_profiling.opponent_clustering import OpponentClusterer
+from strategy_engine.opponent_profiling.decayed_statistics import DecayedCounters
+from strategy_engine.card_encoding import COMBO_INDEX, COMBO_PREFLOP_STRENGTH, blocked_combos, parse_card
+from strategy_engine.opponent_profiling.opponent_profiling import OpponentProfile, OpponentProfiler, ProfileStore
+from strategy_engine.opponent_profiling.range_model import OpponentRangeModel
+
+class TestOpponentProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.root, "profiles.db")
+        self.profiler = OpponentProfiler()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_update_mutates_profile_in_place(self):
+        self.profiler.update_opponent('p1', 'raise')
+        profile = self.profiler.store.get('p1')
+        self.profiler.update_opponent('p1', 'raise')
+        self.assertIs(self.profiler.store.get('p1'), profile)
+        self.assertEqual(profile.aggressiveness, 2)
+        self.assertEqual(self.profiler.get_opponent_type('p1'), 'Aggressive')
+        self.assertEqual(self.profiler.get_opponent_type('nobody'), 'Unknown')
+
+    def test_profiles_use_slots(self):
+        with self.assertRaises(AttributeError):
+            OpponentProfile('p1').unknown_field = 1
+
+    def test_sqlite_round_trip(self):
+        for action in ['check', 'check', 'fold']:
+            self.profiler.update_opponent('p1', action)
+        self.profiler.update_opponent('p2', 'bet', bet_size=40)
+        self.profiler.save_profiles(self.db_path)
+
+        restored = OpponentProfiler()
+        restored.load_profiles(self.db_path)
+        self.assertEqual(restored.opponent_profiles, self.profiler.opponent_profiles)
+
+    def test_flush_only_writes_modified_profiles(self):
+        store = ProfileStore(self.db_path)
+        store.record_action('p1', 'raise')
+        store.record_action('p2', 'fold')
+        self.assertEqual(store.flush(), 2)
+        store.record_action('p2', 'fold')
+        self.assertEqual(store.flush(), 1)
+        self.assertEqual(ProfileStore(self.db_path).get('p2').fold_frequency, 2)
+
+    def test_legacy_json_profiles_load(self):
+        json_path = os.path.join(self.root, "profiles.json")
+        legacy = OpponentProfile('p1')
+        legacy.update_profile('raise')
+        with open(json_path, 'w') as file:
+            json.dump({'p1': legacy.get_profile()}, file)
+
+        self.profiler.load_profiles(json_path)
+        self.profiler.update_opponent('p1', 'raise')
+        self.assertEqual(self.profiler.store.get('p1').hands_played, 2)
+
+    def test_legacy_bet_size_list_is_converted(self):
+        profile = OpponentProfile.from_dict({'player_id': 'p1', 'hands_played': 3, 'bet_sizes': [10, 20, 30]})
+        self.assertEqual(profile.bet_size_stats.count, 3)
+        self.assertAlmostEqual(profile.bet_size_stats.moments.mean, 20)
+
+
+class TestRecentActivity(unittest.TestCase):
+
+    def test_old_behavior_fades(self):
+        profile = OpponentProfile('p1')
+        for second in range(20):
+            profile.update_profile('check', timestamp=second)
+        self.assertEqual(profile.opponent_type, 'Passive')
+
+        # A day later a handful of raises outweighs the decayed checks
+        day = 24 * 3600
+        for second in range(5):
+            profile.update_profile('raise', timestamp=day + second)
+        self.assertGreater(profile.agg_ratio, 0.6)
+        self.assertEqual(profile.opponent_type, 'Aggressive')
+        self.assertEqual(profile.aggressiveness / profile.hands_played, 0.2)
+
+    def test_late_observations_are_decayed(self):
+        observations = [(0, 0.0), (1, 50.0), (0, 100.0), (1, 400.0)]
+        in_order, shuffled = DecayedCounters(2), DecayedCounters(2)
+        for category, timestamp in observations:
+            in_order.update(category, timestamp, half_life=100)
+        for category, timestamp in [observations[index] for index in (3, 1, 0, 2)]:
+            shuffled.update(category, timestamp, half_life=100)
+        for expected, value in zip(in_order.values, shuffled.values):
+            self.assertAlmostEqual(value, expected)
+        self.assertEqual(shuffled.last_update, 400.0)
+        self.assertAlmostEqual(shuffled.ratio(0), (0.5 ** 4 + 0.5 ** 3) / (0.5 ** 4 + 0.5 ** 3.5 + 0.5 ** 3 + 1))
+
+    def test_sliding_window_expires_old_buckets(self):
+        profile = OpponentProfile('p1')
+        profile.update_profile('fold', timestamp=0)
+        profile.update_profile('raise', timestamp=60)
+        self.assertEqual(profile.window_ratio('fold'), 0.5)
+
+        window = profile.WINDOW_BUCKETS * profile.WINDOW_BUCKET_SECONDS
+        profile.update_profile('raise', timestamp=window + 1)
+        self.assertEqual(profile.window_ratio('fold'), 0.0)
+        self.assertEqual(profile.window_ratio('raise'), 1.0)
+
+    def test_recent_activity_survives_persistence(self):
+        store = ProfileStore()
+        for second, action in enumerate(['raise', 'fold', 'check', 'raise']):
+            store.record_action('p1', action, timestamp=second)
+        restored = OpponentProfile.from_row(dict(zip([name for name, _ in OpponentProfile.COLUMNS], store.get('p1').to_row())))
+        self.assertEqual(restored.get_profile(), store.get('p1').get_profile())
+        self.assertAlmostEqual(restored.agg_ratio, 0.5)
+
+
+class TestBatchProfileBuilder(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        size = 2000
+        self.history = pd.DataFrame({
+            'hand_id': np.sort(rng.integers(0, 300, size)),
+            'player_id': rng.choice(['a', 'b', 'c'], size),
+            'action': rng.choice(['raise', 'call', 'bet', 'fold', 'check', 'bluff'], size),
+            'amount': rng.integers(0, 200, size).astype(float),
+            'result': 0,
+            'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 86400, size)), unit='s'),
+            'card_1': 0,
+            'card_2': 5,
+            'hand_class': 1
+        })
+
+    def test_matches_replaying_every_action(self):
+        profiler = OpponentProfiler()
+        for row in self.history.itertuples():
+            seconds = (row.timestamp - pd.Timestamp(0)).total_seconds()
+            profiler.update_opponent(row.player_id, row.action, row.amount, timestamp=seconds)
+
+        for profile in build_profiles(self.history):
+            replayed = profiler.store.get(profile.player_id)
+            self.assertEqual(profile.hands_played, replayed.hands_played)
+            self.assertEqual(profile.aggressiveness, replayed.aggressiveness)
+            self.assertEqual(profile.window_actions.buckets, replayed.window_actions.buckets)
+            np.testing.assert_allclose(profile.recent_actions.values, replayed.recent_actions.values)
+            self.assertAlmostEqual(profile.bet_size_stats.moments.mean, replayed.bet_size_stats.moments.mean)
+            self.assertEqual(profile.bet_size_stats.histogram.counts, replayed.bet_size_stats.histogram.counts)
+            self.assertEqual(profile.opponent_type, replayed.opponent_type)
+
+    def test_hand_level_features(self):
+        history = pd.DataFrame({
+            'hand_id': [1, 1, 1, 2, 2],
+            'player_id': ['a', 'b', 'a', 'a', 'b'],
+            'action': ['raise', 'fold', 'call', 'check', 'bet'],
+            'amount': [10, 0, 10, 0, 20],
+            'result': 0,
+            'timestamp': pd.date_range('2024-01-01', periods=5, freq='s'),
+            'card_1': 0,
+            'card_2': 5,
+            'hand_class': 1
+        })
+        profiles = {profile.player_id: profile for profile in build_profiles(history)}
+        self.assertEqual(profiles['a'].vpip, 0.5)
+        self.assertEqual(profiles['a'].pfr, 0.5)
+        self.assertEqual(profiles['a'].aggression_factor, 1.0)
+        self.assertEqual(profiles['b'].fold_to_bet, 1.0)
+
+
+class TestBetSizeStats(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(7).lognormal(3, 1, 20000)
+        self.stats = BetSizeStats.from_values(self.values.tolist())
+
+    def test_moments_match_numpy(self):
+        self.assertAlmostEqual(self.stats.moments.mean, self.values.mean(), places=6)
+        self.assertAlmostEqual(self.stats.moments.std, self.values.std(ddof=1), places=6)
+
+    def test_histogram_counts_every_value(self):
+        self.assertEqual(sum(self.stats.histogram.counts), len(self.values))
+
+    def test_quantiles_are_close(self):
+        for q in (0.1, 0.5, 0.9, 0.99):
+            expected = np.quantile(self.values, q)
+            self.assertLess(abs(self.stats.sketch.quantile(q) - expected) / expected, 0.03)
+
+    def test_memory_is_bounded(self):
+        self.assertLessEqual(len(self.stats.sketch.centroids), self.stats.sketch.compression)
+        restored = BetSizeStats.from_dict(self.stats.to_dict())
+        self.assertEqual(restored.summary(), self.stats.summary())
+
+class TestOpponentClustering(unittest.TestCase):
+
+    def test_cold_start_assigns_archetypes(self):
+        clusterer = OpponentClusterer()
+        self.assertEqual(clusterer.label(clusterer.assign([0.9, 0.05, 0.05, 0.0])), 'Aggressive')
+        self.assertEqual(clusterer.label(clusterer.assign([0.05, 0.9, 0.05, 0.0])), 'Tight')
+        self.assertEqual(clusterer.label(clusterer.assign([0.0, 0.1, 0.9, 0.0])), 'Passive')
+        batch = np.array([[0.9, 0.05, 0.05, 0.0], [0.05, 0.9, 0.05, 0.0]])
+        self.assertEqual(clusterer.assign(batch).tolist(), [0, 1])
+
+    def test_partial_fit_moves_centroids_towards_data(self):
+        clusterer = OpponentClusterer(n_clusters=6)
+        rng = np.random.default_rng(0)
+        data = rng.dirichlet((1, 1, 12, 1), 400)
+        before = clusterer.centroids.copy()
+        for batch in np.array_split(data, 4):
+            clusterer.partial_fit(batch)
+        passive = clusterer.assign(data.mean(axis=0))
+        self.assertEqual(clusterer.label(passive), 'Passive')
+        self.assertLess(np.abs(clusterer.centroids[passive] - data.mean(axis=0)).sum(),
+                        np.abs(before[passive] - data.mean(axis=0)).sum())
+        self.assertEqual(clusterer.counts.sum(), 6 * 10 + 400)
+
+    def test_refits_sample_mini_batches_and_keep_adapting(self):
+        store = ProfileStore(clusterer=OpponentClusterer(max_count=100), seed=0)
+        for index in range(50):
+            profile = store.get_or_create(f'p{index}')
+            for second in range(25):
+                profile.update_profile('fold', timestamp=second)
+        before = store.clusterer.counts.sum()
+        store.refit_clusters(batch_size=8)
+        self.assertEqual(store.clusterer.counts.sum(), before + 8)
+        for _ in range(100):
+            store.refit_clusters(batch_size=8)
+        # Counts are capped, so the learning rate does not decay towards zero
+        self.assertTrue(np.all(store.clusterer.counts <= 100))
+
+    def test_refit_and_persist_clusters(self):
+        root = tempfile.mkdtemp()
+        try:
+            db_path = os.path.join(root, "profiles.db")
+            profiler = OpponentProfiler()
+            for second in range(30):
+                profiler.update_opponent('nit', 'fold', timestamp=second)
+                profiler.update_opponent('maniac', 'raise', timestamp=second)
+            profiler.classify_all_opponents()
+            self.assertEqual(profiler.get_opponent_type('nit'), 'Tight')
+            self.assertEqual(profiler.get_opponent_type('maniac'), 'Aggressive')
+            profiler.save_profiles(db_path)
+
+            restored = OpponentProfiler(ProfileStore(db_path))
+            np.testing.assert_allclose(restored.store.clusterer.centroids, profiler.store.clusterer.centroids)
+            self.assertEqual(restored.store.get('nit').cluster, profiler.store.get('nit').cluster)
+        finally:
+            shutil.rmtree(root)
+
+
+class TestRangeModel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = OpponentRangeModel()
+
+    def test_raise_shifts_range_towards_strong_hands(self):
+        prior = self.model.posterior('p1', [])
+        raised = self.model.posterior('p1', [('preflop', 'raise')])
+        folded = self.model.posterior('p1', [('preflop', 'fold')])
+        self.assertAlmostEqual(raised.sum(), 1.0)
+        self.assertGreater(raised @ COMBO_PREFLOP_STRENGTH, prior @ COMBO_PREFLOP_STRENGTH)
+        self.assertLess(folded @ COMBO_PREFLOP_STRENGTH, prior @ COMBO_PREFLOP_STRENGTH)
+
+    def test_board_and_dead_cards_are_excluded(self):
+        board = ['Ah', 'Kd', '7c']
+        weights = self.model.posterior('p1', [('preflop', 'call'), ('flop', 'bet')], board=board, dead_cards=['Qs', 'Qh'])
+        ace, king, queen = parse_card('Ah'), parse_card('Kd'), parse_card('Qs')
+        self.assertEqual(weights[COMBO_INDEX[ace, king]], 0.0)
+        self.assertEqual(weights[COMBO_INDEX[queen, parse_card('2c')]], 0.0)
+        self.assertGreater(weights[COMBO_INDEX[parse_card('As'), parse_card('Ks')]], 0.0)
+
+    def test_full_board_is_excluded_for_earlier_street_histories(self):
+        board = ['2h', '7c', 'Kh']
+        for history in ([], [('preflop', 'raise')]):
+            weights = self.model.posterior('p1', history, board=board)
+            self.assertEqual(weights[blocked_combos([parse_card(card) for card in board])].sum(), 0.0)
+            self.assertAlmostEqual(weights.sum(), 1.0)
+
+    def test_prefix_posteriors_are_cached(self):
+        self.model.posterior('p1', [('preflop', 'raise')])
+        misses = self.model.misses
+        self.model.posterior('p1', [('preflop', 'raise'), ('flop', 'bet')], board=['2h', '5d', '9c'])
+        # Only the new action is computed; the preflop prefix comes from the cache
+        self.assertEqual(self.model.misses, misses + 1)
+        self.model.posterior('p1', [('preflop', 'raise'), ('flop', 'bet')], board=['2h', '5d', '9c'])
+        self.assertEqual(self.model.misses, misses + 1)
+
+    def test_showdown_updates_prior(self):
+        before = self.model.posterior('p1', [('preflop', 'raise')])
+        for _ in range(5):
+            self.model.observe_showdown('p1', ['7h', '2d'])
+        after = self.model.posterior('p1', [('preflop', 'raise')])
+        combo = COMBO_INDEX[parse_card('7c'), parse_card('2s')]
+        self.assertGreater(after[combo], before[combo])
+
+    def test_profiler_exposes_ranges(self):
+        profiler = OpponentProfiler()
+        for _ in range(10):
+            profiler.update_opponent('p1', 'raise')
+        weights = profiler.get_opponent_range('p1', [('preflop', 'raise')], dead_cards=['Ah', 'Ad'])
+        self.assertEqual(weights.shape, (1326,))
+        self.assertAlmostEqual(weights.sum(), 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
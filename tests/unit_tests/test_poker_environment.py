@@ -0,0 +1,117 @@
+# test_poker_environment.py
+
+import random
+import unittest
+import numpy as np
+from strategy_engine.card_encoding import parse_card
+from rl_module.environment.poker_environment import PokerEnvironment
+
+def _codes(cards):
+    return [parse_card(card) for card in cards]
+
+class TestPokerEnvironment(unittest.TestCase):
+
+    def test_blinds_and_action_order(self):
+        env = PokerEnvironment(num_players=4, starting_stack=100)
+        state = env.reset()
+        self.assertEqual(env.button, 0)
+        self.assertEqual(state["bets"].tolist(), [0, 1, 2, 0])
+        self.assertEqual(state["current_player"], 3)
+        self.assertEqual((state["to_call"], state["min_raise_to"]), (2, 4))
+
+        heads_up = PokerEnvironment(num_players=2, starting_stack=100)
+        state = heads_up.reset()
+        self.assertEqual(state["bets"][heads_up.button], 1)
+        self.assertEqual(state["current_player"], heads_up.button)
+
+    def test_round_closure_and_folded_players_are_skipped(self):
+        env = PokerEnvironment(num_players=4, starting_stack=100)
+        env.reset()
+        env.step("fold")                # Seat 3
+        env.step("call")                # Seat 0 (button)
+        env.step("call")                # Small blind completes
+        state, _, _, _ = env.step("check")  # Big blind closes the round
+        self.assertEqual(state["betting_round"], 1)
+        self.assertEqual(len(state["community_cards"]), 3)
+        self.assertEqual(state["current_player"], 1)
+        env.step("check")
+        env.step("check")
+        state, _, _, _ = env.step("check")
+        self.assertEqual(state["betting_round"], 2)
+        self.assertEqual(state["current_player"], 1)  # Seat 3 folded and never acts again
+
+    def test_min_raise_and_incomplete_all_in(self):
+        env = PokerEnvironment(num_players=3, starting_stack=100)
+        env.reset()                             # Button 0, blinds 1 and 2, seat 0 first to act
+        env.stacks[2] = 10                      # The big blind only has 12 in total
+        with self.assertRaises(ValueError):
+            env.step("check")                   # Seat 0 faces the big blind
+        self.assertEqual((env.current_player, env.bets[0]), (0, 0))
+        env.step("raise", amount=3)             # Clamped to the minimum raise (to 4)
+        self.assertEqual(env.current_bet, 4)
+        env.step("raise", amount=10)            # Small blind raises by 6
+        self.assertEqual((env.min_raise, env.min_raise_to(2)), (6, 12))
+        env.step("all-in")                      # Big blind all-in to 12: a full raise of only 2
+        self.assertEqual(env.current_bet, 12)
+        self.assertEqual(env.current_player, 0)
+        self.assertTrue(env.can_raise(0))       # Seat 0 faced the small blind's full raise
+        env.step("call")
+        self.assertFalse(env.can_raise(1))      # The small blind only faced the incomplete all-in
+        with self.assertRaises(ValueError):
+            env.step("raise")
+
+    def test_side_pots(self):
+        env = PokerEnvironment(num_players=3, starting_stack=100)
+        env.reset()
+        env.agent_position = 2
+        env.hole_cards[:] = [_codes(['Ah', 'Ad']), _codes(['Kh', 'Kd']), _codes(['2c', '7d'])]
+        env.deck[env.deck_position:env.deck_position + 5] = _codes(['3s', '8s', '9h', 'Jc', '4d'])
+        env.stacks[0] = 20                      # Seat 0 (button) has 20 behind the blinds
+        env.step("all-in")                      # Seat 0 all-in for 20
+        env.step("all-in")                      # Seat 1 all-in for 100
+        state, reward, done, _ = env.step("call")  # Seat 2 calls 100
+        self.assertTrue(done)
+        self.assertEqual(len(state["community_cards"]), 5)
+        # Aces win the 60-chip main pot, kings the 160-chip side pot
+        self.assertEqual(state["stacks"].tolist(), [60, 160, 0])
+        self.assertEqual(reward, -100)
+
+    def test_random_hands_conserve_chips(self):
+        random.seed(0)
+        env = PokerEnvironment(num_players=6, starting_stack=50)
+        for _ in range(300):
+            env.reset()
+            done = False
+            while not done:
+                draw = random.random()
+                action = 'fold' if draw < 0.2 else 'raise' if draw > 0.75 and env.can_raise() else 'call'
+                _, _, done, info = env.step(action, amount=random.randint(0, 60))
+            self.assertEqual(env.stacks.sum(), 6 * 50)
+            self.assertEqual(info["payouts"].sum(), 0)
+            self.assertTrue(np.all(env.stacks >= 0))
+
+    def test_seeded_hands_replay_exactly(self):
+        rng = np.random.default_rng(1)
+        env = PokerEnvironment(num_players=4, seed=7)
+        self.assertEqual(PokerEnvironment(num_players=4, seed=7).agent_position, env.agent_position)
+        for _ in range(20):
+            state = env.reset()
+            done = False
+            while not done:
+                state, reward, done, info = env.step(rng.choice(np.flatnonzero(env.legal_action_mask())))
+            replayed, _, replayed_done, replayed_info = PokerEnvironment(num_players=4).replay(
+                info["seed"], info["button"], info["history"])
+            self.assertTrue(replayed_done)
+            self.assertEqual(replayed["community_cards"], state["community_cards"])
+            self.assertEqual(replayed_info["payouts"].tolist(), info["payouts"].tolist())
+
+        # Generators with the same seed deal the same hands; spawned streams deal different ones
+        first, second = (PokerEnvironment(seed=3).reset()["agent_hand"] for _ in range(2))
+        self.assertEqual(first, second)
+        streams = [PokerEnvironment(seed=child) for child in np.random.SeedSequence(3).spawn(2)]
+        for stream in streams:
+            stream.reset()
+        self.assertNotEqual(streams[0].hole_cards.tolist(), streams[1].hole_cards.tolist())
+
+if __name__ == "__main__":
+    unittest.main()
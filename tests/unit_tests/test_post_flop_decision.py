@@ -0,0 +1,64 @@
+# test_post_flop_decision.py
+
+import unittest
+from strategy_engine.card_encoding import blocked_combos, parse_card
+from strategy_engine.opponent_profiling.opponent_profiling import OpponentProfiler
+from strategy_engine.post_flop_strategy.post_flop_decision import PostFlopEngine
+
+class CountingEngine(PostFlopEngine):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.simulations = 0
+
+    def _simulate(self, hole, board, weights):
+        self.simulations += 1
+        return super()._simulate(hole, board, weights)
+
+
+class TestPostFlopEngine(unittest.TestCase):
+
+    def test_equity_is_computed_once_per_street(self):
+        engine = CountingEngine(num_samples=50, seed=0)
+        engine.decide(['AS', 'KD'], ['2H', '7C', 'KH'], 100, 0)
+        engine.decide(['KD', 'AS'], ['KH', '2H', '7C'], 150, 50)
+        self.assertEqual(engine.simulations, 1)
+        engine.decide(['AS', 'KD'], ['2H', '7C', 'KH', '9S'], 250, 0)
+        self.assertEqual(engine.simulations, 2)
+
+    def test_made_hands_beat_air(self):
+        engine = PostFlopEngine(num_samples=200, seed=1)
+        strong = engine.equity(['AS', 'AD'], ['AH', '7C', '2D'])
+        weak = engine.equity(['3S', '4D'], ['AH', 'KC', 'QD', 'JH', '9C'])
+        self.assertGreater(strong, 0.8)
+        self.assertLess(weak, 0.3)
+        self.assertEqual(engine.decide(['3S', '4D'], ['AH', 'KC', 'QD', 'JH', '9C'], 100, 100), 'fold')
+        self.assertEqual(engine.decide(['AS', 'AD'], ['AH', '7C', '2D'], 100, 50), 'raise')
+
+    def test_uses_opponent_range_and_fold_tendency(self):
+        profiler = OpponentProfiler()
+        for _ in range(10):
+            profiler.update_opponent('nit', 'fold')
+        profiler.store.get('nit').fold_to_bet = 0.9
+        engine = PostFlopEngine(profiler=profiler, num_samples=100, seed=2)
+        # Air still bets against an opponent who folds to 90% of bets
+        self.assertEqual(engine.decide(['3S', '4D'], ['AH', 'KC', 'QD'], 100, 0, opponent_id='nit'), 'raise')
+        self.assertEqual(PostFlopEngine(num_samples=100, seed=2).decide(['3S', '4D'], ['AH', 'KC', 'QD'], 100, 0), 'check')
+
+    def test_opponent_range_excludes_our_hole_cards(self):
+        profiler = OpponentProfiler()
+        for _ in range(10):
+            profiler.update_opponent('p1', 'raise')
+        engine = PostFlopEngine(profiler=profiler, num_samples=50, seed=3)
+        hole, board = (parse_card('AS'), parse_card('KD')), (parse_card('2H'), parse_card('7C'), parse_card('KH'))
+        history = [('preflop', 'raise')]
+        # A raiser's range holds plenty of AS and KD combos until our hole cards are blocked
+        unblocked = profiler.get_opponent_range('p1', history, board)
+        self.assertGreater(unblocked[blocked_combos(hole)].sum(), 0.05)
+        weights = engine.opponent_range(hole, board, opponent_id='p1', opponent_history=history)
+        self.assertEqual(weights[blocked_combos(hole)].sum(), 0.0)
+        self.assertEqual(weights[blocked_combos(board)].sum(), 0.0)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+# test_pot_odds_calculator.py
+
+import unittest
+import numpy as np
+from strategy_engine.post_flop_strategy.pot_odds_calculator import (
+    bet_ev_array, calculate_implied_odds, calculate_pot_odds, call_ev_array, fold_equity_array,
+    implied_odds_array, pot_odds_array, should_call, should_call_array
+)
+
+class TestPotOddsArrays(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pots = rng.uniform(10, 500, 200)
+        self.bets = rng.uniform(1, 300, 200)
+        self.equities = rng.uniform(0, 100, 200)
+
+    def test_matches_scalar_functions(self):
+        pot_odds = pot_odds_array(self.pots, self.bets)
+        implied = implied_odds_array(self.pots, self.bets, 50.0)
+        calls = should_call_array(self.pots, self.bets, self.equities)
+        for index in range(len(self.pots)):
+            pot, bet, equity = self.pots[index], self.bets[index], self.equities[index]
+            self.assertAlmostEqual(pot_odds[index], calculate_pot_odds(pot, bet))
+            self.assertAlmostEqual(implied[index], calculate_implied_odds(pot, bet, 50.0))
+            self.assertEqual(calls[index], should_call(pot, bet, equity))
+
+    def test_checks_are_masked_instead_of_raising(self):
+        pot_odds = pot_odds_array([100.0, 100.0], [0.0, 25.0])
+        self.assertTrue(pot_odds.mask[0])
+        self.assertAlmostEqual(pot_odds[1], 20.0)
+        self.assertEqual(should_call_array([100.0, 100.0], [0.0, 25.0], 10.0).tolist(), [True, False])
+
+    def test_expected_values(self):
+        np.testing.assert_allclose(call_ev_array([100.0, 80.0], [25.0, 0.0], [35.0, 50.0]), [18.75, 40.0])
+        np.testing.assert_allclose(fold_equity_array(100.0, [0.0, 50.0]), [0.0, 50.0])
+        # Pot-sized bluff with no equity breaks even when it works half the time
+        self.assertAlmostEqual(float(bet_ev_array(100.0, 100.0, 0.0, 50.0)), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# test_preflop_charts.py
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from strategy_engine.card_encoding import HAND_CLASS_COMBOS, HAND_CLASS_INDEX, NUM_COMBOS, NUM_HAND_CLASSES
+from strategy_engine.pre_flop_strategy.pre_flop_rules import make_pre_flop_decision
+from strategy_engine.pre_flop_strategy.preflop_charts import (
+    ACTIONS, FACING, PreflopChart, default_chart, seat_index, stack_buckets
+)
+
+class TestPreflopCharts(unittest.TestCase):
+
+    def setUp(self):
+        self.chart = default_chart()
+
+    def test_frequencies_are_distributions(self):
+        np.testing.assert_allclose(self.chart.frequencies.sum(axis=-1), 1.0, atol=1e-6)
+        self.assertTrue((self.chart.frequencies >= 0).all())
+
+    def test_opening_ranges_widen_towards_the_button(self):
+        classes = np.arange(NUM_HAND_CLASSES)
+        shares = self.chart.lookup(9, np.arange(7)[:, None], 100, 'unopened', classes)[..., 2] @ HAND_CLASS_COMBOS / NUM_COMBOS
+        self.assertTrue(np.all(np.diff(shares) > 0))
+        self.assertEqual(self.chart.decide('AA', 9, 'UTG'), 'raise')
+        self.assertEqual(self.chart.decide('72o', 9, 'UTG'), 'fold')
+        self.assertEqual(self.chart.decide('72o', 6, 'BB', facing='unopened'), 'call')
+
+    def test_batch_matches_scalar_lookups(self):
+        rng = np.random.default_rng(0)
+        players = rng.integers(2, 10, 300)
+        seats = (rng.random(300) * players).astype(int)
+        stacks = rng.uniform(5, 200, 300)
+        facing = rng.integers(0, len(FACING), 300)
+        classes = rng.integers(0, NUM_HAND_CLASSES, 300)
+        batch = self.chart.actions(players, seats, stacks, facing, classes)
+        for index in range(0, 300, 17):
+            frequencies = self.chart.frequencies[players[index] - 2, seats[index], stack_buckets(stacks[index]),
+                                                 facing[index], classes[index]]
+            self.assertEqual(batch[index], frequencies.argmax())
+        with self.assertRaises(ValueError):
+            self.chart.lookup(4, 5, 100, 0, 0)
+
+    def test_overrides_and_persistence(self):
+        chart = PreflopChart(self.chart.frequencies.copy())
+        chart.set_ranges(6, 'CO', 3, 'raised', raise_range='QQ+, AKs', call_range='JJ-99, AQs')
+        self.assertEqual(chart.decide('KK', 6, 'CO', 50, 'raised'), 'raise')
+        self.assertEqual(chart.decide('TT', 6, 'CO', 50, 'raised'), 'call')
+        self.assertEqual(chart.decide('AJs', 6, 'CO', 50, 'raised'), 'fold')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'chart.npy')
+            chart.save(path)
+            np.testing.assert_array_equal(PreflopChart.load(path).frequencies, chart.frequencies)
+
+    def test_positions_and_rules_integration(self):
+        self.assertEqual(seat_index('late', 6), 3)
+        self.assertEqual(seat_index('BTN', 9), 6)
+        self.assertEqual(seat_index('early', 2), 0)
+        decision = make_pre_flop_decision('T9s', 'BTN', 'neutral', 2.0, chart=self.chart, num_players=6)
+        self.assertIn(decision, ACTIONS)
+        self.assertEqual(decision, ACTIONS[int(self.chart.lookup(6, 3, 100, 0, HAND_CLASS_INDEX['T9s']).argmax())])
+
+    def test_utg_is_the_first_seat_at_short_tables(self):
+        self.assertEqual(seat_index('UTG', 6), seat_index('LJ', 6))
+        self.assertEqual(seat_index('UTG+1', 7), 0)
+        self.assertEqual(seat_index('UTG+1', 9), 1)
+        with self.assertRaises(ValueError):
+            seat_index('CO', 2)
+        decision = make_pre_flop_decision('AKs', 'UTG', 'tight', 0.3, chart=self.chart)
+        self.assertEqual(decision, ACTIONS[int(self.chart.lookup(6, 0, 100, 0, HAND_CLASS_INDEX['AKs']).argmax())])
+
+if __name__ == "__main__":
+    unittest.main()
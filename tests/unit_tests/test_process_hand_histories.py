@@ -0,0 +1,137 @@
+# test_process_hand_histories.py
+
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from scripts import process_hand_histories as hh
+from strategy_engine.card_encoding import HAND_CLASS_NAMES, parse_card, hand_class_id
+
+class TestIncrementalProcessing(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Creates a temporary raw/processed directory pair with two small hand history files.
+        """
+        self.root = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.root, "hand_history")
+        self.output_dir = os.path.join(self.root, "processed")
+        os.makedirs(self.input_dir)
+        self.write_history("session_1.csv", hand_id=1)
+        self.write_history("session_2.csv", hand_id=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_history(self, filename, hand_id, amount=10):
+        pd.DataFrame({
+            'hand_id': [hand_id, hand_id],
+            'player_id': ['p1', 'p2'],
+            'action': ['raise', 'fold'],
+            'amount': [amount, 0],
+            'result': [15, -5],
+            'timestamp': ['2024-01-01 10:00:00', '2024-01-01 10:00:05'],
+            'card_1': ['Ah', 'Ks'],
+            'card_2': ['Kh', '10 of Diamonds']
+        }).to_csv(os.path.join(self.input_dir, filename), index=False)
+
+    def run_ingestion(self):
+        return hh.process_all_hand_histories(self.input_dir, self.output_dir)
+
+    def test_first_run_processes_everything(self):
+        summary = self.run_ingestion()
+        self.assertEqual(summary['processed'], ['session_1.csv', 'session_2.csv'])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "manifest.json")))
+
+    def test_unchanged_files_are_skipped(self):
+        self.run_ingestion()
+        summary = self.run_ingestion()
+        self.assertEqual(summary['processed'], [])
+        self.assertEqual(summary['skipped'], ['session_1.csv', 'session_2.csv'])
+
+    def test_touched_file_with_same_content_is_skipped(self):
+        self.run_ingestion()
+        path = os.path.join(self.input_dir, "session_1.csv")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        summary = self.run_ingestion()
+        self.assertEqual(summary['processed'], [])
+
+    def test_changed_file_is_reprocessed(self):
+        self.run_ingestion()
+        self.write_history("session_2.csv", hand_id=2, amount=250)
+        summary = self.run_ingestion()
+        self.assertEqual(summary['processed'], ['session_2.csv'])
+
+    def test_deleted_file_drops_partition(self):
+        self.run_ingestion()
+        os.remove(os.path.join(self.input_dir, "session_1.csv"))
+        summary = self.run_ingestion()
+        self.assertEqual(summary['removed'], ['session_1.csv'])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "processed_session_1.csv.csv")))
+        self.assertNotIn('session_1.csv', hh.load_manifest(os.path.join(self.output_dir, "manifest.json")))
+
+    def test_forced_run_still_drops_deleted_partitions(self):
+        self.run_ingestion()
+        os.remove(os.path.join(self.input_dir, "session_1.csv"))
+        summary = hh.process_all_hand_histories(self.input_dir, self.output_dir, force=True)
+        self.assertEqual(summary['processed'], ['session_2.csv'])
+        self.assertEqual(summary['removed'], ['session_1.csv'])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "processed_session_1.csv.csv")))
+
+class TestCardParsing(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = pd.DataFrame({
+            'hand_id': [1, 1, 2, 2],
+            'player_id': ['p1', 'p2', 'p1', 'p2'],
+            'action': ['raise', 'call', 'bet', 'fold'],
+            'amount': [10, 10, 20, 0],
+            'result': [20, -10, None, 0],
+            'timestamp': ['2024-01-01 10:00:00'] * 4,
+            'card_1': ['Ah', '10 of Spades', 'Qd', 'Xx'],
+            'card_2': ['Kh', 'Td', '7c', '2s'],
+            'seat': [1, 2, 1, 2]
+        })
+
+    def test_card_codes_keep_suits(self):
+        self.assertEqual(parse_card('2h'), 0)
+        self.assertEqual(parse_card('AS'), 51)
+        self.assertEqual(parse_card('10 of Spades'), parse_card('Ts'))
+        self.assertEqual(parse_card('Ace'), -1)
+
+    def test_hand_classes_distinguish_suited_and_offsuit(self):
+        self.assertEqual(HAND_CLASS_NAMES[hand_class_id(['Ah', 'Kh'])], 'AKs')
+        self.assertEqual(HAND_CLASS_NAMES[hand_class_id(['Kd', 'Ah'])], 'AKo')
+        self.assertEqual(HAND_CLASS_NAMES[hand_class_id(['7c', '7d'])], '77')
+        self.assertEqual(hand_class_id('AK'), hand_class_id('AKo'))
+        self.assertEqual(len(set(HAND_CLASS_NAMES)), 169)
+
+    def test_process_hand_history(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            processed = hh.process_hand_history(self.raw)
+        # Row 3 has a missing result and row 4 an unparseable card
+        self.assertEqual(processed['hand_id'].tolist(), [1, 1])
+        self.assertEqual(processed['card_1'].tolist(), [parse_card('Ah'), parse_card('Ts')])
+        self.assertEqual([HAND_CLASS_NAMES[c] for c in processed['hand_class']], ['AKs', 'TT'])
+        self.assertTrue(np.issubdtype(processed['timestamp'].dtype, np.datetime64))
+        self.assertNotIn('seat', processed.columns)
+        self.assertEqual(len(self.raw), 4)
+
+    def test_processed_round_trip(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, "processed.csv")
+            hh.save_processed_data(hh.process_hand_history(self.raw), path)
+            loaded = hh.load_processed_data(path)
+            self.assertEqual(loaded['card_1'].dtype, np.int8)
+            self.assertEqual(loaded['hand_class'].dtype, np.int16)
+        finally:
+            shutil.rmtree(root)
+
+if __name__ == "__main__":
+    unittest.main()
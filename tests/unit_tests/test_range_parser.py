@@ -0,0 +1,55 @@
+# test_range_parser.py
+
+import unittest
+import numpy as np
+from strategy_engine.card_encoding import COMBOS, COMBO_HAND_CLASS, HAND_CLASS_NAMES, combo_index, parse_card
+from strategy_engine.pre_flop_strategy.pre_flop_rules import evaluate_hand_strength
+from strategy_engine.pre_flop_strategy.range_parser import class_value_table, range_class_weights, range_mask, range_weights
+
+def _classes(range_text):
+    return sorted(HAND_CLASS_NAMES[index] for index in np.flatnonzero(range_class_weights(range_text)))
+
+class TestRangeParser(unittest.TestCase):
+
+    def test_notation(self):
+        self.assertEqual(_classes('TT+'), sorted(['TT', 'JJ', 'QQ', 'KK', 'AA']))
+        self.assertEqual(_classes('66-88'), sorted(['66', '77', '88']))
+        self.assertEqual(_classes('KTo+'), sorted(['KTo', 'KJo', 'KQo']))
+        self.assertEqual(_classes('A2s-A5s'), sorted(['A2s', 'A3s', 'A4s', 'A5s']))
+        self.assertEqual(_classes('qj'), sorted(['QJs', 'QJo']))
+        self.assertEqual(range_mask('22+, AK').sum(), 78 + 16)
+        for bad in ('AKx', 'AA-KQ', 'AKs-QJs', '77s', 'AhAh'):
+            with self.assertRaises(ValueError):
+                range_mask(bad)
+
+    def test_weights_combos_and_dead_cards(self):
+        weights = range_weights('AKs, AhKh:0.25')
+        self.assertEqual(weights[combo_index(parse_card('Ah'), parse_card('Kh'))], 0.25)
+        self.assertEqual(weights.sum(), 3.25)
+        self.assertFalse(weights.flags.writeable)
+        self.assertIs(range_weights('AKs, AhKh:0.25'), weights)
+
+        live = range_mask('AA, KK', dead_cards=['As', 'Kd'])
+        self.assertEqual(live.sum(), 6)
+        self.assertTrue(np.all(COMBOS[live] != parse_card('As')))
+        self.assertTrue(np.all(np.isin(COMBO_HAND_CLASS[live], [0, 14])))
+        for bad in (['ZZ'], ['As', 'Kx'], [-1]):
+            with self.assertRaises(ValueError):
+                range_weights('AA', dead_cards=bad)
+
+    def test_class_value_table_keeps_fractional_values(self):
+        table = class_value_table({'AA': 0.5, 'KK': 2.7, 'AA, KK': 1})
+        self.assertEqual(table[HAND_CLASS_NAMES.index('AA')], 1.0)
+        self.assertEqual(table[HAND_CLASS_NAMES.index('KK')], 2.7)
+        self.assertEqual(table[HAND_CLASS_NAMES.index('QQ')], 0.0)
+        self.assertEqual(class_value_table({'AA': 0.5})[HAND_CLASS_NAMES.index('AA')], 0.5)
+
+    def test_pre_flop_rankings_use_ranges(self):
+        self.assertEqual(evaluate_hand_strength('A3s'), 4)
+        self.assertEqual(evaluate_hand_strength('A6s'), 0)
+        self.assertEqual(evaluate_hand_strength('AKs'), 8)
+        self.assertEqual(evaluate_hand_strength('AK'), 6)
+        self.assertEqual(evaluate_hand_strength('nonsense'), 0)
+
+if __name__ == "__main__":
+    unittest.main()
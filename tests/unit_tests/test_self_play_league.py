@@ -0,0 +1,144 @@
+# test_self_play_league.py
+
+import multiprocessing
+import unittest
+import numpy as np
+from rl_module.environment.poker_environment import ACTIONS
+from rl_module.environment.state_representation import StateRepresentation
+from rl_module.training.self_play_league import SelfPlayLeague, SnapshotPool, mlp_logits, parameter_shapes
+
+def random_weights(layer_sizes, rng):
+    return [rng.normal(0, 0.05, shape).astype(np.float32) for shape in parameter_shapes(layer_sizes)]
+
+def learner_actions(masks):
+    # Checks or calls wherever possible
+    return np.where(masks[:, 1], 1, masks.argmax(axis=1))
+
+def play_in_worker(name, layer_sizes, capacity, results):
+    # Runs in a separate process: attaches to the pool by name and plays a few hands from it
+    pool = SnapshotPool.attach(name, layer_sizes, capacity)
+    league = SelfPlayLeague(pool, num_tables=4, num_players=3, starting_stack=100, seed=2)
+    _, masks = league.reset()
+    hands = 0
+    for _ in range(20):
+        _, _, dones, masks = league.step(learner_actions(masks))
+        hands += int(dones.sum())
+    results.put((league.layers[0][0][league.cached].copy(), league.cached_generations.copy(), hands))
+    pool.close()
+
+class TestSelfPlayLeague(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.layer_sizes = [StateRepresentation(3).state_size, 16, len(ACTIONS)]
+        self.pool = SnapshotPool(self.layer_sizes, capacity=3)
+
+    def tearDown(self):
+        self.pool.close()
+        self.pool.unlink()
+
+    def test_pool_is_shared_and_keeps_the_latest_snapshots(self):
+        snapshots = [random_weights(self.layer_sizes, self.rng) for _ in range(4)]
+        self.assertEqual([self.pool.add(weights) for weights in snapshots], [0, 1, 2, 0])
+        attached = SnapshotPool.attach(self.pool.name, self.layer_sizes, capacity=3)
+        self.assertEqual(len(attached), 3)
+        np.testing.assert_array_equal(attached.layers[0][0][0], snapshots[3][0])
+        np.testing.assert_array_equal(attached.layers[1][1][2], snapshots[2][3])
+        attached.close()
+        with self.assertRaises(ValueError):
+            self.pool.add(snapshots[0][:2])
+
+    def test_batched_inference_matches_each_snapshot(self):
+        snapshots = [random_weights(self.layer_sizes, self.rng) for _ in range(3)]
+        for weights in snapshots:
+            self.pool.add(weights)
+        observations = self.rng.normal(size=(10, self.layer_sizes[0])).astype(np.float32)
+        ids = self.rng.integers(3, size=10)
+        logits = mlp_logits(self.pool.layers, ids, observations)
+        for row, snapshot in enumerate(ids.tolist()):
+            w1, b1, w2, b2 = snapshots[snapshot]
+            expected = np.maximum(observations[row] @ w1 + b1, 0) @ w2 + b2
+            np.testing.assert_allclose(logits[row], expected, rtol=1e-5, atol=1e-6)
+
+    def test_league_plays_the_learner_seat_only(self):
+        for _ in range(2):
+            self.pool.add(random_weights(self.layer_sizes, self.rng))
+        league = SelfPlayLeague(self.pool, num_tables=8, num_players=3, starting_stack=100, seed=1)
+        observations, masks = league.reset()
+        self.assertEqual(observations.shape, (8, self.layer_sizes[0]))
+        hands = 0
+        for _ in range(50):
+            for env in league.tables:
+                self.assertEqual(env.current_player, env.agent_position)
+            self.assertTrue(masks.any(axis=1).all())
+            actions = np.array([self.rng.choice(np.flatnonzero(mask)) for mask in masks])
+            observations, rewards, dones, masks = league.step(actions)
+            self.assertTrue(np.all(rewards[~dones] == 0))
+            hands += dones.sum()
+            for env in league.tables:
+                self.assertEqual(env.stacks.sum() + env.pot, 3 * 100)
+        self.assertGreater(hands, 0)
+        self.assertTrue(np.all(league.seat_snapshots < 2 * self.pool.capacity))
+        for env, seats in zip(league.tables, league.seat_snapshots):
+            self.assertEqual(seats[env.agent_position], -1)
+
+    def test_slots_being_written_are_not_read(self):
+        weights = random_weights(self.layer_sizes, self.rng)
+        self.assertIsNone(self.pool.read(0))
+        self.pool.add(weights)
+        generation, copied = self.pool.read(0)
+        self.assertEqual(generation, 2)
+        np.testing.assert_array_equal(copied[2], weights[2])
+        # A writer that has started on the slot leaves its generation odd
+        self.pool.generations[0] += 1
+        self.assertIsNone(self.pool.read(0))
+
+    def test_seats_keep_their_snapshot_until_the_hand_ends(self):
+        old, new = random_weights(self.layer_sizes, self.rng), random_weights(self.layer_sizes, self.rng)
+        pool = SnapshotPool(self.layer_sizes, capacity=1)
+        pool.add(old)
+        league = SelfPlayLeague(pool, num_tables=4, num_players=3, starting_stack=100, seed=3)
+        _, masks = league.reset()
+        pool.add(new)
+        # Hands dealt before the new snapshot are played out with the old one
+        playing_old = set(range(4))
+        for _ in range(200):
+            if not playing_old:
+                break
+            _, _, dones, masks = league.step(learner_actions(masks))
+            playing_old -= set(np.flatnonzero(dones).tolist())
+            for index in playing_old:
+                env = league.tables[index]
+                for seat in range(3):
+                    if seat != env.agent_position:
+                        np.testing.assert_array_equal(league.layers[0][0][league.seat_snapshots[index, seat]], old[0])
+        self.assertFalse(playing_old)
+        # Once no seat plays the old copy, every new deal uses the new snapshot
+        for _ in range(20):
+            _, _, dones, masks = league.step(learner_actions(masks))
+        np.testing.assert_array_equal(league.layers[0][0][league.cached[0]], new[0])
+        for env, seats in zip(league.tables, league.seat_snapshots):
+            for seat in range(3):
+                if seat != env.agent_position:
+                    np.testing.assert_array_equal(league.layers[0][0][seats[seat]], new[0])
+        pool.close()
+        pool.unlink()
+
+    def test_worker_process_attaches_by_name(self):
+        snapshots = [random_weights(self.layer_sizes, self.rng) for _ in range(4)]
+        for weights in snapshots:
+            self.pool.add(weights)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        worker = context.Process(target=play_in_worker, args=(self.pool.name, self.layer_sizes, 3, results))
+        worker.start()
+        first_layers, generations, hands = results.get(timeout=60)
+        worker.join(timeout=60)
+        self.assertEqual(worker.exitcode, 0)
+        self.assertGreater(hands, 0)
+        np.testing.assert_array_equal(generations, [4, 2, 2])
+        for slot, weights in enumerate([snapshots[3], snapshots[1], snapshots[2]]):
+            np.testing.assert_array_equal(first_layers[slot], weights[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# test_strategy_table.py
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import numpy as np
+from strategy_engine.post_flop_strategy.post_flop_decision import make_post_flop_decision
+from strategy_engine.pre_flop_strategy.pre_flop_rules import make_pre_flop_decision
+from strategy_engine.solver.mccfr import AbstractGame, MCCFRSolver
+from strategy_engine.solver.strategy_table import (
+    StrategyTable, card_infoset_key, export_solver_strategy, write_strategy_table
+)
+
+class TestStrategyTable(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "strategy.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_round_trip(self):
+        keys = ['0:0|', '1:0|c', '1:3|0']
+        labels = ['fc0a', 'c0a', 'fca']
+        probabilities = np.array([[0.0, 0.1, 0.2, 0.7], [0.5, 0.5, 0.0, 0.0], [0.9, 0.1, 0.0, 0.0]])
+        write_strategy_table(self.path, keys, labels, probabilities, {'num_preflop_buckets': 8})
+
+        table = StrategyTable(self.path)
+        self.assertEqual(len(table), 3)
+        self.assertIsInstance(table.probabilities, np.memmap)
+        self.assertEqual(table.probabilities.dtype, np.float16)
+        self.assertEqual(table.metadata, {'num_preflop_buckets': 8})
+        lookup = table.lookup('0:0|')
+        self.assertEqual(list(lookup), ['f', 'c', '0', 'a'])
+        self.assertAlmostEqual(lookup['a'], 0.7, places=3)
+        self.assertEqual(table.best_action('1:3|0'), 'f')
+        self.assertIsNone(table.lookup('missing'))
+
+    def test_rejects_other_versions(self):
+        write_strategy_table(self.path, ['a'], ['fc'], [[0.5, 0.5]])
+        with open(self.path, 'r+b') as file:
+            file.seek(8)
+            file.write(struct.pack('<I', 99))
+        with self.assertRaises(ValueError):
+            StrategyTable(self.path)
+
+    def test_decisions_read_the_table(self):
+        solver = MCCFRSolver(AbstractGame(num_streets=1), seed=0)
+        solver.run(200)
+        export_solver_strategy(solver, self.path)
+        table = StrategyTable(self.path)
+
+        strategy = solver.average_strategy()
+        key = card_infoset_key(0, ['AS', 'AD'], [])
+        expected = {'f': 'fold', 'c': 'call'}.get(solver.table.labels[solver.table.ids[key]][int(np.argmax(strategy[key]))], 'raise')
+        self.assertEqual(make_pre_flop_decision('AA', 'late', 'neutral', 2.0, strategy_table=table), expected)
+
+    def test_post_flop_falls_back_to_pot_odds(self):
+        write_strategy_table(self.path, [card_infoset_key(1, ['AS', 'KD'], ['2H', '7C', 'KH'], 'cc/')], ['c0a'], [[0.0, 1.0, 0.0]])
+        table = StrategyTable(self.path)
+        self.assertEqual(make_post_flop_decision(['AS', 'KD'], ['2H', '7C', 'KH'], 100, 0, 50.0, table, 'cc/'), 'raise')
+        # Unknown spot: 45% equity against 20% pot odds calls
+        self.assertEqual(make_post_flop_decision(['AS', 'KD'], ['2H', '7C', 'KH'], 100, 25, 45.0, table, 'cc/0'), 'call')
+        self.assertEqual(make_post_flop_decision(['AS', 'KD'], ['2H', '7C', 'KH'], 100, 25, 10.0), 'fold')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+# test_verify_hand_evaluator.py
+
+import unittest
+from scripts import verify_hand_evaluator as vhe
+
+def _category_only(codes):
+    # A broken evaluator that ignores kickers
+    return vhe.codes_rank_key(codes)[:1]
+
+class TestVerifyHandEvaluator(unittest.TestCase):
+
+    def test_builtin_evaluators_agree_with_the_reference(self):
+        totals = {}
+        for first_card in (40, 44, 47):
+            vhe._merge(totals, vhe._five_card_chunk(list(vhe.BUILTIN_EVALUATORS), first_card))
+        vhe._merge(totals, vhe._seven_card_chunk(list(vhe.BUILTIN_EVALUATORS), 500, 0))
+        for counts, mapping, _, hands in totals.values():
+            self.assertEqual(sum(counts.values()), hands)
+            self.assertEqual(vhe.ordering_errors(mapping), [])
+
+    def test_ordering_errors_are_detected(self):
+        vhe.BUILTIN_EVALUATORS['category_only'] = _category_only
+        try:
+            chunk = vhe._seven_card_chunk(['category_only'], 500, 0)
+        finally:
+            del vhe.BUILTIN_EVALUATORS['category_only']
+        self.assertTrue(vhe.ordering_errors(chunk['category_only'][1]))
+
+if __name__ == "__main__":
+    unittest.main()